@@ -0,0 +1,63 @@
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from app.domain.ports.cache_port import CachePort
+
+
+class InMemoryCache(CachePort):
+    """Implementação local do CachePort: um cache por processo (`CACHE_URL=memory://`).
+
+    Limitado a `max_entries` chaves, descartando as menos usadas; entradas
+    vencidas são varridas a cada `sweep_interval` segundos, pois chaves que não
+    voltam a ser lidas (listas de gerações antigas) nunca expirariam na leitura.
+    """
+
+    def __init__(self, max_entries: int = 100_000, sweep_interval: float = 60.0):
+        self._data: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._max_entries = max_entries
+        self._sweep_interval = sweep_interval
+        self._swept_at = time.monotonic()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def _put(self, key: str, value: bytes, expires_at: float) -> None:
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+    def _trim(self) -> None:
+        now = time.monotonic()
+        if now - self._swept_at >= self._sweep_interval:
+            self._swept_at = now
+            for k in [k for k, (_, exp) in self._data.items() if exp < now]:
+                del self._data[k]
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self._get(k) for k in keys]
+
+    async def set_many(self, items: dict[str, bytes], ttl: int) -> None:
+        expires_at = time.monotonic() + ttl
+        for k, v in items.items():
+            self._put(k, v, expires_at)
+        self._trim()
+
+    async def delete_many(self, keys: List[str]) -> None:
+        for k in keys:
+            self._data.pop(k, None)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._get(key) or 0) + 1
+        self._put(key, str(value).encode(), float("inf"))
+        self._trim()
+        return value
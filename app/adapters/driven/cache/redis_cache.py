@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+from app.domain.ports.cache_port import CachePort
+
+
+class RedisCache(CachePort):
+    """CachePort sobre `redis.asyncio` com pool de conexões e pipelines sem transação."""
+
+    def __init__(self, url: str, max_connections: int = 50, timeout: float = 0.1):
+        try:
+            from redis.asyncio import ConnectionPool, Redis
+        except ImportError as e:  # dependência opcional
+            raise RuntimeError("redis package is required for RedisCache") from e
+
+        pool = ConnectionPool.from_url(
+            url,
+            max_connections=max_connections,
+            socket_timeout=timeout,
+            socket_connect_timeout=timeout,
+        )
+        self._redis = Redis(connection_pool=pool)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return await self._redis.mget(keys)
+
+    async def set_many(self, items: dict[str, bytes], ttl: int) -> None:
+        if not items:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for k, v in items.items():
+                pipe.set(k, v, ex=ttl)
+            await pipe.execute()
+
+    async def delete_many(self, keys: List[str]) -> None:
+        if keys:
+            await self._redis.delete(*keys)
+
+    async def incr(self, key: str) -> int:
+        return await self._redis.incr(key)
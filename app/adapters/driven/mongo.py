@@ -0,0 +1,54 @@
+import asyncio
+from functools import lru_cache
+from os import getenv
+
+DB_NAME = "catalog_db"
+
+_READ_PREFERENCES = ("primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest")
+
+
+@lru_cache
+def get_client():
+    # motor é importado e o client criado só no primeiro uso, fora do caminho de import
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    return AsyncIOMotorClient(getenv("MONGO_URI"))
+
+
+def read_preference(mode: str, max_staleness: int = -1):
+    """Monta a read preference do pymongo a partir do nome usado na connection string.
+
+    `max_staleness` (s) só vale para modos que leem de secundários; o servidor
+    exige no mínimo 90 e -1 desliga o limite.
+    """
+    if mode not in _READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference: {mode}")
+    from pymongo import read_preferences
+
+    cls = getattr(read_preferences, mode[0].upper() + mode[1:])
+    return cls() if mode == "primary" else cls(max_staleness=max_staleness)
+
+
+def list_read_preference():
+    """Read preference das listagens e da exportação (LIST_READ_PREFERENCE)."""
+    return read_preference(
+        getenv("LIST_READ_PREFERENCE", "secondaryPreferred"),
+        int(getenv("LIST_MAX_STALENESS_SECONDS", "90")),
+    )
+
+
+def causal_consistency_enabled() -> bool:
+    return getenv("CAUSAL_CONSISTENCY", "").lower() in ("1", "true")
+
+
+def get_collection(name: str, read_pref=None):
+    col = get_client()[DB_NAME][name]
+    return col.with_options(read_preference=read_pref) if read_pref is not None else col
+
+
+async def ping(timeout: float = 1.0) -> bool:
+    try:
+        await asyncio.wait_for(get_client().admin.command("ping"), timeout)
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Optional
+
+from app.adapters.driven.repositories.product_repository_decorator import (
+    ProductRepositoryDecorator,
+)
+from app.domain.entities.product import Product
+from app.domain.ports.access_log_port import AccessLogPort
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+
+log = logging.getLogger(__name__)
+
+
+class AccessLoggingProductRepository(ProductRepositoryDecorator):
+    """Conta os acessos a `find_by_id` em memória e os persiste em lote.
+
+    Só GET /products/{id} chega a `find_by_id` aqui; as leituras internas de
+    update, delete e estoque usam `find_for_write` e não entram no ranking.
+    Um flush a cada `flush_interval` segundos (um bulk_write por flush, não uma
+    escrita por leitura) e outro no encerramento (`close`). O ranking alimenta
+    o warm-up de novas réplicas (app/warmup.py).
+    """
+
+    def __init__(
+        self,
+        inner: ProductRepositoryPort,
+        access_log: AccessLogPort,
+        flush_interval: float = 30.0,
+    ):
+        super().__init__(inner)
+        self._log = access_log
+        self._flush_interval = flush_interval
+        self._counts: Counter[str] = Counter()
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def find_by_id(self, product_id: str) -> Optional[Product]:
+        prod = await self._inner.find_by_id(product_id)
+        if prod is not None:
+            # ids inválidos ou inexistentes não crescem o contador nem o ranking
+            self._counts[product_id] += 1
+            self._schedule_flush()
+        return prod
+
+    def _schedule_flush(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._flush_interval)
+        await self.flush()
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+        await self.flush()
+
+    async def flush(self) -> None:
+        counts, self._counts = self._counts, Counter()
+        if not counts:
+            return
+        try:
+            await self._log.record(dict(counts))
+        except Exception:
+            # ranking aproximado: perder uma janela de contagens não afeta leituras
+            log.warning("access log flush failed (%d ids dropped)", len(counts), exc_info=True)
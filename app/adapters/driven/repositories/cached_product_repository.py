@@ -0,0 +1,152 @@
+import json
+import logging
+from dataclasses import asdict
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from app.adapters.driven.repositories.product_repository_decorator import (
+    ProductRepositoryDecorator,
+)
+from app.domain.entities.product import Product
+from app.domain.ports.cache_port import CachePort
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+from app.shared.enums.bulk_item_status import BulkItemStatus
+
+log = logging.getLogger(__name__)
+
+_ITEM = "catalog:product:{}"
+# listas guardam só ids; a geração muda a cada escrita que altera pertencimento
+_LIST_GEN = "catalog:list:gen"
+_LIST = "catalog:list:{}:{}"
+
+
+def _dumps(p: Product) -> bytes:
+    return json.dumps(asdict(p)).encode()
+
+
+def _loads(raw: bytes) -> Product:
+    return Product(**json.loads(raw))
+
+
+class CachedProductRepository(ProductRepositoryDecorator):
+    """Cache L2 compartilhado (read-through) para `find_by_id`/`find_all`.
+
+    Qualquer falha do cache é registrada e a chamada segue para o repositório interno.
+    """
+
+    def __init__(self, inner: ProductRepositoryPort, cache: CachePort, ttl: int = 300):
+        super().__init__(inner)
+        self._cache = cache
+        self._ttl = ttl
+
+    async def find_by_id(self, product_id: str) -> Optional[Product]:
+        try:
+            (raw,) = await self._cache.get_many([_ITEM.format(product_id)])
+            if raw is not None:
+                return _loads(raw)
+        except Exception:
+            log.warning("cache read failed for %s", product_id, exc_info=True)
+
+        prod = await self._inner.find_by_id(product_id)
+        if prod:
+            await self._store({_ITEM.format(prod.id): _dumps(prod)})
+        return prod
+
+    async def find_all(self, cat=None, active: bool | None = None, **filters) -> List[Product]:
+        list_key = None
+        try:
+            (gen,) = await self._cache.get_many([_LIST_GEN])
+            shape = json.dumps([cat, active, filters], sort_keys=True)
+            list_key = _LIST.format(int(gen or 0), shape)
+            (ids,) = await self._cache.get_many([list_key])
+            if ids is not None:
+                raws = await self._cache.get_many([_ITEM.format(i) for i in json.loads(ids)])
+                if all(r is not None for r in raws):
+                    return [_loads(r) for r in raws]
+        except Exception:
+            log.warning("cache read failed for product list", exc_info=True)
+
+        prods = await self._inner.find_all(cat=cat, active=active, **filters)
+        items = {_ITEM.format(p.id): _dumps(p) for p in prods}
+        if list_key:
+            items[list_key] = json.dumps([p.id for p in prods]).encode()
+        await self._store(items)
+        return prods
+
+    async def prime(self, products: Sequence[Product]) -> None:
+        await self._store({_ITEM.format(p.id): _dumps(p) for p in products})
+        await self._inner.prime(products)
+
+    async def create(self, product: Product) -> Product:
+        created = await self._inner.create(product)
+        await self._invalidate(lists=True)
+        return created
+
+    async def update(self, product: Product) -> Product:
+        updated = await self._inner.update(product)
+        await self._invalidate(product.id, lists=True)
+        return updated
+
+    async def bulk_update(
+        self, changes: Sequence[tuple[str, dict]]
+    ) -> dict[str, BulkItemStatus]:
+        found = await self._inner.bulk_update(changes)
+        try:
+            await self._cache.delete_many(
+                [_ITEM.format(pid) for pid, st in found.items() if st == BulkItemStatus.UPDATED]
+            )
+        except Exception:
+            log.warning("cache invalidation failed", exc_info=True)
+        await self._invalidate(lists=True)
+        return found
+
+    async def update_where(self, changes: dict, **filters) -> List[str]:
+        matched = await self._inner.update_where(changes, **filters)
+        try:
+            await self._cache.delete_many([_ITEM.format(pid) for pid in matched])
+        except Exception:
+            log.warning("cache invalidation failed", exc_info=True)
+        await self._invalidate(lists=True)
+        return matched
+
+    async def delete(self, product_id: str) -> None:
+        await self._inner.delete(product_id)
+        await self._invalidate(product_id, lists=True)
+
+    async def reserve_stock(self, product_id: str, qty: int) -> None:
+        await self._inner.reserve_stock(product_id, qty)
+        await self._invalidate(product_id)
+
+    async def adjust_stock(self, deltas: dict[str, int]) -> set[str]:
+        applied = await self._inner.adjust_stock(deltas)
+        try:
+            await self._cache.delete_many([_ITEM.format(pid) for pid in applied])
+        except Exception:
+            log.warning("cache invalidation failed", exc_info=True)
+        return applied
+
+    async def archive_inactive(
+        self, deactivated_before: datetime, batch_size: int = 500
+    ) -> List[str]:
+        moved = await self._inner.archive_inactive(deactivated_before, batch_size)
+        try:
+            await self._cache.delete_many([_ITEM.format(pid) for pid in moved])
+        except Exception:
+            log.warning("cache invalidation failed", exc_info=True)
+        await self._invalidate(lists=True)
+        return moved
+
+    async def _store(self, items: dict[str, bytes]) -> None:
+        try:
+            await self._cache.set_many(items, self._ttl)
+        except Exception:
+            log.warning("cache write failed", exc_info=True)
+
+    async def _invalidate(self, product_id: str | None = None, lists: bool = False) -> None:
+        try:
+            if product_id:
+                await self._cache.delete_many([_ITEM.format(product_id)])
+            if lists:
+                await self._cache.incr(_LIST_GEN)
+        except Exception:
+            log.warning("cache invalidation failed", exc_info=True)
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence
+
+from app.adapters.driven.repositories.product_repository_decorator import (
+    ProductRepositoryDecorator,
+)
+from app.domain.entities.product import Product
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+from app.shared.enums.bulk_item_status import BulkItemStatus
+from app.shared.exceptions.availability import (
+    RepositoryOutcomeUnknownException,
+    RepositoryUnavailableException,
+)
+from app.shared.handlers.degradation import mark_stale
+
+log = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self.retry_in() > 0:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def retry_in(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True  # uma única chamada de teste por vez
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def abandon(self) -> None:
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+        self._probing = False
+
+
+class CircuitBreakerProductRepository(ProductRepositoryDecorator):
+    """Protege o repositório interno com timeout e circuit breaker.
+
+    Com o circuito aberto, `find_by_id`/`find_all` (GET e listagens) são
+    servidas do último resultado bom conhecido, marcadas como stale, e
+    revalidadas em background quando o banco volta; com o circuito fechado uma
+    falha isolada é repassada. `find_for_write` nunca recebe dados stale.
+    Só listagens canônicas (sem paginação nem faixa de preço, que o cliente
+    varia à vontade) são guardadas, e o total guardado é limitado a
+    `max_products` produtos.
+
+    Escritas falham imediatamente com RepositoryUnavailableException enquanto o
+    circuito estiver aberto. Uma escrita que chegou a ser enviada e falhou
+    (timeout, conexão perdida) pode ter sido aplicada: vira
+    RepositoryOutcomeUnknownException, exceto pelas falhas em `unsent`, que
+    garantem que nada chegou ao banco.
+    """
+
+    def __init__(
+        self,
+        inner: ProductRepositoryPort,
+        breaker: CircuitBreaker | None = None,
+        timeout: float = 2.0,
+        failures: tuple[type[BaseException], ...] = (asyncio.TimeoutError, OSError),
+        max_products: int = 50_000,
+        unsent: tuple[type[BaseException], ...] = (ConnectionRefusedError,),
+        bulk_timeout: float = 30.0,
+    ):
+        super().__init__(inner)
+        self.breaker = breaker or CircuitBreaker()
+        self._timeout = timeout
+        self._bulk_timeout = bulk_timeout
+        self._failures = failures
+        self._unsent = unsent
+        self._lkg: OrderedDict[Any, tuple[Any, float, int]] = OrderedDict()
+        self._lkg_size = 0
+        self._max_products = max_products
+        self._stale: dict[Any, tuple] = {}
+        self._refresher: Optional[asyncio.Task] = None
+
+    async def _call(self, fn, *args, timeout: float | None = None, **kwargs):
+        if not self.breaker.allow():
+            raise RepositoryUnavailableException(
+                "Catalog database unavailable", retry_after=self.breaker.retry_in()
+            )
+        try:
+            result = await asyncio.wait_for(fn(*args, **kwargs), timeout or self._timeout)
+        except self._failures as e:
+            self.breaker.record_failure()
+            raise RepositoryUnavailableException(
+                "Catalog database unavailable", retry_after=self.breaker.retry_in() or 1.0
+            ) from e
+        except asyncio.CancelledError:
+            self.breaker.abandon()
+            raise
+        except Exception:
+            self.breaker.record_success()  # o banco respondeu; erro de domínio
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def _write(self, fn, *args, **kwargs):
+        try:
+            return await self._call(fn, *args, **kwargs)
+        except RepositoryUnavailableException as e:
+            # sem causa: recusada pelo circuito aberto, não foi enviada
+            if e.__cause__ is None or isinstance(e.__cause__, self._unsent):
+                raise
+            raise RepositoryOutcomeUnknownException(
+                "Catalog database did not confirm the write; check the current state before retrying"
+            ) from e.__cause__
+
+    def _remember(self, key, value) -> None:
+        size = len(value) if isinstance(value, list) else 1
+        if (old := self._lkg.pop(key, None)) is not None:
+            self._lkg_size -= old[2]
+        if size > self._max_products:
+            return
+        self._lkg[key] = (value, time.monotonic(), size)
+        self._lkg_size += size
+        while self._lkg_size > self._max_products:
+            self._lkg_size -= self._lkg.popitem(last=False)[1][2]
+
+    async def _read(self, key, fn, *args, **kwargs):
+        if key is None:
+            return await self._call(fn, *args, **kwargs)
+        try:
+            result = await self._call(fn, *args, **kwargs)
+        except RepositoryUnavailableException:
+            if self.breaker.state != CircuitBreaker.OPEN or (hit := self._lkg.get(key)) is None:
+                raise
+            value, stored_at, _ = hit
+            mark_stale(stored_at)
+            self._stale[key] = (fn, args, kwargs)
+            self._schedule_refresh()
+            return value
+        self._remember(key, result)
+        return result
+
+    def _schedule_refresh(self) -> None:
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_stale())
+
+    async def _refresh_stale(self) -> None:
+        while self._stale:
+            await asyncio.sleep(self.breaker.retry_in() or self.breaker.reset_timeout)
+            for key, (fn, args, kwargs) in list(self._stale.items()):
+                try:
+                    self._remember(key, await self._call(fn, *args, **kwargs))
+                except RepositoryUnavailableException:
+                    break
+                except Exception:
+                    log.warning("stale refresh failed for %s", key, exc_info=True)
+                self._stale.pop(key, None)
+
+    async def find_by_id(self, product_id: str) -> Optional[Product]:
+        return await self._read(("id", product_id), self._inner.find_by_id, product_id)
+
+    async def find_for_write(self, product_id: str) -> Optional[Product]:
+        return await self._call(self._inner.find_for_write, product_id)
+
+    async def is_active(self, product_id: str) -> bool:
+        return await self._call(self._inner.is_active, product_id)
+
+    async def find_all(self, cat=None, active: bool | None = None, **filters) -> List[Product]:
+        return await self._read(
+            _list_key(cat, active, filters), self._inner.find_all, cat=cat, active=active, **filters
+        )
+
+    async def create(self, product: Product) -> Product:
+        return await self._write(self._inner.create, product)
+
+    async def update(self, product: Product) -> Product:
+        return await self._write(self._inner.update, product)
+
+    async def bulk_update(
+        self, changes: Sequence[tuple[str, dict]]
+    ) -> dict[str, BulkItemStatus]:
+        return await self._write(self._inner.bulk_update, changes, timeout=self._bulk_timeout)
+
+    async def update_where(self, changes: dict, **filters) -> List[str]:
+        return await self._write(
+            self._inner.update_where, changes, timeout=self._bulk_timeout, **filters
+        )
+
+    async def delete(self, product_id: str) -> None:
+        await self._write(self._inner.delete, product_id)
+
+    async def reserve_stock(self, product_id: str, qty: int) -> None:
+        await self._write(self._inner.reserve_stock, product_id, qty)
+
+    async def adjust_stock(self, deltas: dict[str, int]) -> set[str]:
+        return await self._write(self._inner.adjust_stock, deltas, timeout=self._bulk_timeout)
+
+
+def _list_key(cat, active, filters: dict):
+    """Chave de last-known-good de uma listagem, ou None se ela não é canônica."""
+    if filters.get("limit") or filters.get("offset"):
+        return None
+    if filters.get("min_price") is not None or filters.get("max_price") is not None:
+        return None
+    cats = None if not cat else (cat,) if isinstance(cat, str) else cat
+    if cats is not None:
+        cats = tuple(sorted({str(getattr(c, "value", c)) for c in cats}))
+    return ("list", cats, active, filters.get("sort"))
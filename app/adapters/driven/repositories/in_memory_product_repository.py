@@ -0,0 +1,178 @@
+import asyncio
+from dataclasses import replace
+from datetime import datetime, timezone
+from itertools import islice
+from typing import AsyncIterator, List, Optional, Sequence
+
+from bson import ObjectId
+
+from app.domain.entities.product import Product
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+from app.shared.enums.bulk_item_status import BulkItemStatus
+from app.shared.enums.product_sort import ProductSort
+from app.shared.exceptions.inventory import OutOfStockException
+
+
+class InMemoryProductRepository(ProductRepositoryPort):
+    """Repositório em memória com a mesma semântica atômica do adapter Mongo.
+
+    Cada operação é um trecho sem `await` entre leitura e escrita, equivalente a
+    um update condicional num único documento. `latency` (s) é aguardada antes
+    de cada operação para intercalar as corrotinas como I/O real faria.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self._latency = latency
+        self._items: dict[str, Product] = {}
+        self._active: dict[str, bool] = {}
+        self._deactivated_at: dict[str, datetime] = {}
+        self._archive: dict[str, Product] = {}
+
+    async def _io(self) -> None:
+        await asyncio.sleep(self._latency)
+
+    async def create(self, product: Product) -> Product:
+        await self._io()
+        created = replace(product, id=str(ObjectId()))
+        self._items[created.id] = created
+        self._active[created.id] = True
+        return created
+
+    async def find_by_id(self, product_id: str) -> Optional[Product]:
+        await self._io()
+        return self._items.get(product_id)
+
+    async def is_active(self, product_id: str) -> bool:
+        await self._io()
+        return self._active.get(product_id, False)
+
+    async def find_many(self, product_ids: Sequence[str]) -> List[Product]:
+        await self._io()
+        return [self._items[pid] for pid in product_ids if pid in self._items]
+
+    def _matching(self, cat, active, min_price=None, max_price=None) -> List[Product]:
+        cats = None if cat is None else {cat} if isinstance(cat, str) else set(cat)
+        return [
+            p
+            for p in self._items.values()
+            if (not cats or p.category in cats)
+            and (active is None or self._active[p.id] is active)
+            and (min_price is None or p.price >= min_price)
+            and (max_price is None or p.price <= max_price)
+        ]
+
+    async def find_all(
+        self,
+        cat: str | Sequence[str] | None = None,
+        active: bool | None = None,
+        *,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        sort: ProductSort | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> List[Product]:
+        await self._io()
+        prods = self._matching(cat, active, min_price, max_price)
+        if sort:
+            prods.sort(key=lambda p: (getattr(p, sort.field), p.id), reverse=sort.descending)
+        end = offset + limit if limit else None
+        return prods[offset:end]
+
+    async def stream(
+        self,
+        cat: str | Sequence[str] | None = None,
+        active: bool | None = None,
+        *,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Product]]:
+        rows = iter(self._matching(cat, active))
+        while batch := list(islice(rows, batch_size)):
+            await self._io()
+            yield batch
+
+    async def update(self, product: Product) -> Product:
+        if not product.id:
+            raise ValueError("Product id required")
+        await self._io()
+        if product.id in self._items:
+            self._items[product.id] = product
+        return self._items.get(product.id)
+
+    async def bulk_update(
+        self, changes: Sequence[tuple[str, dict]]
+    ) -> dict[str, BulkItemStatus]:
+        await self._io()
+        found = {}
+        for pid, c in changes:
+            if pid in self._items:
+                self._apply(pid, c)
+                found[pid] = BulkItemStatus.UPDATED
+            else:
+                found[pid] = BulkItemStatus.NOT_FOUND
+        return found
+
+    async def update_where(
+        self,
+        changes: dict,
+        *,
+        cat: str | Sequence[str] | None = None,
+        active: bool | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> List[str]:
+        await self._io()
+        matched = self._matching(cat, active, min_price, max_price)
+        for p in matched:
+            self._apply(p.id, changes)
+        return [p.id for p in matched]
+
+    def _apply(self, pid: str, changes: dict) -> None:
+        changes = dict(changes)
+        if "active" in changes:
+            self._set_active(pid, changes.pop("active"))
+        self._items[pid] = replace(self._items[pid], **changes)
+
+    async def delete(self, product_id: str) -> None:
+        await self._io()
+        if product_id in self._active:
+            self._set_active(product_id, False)
+
+    def _set_active(self, pid: str, active: bool) -> None:
+        was_active, self._active[pid] = self._active.get(pid, True), active
+        if active:
+            self._deactivated_at.pop(pid, None)
+        elif was_active or pid not in self._deactivated_at:
+            self._deactivated_at[pid] = datetime.now(timezone.utc)
+
+    async def find_archived(self, product_id: str) -> Optional[Product]:
+        await self._io()
+        return self._archive.get(product_id)
+
+    async def archive_inactive(
+        self, deactivated_before: datetime, batch_size: int = 500
+    ) -> List[str]:
+        await self._io()
+        due = [pid for pid, at in self._deactivated_at.items() if at <= deactivated_before]
+        for pid in due:
+            self._archive[pid] = self._items.pop(pid)
+            del self._active[pid], self._deactivated_at[pid]
+        return due
+
+    async def adjust_stock(self, deltas: dict[str, int]) -> set[str]:
+        await self._io()
+        applied = set()
+        for pid, delta in deltas.items():
+            prod = self._items.get(pid)
+            if prod is not None and prod.stock + delta >= 0:
+                self._items[pid] = replace(prod, stock=prod.stock + delta)
+                applied.add(pid)
+        return applied
+
+    async def reserve_stock(self, product_id: str, qty: int) -> None:
+        await self._io()
+        # checagem e baixa sem ponto de suspensão entre elas: atômico no event loop
+        prod = self._items.get(product_id)
+        if prod is None or not self._active[product_id] or prod.stock < qty:
+            raise OutOfStockException("Not enough stock or product inactive")
+        self._items[product_id] = replace(prod, stock=prod.stock - qty)
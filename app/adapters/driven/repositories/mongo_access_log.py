@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from typing import List
+
+from app.adapters.driven.mongo import get_collection
+from app.domain.ports.access_log_port import AccessLogPort
+
+
+class MongoAccessLog(AccessLogPort):
+    """Contadores de acesso na coleção `product_access`, um documento por product.
+
+    `last_seen` tem índice TTL (ver app/db_init.py): ids sem acesso recente saem
+    do ranking em vez de acumular acessos antigos para sempre.
+    """
+
+    def __init__(self, col=None):
+        self._col = col if col is not None else get_collection("product_access")
+
+    async def record(self, counts: dict[str, int]) -> None:
+        from pymongo import UpdateOne
+
+        now = datetime.now(timezone.utc)
+        ops = [
+            UpdateOne({"_id": pid}, {"$inc": {"hits": n}, "$set": {"last_seen": now}}, upsert=True)
+            for pid, n in counts.items()
+        ]
+        if ops:
+            await self._col.bulk_write(ops, ordered=False)
+
+    async def top(self, n: int) -> List[str]:
+        cursor = self._col.find({}, {"_id": 1}).sort("hits", -1).limit(n)
+        return [d["_id"] async for d in cursor]
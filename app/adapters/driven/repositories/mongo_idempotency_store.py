@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from app.adapters.driven.mongo import get_collection
+from app.domain.ports.idempotency_store_port import IdempotencyRecord, IdempotencyStorePort
+
+
+class MongoIdempotencyStore(IdempotencyStorePort):
+    """Chaves em coleção com índice TTL (`created_at`), com LRU em memória na frente.
+
+    Replays de chaves concluídas conhecidas pelo processo não tocam o banco.
+    Reservas pendentes expiram após `lock_timeout` para não travar a chave se
+    a réplica que a obteve morrer no meio da execução; enquanto ela vive, o
+    serviço as renova (`renew`).
+    """
+
+    def __init__(self, col=None, lru_size: int = 10_000, lock_timeout: float = 30.0):
+        self.lock_timeout = lock_timeout
+        self._col = col if col is not None else get_collection("idempotency_keys")
+        self._lru: OrderedDict[str, IdempotencyRecord] = OrderedDict()
+        self._lru_size = lru_size
+        self._lock_timeout = timedelta(seconds=lock_timeout)
+
+    def _remember(self, key: str, record: IdempotencyRecord) -> None:
+        self._lru[key] = record
+        self._lru.move_to_end(key)
+        if len(self._lru) > self._lru_size:
+            self._lru.popitem(last=False)
+
+    async def claim(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        if (cached := self._lru.get(key)) is not None:
+            self._lru.move_to_end(key)
+            return cached
+
+        now = datetime.now(timezone.utc)
+        try:
+            await self._col.insert_one({
+                "_id": key,
+                "fingerprint": fingerprint,
+                "done": False,
+                "created_at": now,
+                "locked_until": now + self._lock_timeout,
+            })
+            return None
+        except DuplicateKeyError:
+            pass
+
+        # reserva abandonada: assume a chave
+        taken = await self._col.find_one_and_update(
+            {"_id": key, "done": False, "locked_until": {"$lt": now}},
+            {"$set": {"fingerprint": fingerprint, "locked_until": now + self._lock_timeout}},
+        )
+        if taken is not None:
+            return None
+
+        doc = await self._col.find_one({"_id": key})
+        if doc is None:  # expirou pelo TTL entre as chamadas
+            return await self.claim(key, fingerprint)
+        record = IdempotencyRecord(doc["fingerprint"], doc["done"], doc.get("result"))
+        if record.done:
+            self._remember(key, record)
+        return record
+
+    async def complete(self, key: str, fingerprint: str, result: Any) -> None:
+        await self._col.update_one({"_id": key}, {"$set": {"done": True, "result": result}})
+        self._remember(key, IdempotencyRecord(fingerprint, True, result))
+
+    async def renew(self, key: str, fingerprint: str) -> None:
+        await self._col.update_one(
+            {"_id": key, "fingerprint": fingerprint, "done": False},
+            {"$set": {"locked_until": datetime.now(timezone.utc) + self._lock_timeout}},
+        )
+
+    async def release(self, key: str) -> None:
+        await self._col.delete_one({"_id": key, "done": False})
@@ -0,0 +1,46 @@
+from typing import List, Optional, Sequence
+
+from app.adapters.driven.mongo import get_collection
+from app.domain.entities.store_stock import StoreStock
+from app.domain.ports.inventory_repository_port import InventoryRepositoryPort
+from app.shared.exceptions.inventory import OutOfStockException
+
+
+def _key(product_id: str, store_id: str) -> dict:
+    # _id determinístico garante um documento por (loja, product); store_id e
+    # product_id no filtro roteiam a operação para um único shard
+    return {"_id": f"{store_id}:{product_id}", "store_id": store_id, "product_id": product_id}
+
+
+class MongoInventoryRepository(InventoryRepositoryPort):
+    """Saldo por (product, loja) na coleção `inventory`, um documento por par.
+
+    Cada reserva toca só o documento da loja, então um SKU popular não concentra
+    todas as escritas num único documento. Shard key: {store_id: hashed, product_id: 1}
+    (ver app/db_init.py).
+    """
+
+    def __init__(self, col=None):
+        self._col = col if col is not None else get_collection("inventory")
+
+    async def set_stock(self, product_id: str, store_id: str, stock: int) -> StoreStock:
+        key = _key(product_id, store_id)
+        await self._col.update_one(key, {"$set": {"stock": stock}}, upsert=True)
+        return StoreStock(product_id=product_id, store_id=store_id, stock=stock)
+
+    async def reserve(self, product_id: str, store_id: str, qty: int) -> None:
+        res = await self._col.update_one(
+            _key(product_id, store_id) | {"stock": {"$gte": qty}},
+            {"$inc": {"stock": -qty}},
+        )
+        if res.modified_count == 0:
+            raise OutOfStockException("Not enough stock in store")
+
+    async def find_stock(
+        self, product_ids: Sequence[str], store_ids: Optional[Sequence[str]] = None
+    ) -> List[StoreStock]:
+        query = {"product_id": {"$in": list(product_ids)}}
+        if store_ids:
+            query["store_id"] = {"$in": list(store_ids)}
+        cursor = self._col.find(query, {"_id": 0, "product_id": 1, "store_id": 1, "stock": 1})
+        return [StoreStock(**d) async for d in cursor]
@@ -1,74 +1,446 @@
+import time
+from contextlib import asynccontextmanager
 from dataclasses import asdict
-from typing import List, Optional
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import AsyncIterator, List, Optional, Sequence
 
+from bson import ObjectId, Timestamp
 from bson.decimal128 import Decimal128
-from motor.motor_asyncio import AsyncIOMotorClient
-from bson import ObjectId
-from os import getenv
+from app.adapters.driven.mongo import (
+    causal_consistency_enabled,
+    get_collection,
+    list_read_preference,
+)
 from app.domain.entities.product import Product
 from app.domain.ports.product_repository_port import ProductRepositoryPort
+from app.shared.enums.bulk_item_status import BulkItemStatus
+from app.shared.enums.product_sort import ProductSort
 from app.shared.exceptions.inventory import OutOfStockException
+from app.shared.handlers.consistency import read_after, record_write
+from app.shared.handlers.profiling import phase
+
+_CENT = Decimal("0.01")
+# campo persistido para cada ordenação; ver índices em app/db_init.py
+_SORT_FIELDS = {"price": "price_cents", "name": "name", "stock": "stock"}
+# marcadores de lote mantidos por documento para identificar quais $inc de um
+# bulk_write casaram (BulkWriteResult só informa totais). Precisam ser gravados
+# na mesma escrita do $inc (outra coleção exigiria transação); o array é
+# limitado por $slice aos últimos _ADJUST_MARKERS lotes, folga para lotes
+# concorrentes de outras réplicas entre o bulk_write e a leitura do marcador.
+# Fica fora da projeção e do arquivo.
+_ADJUST_FIELD = "stock_batches"
+_ADJUST_MARKERS = 16
+_DUPLICATE_KEY = 11000
+# campos necessários para montar Product; reduz o tamanho dos lotes BSON trafegados
+# `price` só existe em documentos ainda não migrados (ver app/scripts/migrate_price_cents.py)
+_PROJECTION = {
+    "name": 1, "description": 1, "price_cents": 1, "price": 1, "category": 1, "stock": 1,
+}
+
+
+def to_cents(price) -> int:
+    """Converte um preço (float, str ou Decimal) em centavos inteiros, sem erro binário."""
+    return int(Decimal(str(price)).quantize(_CENT, rounding=ROUND_HALF_UP) * 100)
+
+
+def _entity_to_doc(p: Product) -> dict:
+    doc = asdict(p)
+    doc.pop("id", None)
+    doc["price_cents"] = to_cents(doc.pop("price"))
+    return doc
+
+
+def _changes_to_update(changes: dict) -> dict | list:
+    """Documento de update para alterações parciais.
+
+    `deactivated_at` marca o início da retenção antes do arquivamento (ver
+    archive_inactive): zera ao reativar e só é gravado na transição
+    ativo -> inativo. Regravar `active: false` num inativo (varredura por
+    categoria, por exemplo) mantém a data original; para isso a desativação usa
+    um pipeline, que compara com o valor anterior na mesma escrita.
+    """
+    data = dict(changes)
+    if "price" in data:
+        data["price_cents"] = to_cents(data.pop("price"))
+    if "active" not in data:
+        return {"$set": data}
+    if data["active"]:
+        return {"$set": data | {"deactivated_at": None}}
+    now = datetime.now(timezone.utc)
+    stage = {k: {"$literal": v} for k, v in data.items()}
+    stage["deactivated_at"] = {
+        "$cond": [{"$eq": ["$active", False]}, {"$ifNull": ["$deactivated_at", now]}, now]
+    }
+    return [{"$set": stage}]
+
+
+def _archived(doc: dict, archived_at: datetime) -> dict:
+    copy = {k: v for k, v in doc.items() if k != _ADJUST_FIELD}
+    return copy | {"archived_at": archived_at}
+
+
+def _format_token(ts: Timestamp) -> str:
+    return f"{ts.time}.{ts.inc}"
+
+
+def _parse_token(token: str) -> Optional[Timestamp]:
+    """Token do cliente -> operationTime; None para tokens inválidos ou no futuro.
+
+    O token vem do cliente: um afterClusterTime adiante do clusterTime faz o
+    servidor recusar a leitura. Tokens legítimos nunca passam do relógio
+    local (salvo desvio entre relógios, quando só se perde o read-your-writes).
+    """
+    try:
+        t, i = token.split(".")
+        ts = Timestamp(int(t), int(i))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return ts if ts.time <= time.time() else None
+
+
+def _session_kw(session) -> dict:
+    return {"session": session} if session is not None else {}
+
+
+def _legacy_price(price) -> Optional[float]:
+    if isinstance(price, Decimal128):
+        return float(price.to_decimal())
+    return price
 
-_cli = AsyncIOMotorClient(getenv("MONGO_URI"))
-_col = _cli["catalog_db"]["products"]
 
 class MongoProductRepository(ProductRepositoryPort):
+    """Produtos no Mongo.
+
+    Listagens e exportação leem de `read_col` (por padrão `LIST_READ_PREFERENCE`,
+    secondaryPreferred com `maxStalenessSeconds`); `find_by_id`, as escritas e a
+    reserva ficam no primário. Com `causal=True` as escritas rodam em sessão
+    causal e publicam o operationTime como token; leituras que recebem o token
+    esperam o secundário alcançá-lo (afterClusterTime).
+    """
+
+    def __init__(
+        self,
+        col=None,
+        bulk_chunk_size: int = 500,
+        read_col=None,
+        causal: bool | None = None,
+        archive_col=None,
+    ):
+        self._col = col if col is not None else get_collection("products")
+        self._archive_col = archive_col
+        if read_col is None:
+            read_col = self._col if col is not None else get_collection(
+                "products", list_read_preference()
+            )
+        self._read_col = read_col
+        self._causal = causal_consistency_enabled() if causal is None else causal
+        self._bulk_chunk_size = bulk_chunk_size
+
+    @property
+    def _archive(self):
+        # resolvida no primeiro uso: só o job de arquivamento e leituras de arquivados a usam
+        if self._archive_col is None:
+            self._archive_col = get_collection("products_archive")
+        return self._archive_col
+
+    @asynccontextmanager
+    async def _read_session(self):
+        token = read_after() if self._causal else None
+        after = _parse_token(token) if token else None
+        if after is None:
+            yield None
+            return
+        client = self._read_col.database.client
+        async with await client.start_session(causal_consistency=True) as session:
+            session.advance_operation_time(after)
+            yield session
+
+    @asynccontextmanager
+    async def _write_session(self):
+        if not self._causal:
+            yield None
+            return
+        client = self._col.database.client
+        async with await client.start_session(causal_consistency=True) as session:
+            yield session
+            if session.operation_time is not None:
+                record_write(_format_token(session.operation_time))
+
     async def create(self, p: Product) -> Product:
-        doc = asdict(p).copy()
-        doc.pop("id", None)
+        doc = _entity_to_doc(p)
 
         db_doc = doc | {"active": True}
-        res = await _col.insert_one(db_doc)
+        async with self._write_session() as s:
+            res = await self._col.insert_one(db_doc, **_session_kw(s))
 
-        return Product(**doc, id=str(res.inserted_id))
+        return self._doc_to_entity(doc | {"_id": res.inserted_id})
 
     async def find_by_id(self, product_id: str) -> Optional[Product]:
-        doc = await _col.find_one({"_id": ObjectId(product_id)})
+        doc = await self._col.find_one({"_id": ObjectId(product_id)})
         return self._doc_to_entity(doc) if doc else None
 
+    async def is_active(self, product_id: str) -> bool:
+        if not ObjectId.is_valid(product_id):
+            return False
+        query = {"_id": ObjectId(product_id), "active": True}
+        return await self._col.count_documents(query, limit=1) > 0
+
+    async def find_many(self, product_ids: Sequence[str]) -> List[Product]:
+        oids = [ObjectId(pid) for pid in product_ids if ObjectId.is_valid(pid)]
+        if not oids:
+            return []
+        cursor = self._read_col.find({"_id": {"$in": oids}}, _PROJECTION)
+        return self._to_entities([d async for d in cursor])
+
     async def find_all(
         self,
-        cat: str | None = None,
+        cat: str | Sequence[str] | None = None,
         active: bool | None = None,
+        *,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        sort: ProductSort | None = None,
+        limit: int | None = None,
+        offset: int = 0,
     ) -> List[Product]:
+        query = self._build_query(cat, active, min_price, max_price, sort)
+        opts = {}
+        if sort:
+            direction = -1 if sort.descending else 1
+            # _id desempata a ordenação para a paginação ser estável
+            opts["sort"] = [(_SORT_FIELDS[sort.field], direction), ("_id", direction)]
+        if offset:
+            opts["skip"] = offset
+        if limit:
+            opts["limit"] = limit
+
+        async with self._read_session() as s:
+            cursor = self._read_col.find(query, _PROJECTION, **opts, **_session_kw(s))
+            with phase("mongo"):
+                docs = [d async for d in cursor]
+        return self._to_entities(docs)
+
+    async def stream(
+        self,
+        cat: str | Sequence[str] | None = None,
+        active: bool | None = None,
+        *,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Product]]:
+        query = self._build_query(cat, active, None, None, None)
+        async with self._read_session() as s:
+            cursor = self._read_col.find(
+                query, _PROJECTION, batch_size=batch_size, **_session_kw(s)
+            )
+            docs = []
+            async for d in cursor:
+                docs.append(d)
+                if len(docs) == batch_size:
+                    yield self._to_entities(docs)
+                    docs = []
+            if docs:
+                yield self._to_entities(docs)
+
+    @staticmethod
+    def _build_query(cat, active, min_price, max_price, sort) -> dict:
         query = {}
         if cat:
-            query["category"] = cat
+            cats = [cat] if isinstance(cat, str) else list(cat)
+            query["category"] = cats[0] if len(cats) == 1 else {"$in": cats}
+        price = {}
+        if min_price is not None:
+            price["$gte"] = to_cents(min_price)
+        if max_price is not None:
+            price["$lte"] = to_cents(max_price)
+        if price:
+            query["price_cents"] = price
         if active is not None:
             query["active"] = active
-
-        cursor = _col.find(query)
-        return [self._doc_to_entity(d) async for d in cursor]
+        elif query or sort:
+            # igualdade no prefixo (active, ...) dos índices evita scan e sort em memória;
+            # None casa documentos legados sem o campo, que a listagem sem filtro inclui
+            query["active"] = {"$in": [True, False, None]}
+        return query
 
     async def update(self, p: Product) -> Product:
         if not p.id:
             raise ValueError("Product id required")
-        data = asdict(p).copy()
-        pid = data.pop("id")
+        data = _entity_to_doc(p)
         data.pop("active", None)
-        await _col.update_one({"_id": ObjectId(pid)}, {"$set": data})
-        return await self.find_by_id(pid)
+        async with self._write_session() as s:
+            await self._col.update_one({"_id": ObjectId(p.id)}, {"$set": data}, **_session_kw(s))
+        return await self.find_by_id(p.id)
+
+    async def bulk_update(
+        self, changes: Sequence[tuple[str, dict]]
+    ) -> dict[str, BulkItemStatus]:
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError
+
+        found: dict[str, BulkItemStatus] = {}
+        async with self._write_session() as s:
+            for start in range(0, len(changes), self._bulk_chunk_size):
+                chunk = [(pid, c) for pid, c in changes[start:start + self._bulk_chunk_size]]
+                oids = [ObjectId(pid) for pid, _ in chunk if ObjectId.is_valid(pid)]
+                # um find por lote para o resultado por item; bulk_write não informa matched por operação
+                existing = {
+                    str(d["_id"])
+                    async for d in self._col.find(
+                        {"_id": {"$in": oids}}, {"_id": 1}, **_session_kw(s)
+                    )
+                }
+                found.update({
+                    pid: BulkItemStatus.UPDATED if pid in existing else BulkItemStatus.NOT_FOUND
+                    for pid, _ in chunk
+                })
+                writes = [(pid, c) for pid, c in chunk if pid in existing and c]
+                ops = [
+                    UpdateOne({"_id": ObjectId(pid)}, _changes_to_update(c))
+                    for pid, c in writes
+                ]
+                if not ops:
+                    continue
+                try:
+                    await self._col.bulk_write(ops, ordered=False, **_session_kw(s))
+                except BulkWriteError as e:
+                    # unordered: as demais operações foram aplicadas; `index` é a posição em ops
+                    for err in e.details.get("writeErrors", []):
+                        found[writes[err["index"]][0]] = (
+                            BulkItemStatus.CONFLICT
+                            if err.get("code") == _DUPLICATE_KEY
+                            else BulkItemStatus.FAILED
+                        )
+        return found
+
+    async def update_where(
+        self,
+        changes: dict,
+        *,
+        cat: str | Sequence[str] | None = None,
+        active: bool | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> List[str]:
+        """Os ids são lidos antes da escrita, para que caches possam invalidar os itens.
+
+        Cada lote repete o filtro: um product que deixou de casar entre a leitura
+        e a escrita não é alterado (mas continua entre os ids retornados).
+        """
+        query = self._build_query(cat, active, min_price, max_price, None)
+        update = _changes_to_update(changes)
+        async with self._write_session() as s:
+            oids = [d["_id"] async for d in self._col.find(query, {"_id": 1}, **_session_kw(s))]
+            for start in range(0, len(oids), self._bulk_chunk_size):
+                chunk = oids[start:start + self._bulk_chunk_size]
+                await self._col.update_many(
+                    {"_id": {"$in": chunk}} | query, update, **_session_kw(s)
+                )
+        return [str(oid) for oid in oids]
 
     async def delete(self, pid: str) -> None:
-        await _col.update_one(
-            {"_id": ObjectId(pid)}, {"$set": {"active": False}}
+        async with self._write_session() as s:
+            await self._col.update_one(
+                {"_id": ObjectId(pid)},
+                _changes_to_update({"active": False}),
+                **_session_kw(s),
+            )
+
+    async def find_archived(self, product_id: str) -> Optional[Product]:
+        if not ObjectId.is_valid(product_id):
+            return None
+        doc = await self._archive.find_one({"_id": ObjectId(product_id)})
+        return self._doc_to_entity(doc) if doc else None
+
+    async def archive_inactive(
+        self, deactivated_before: datetime, batch_size: int = 500
+    ) -> List[str]:
+        """Move para `products_archive` os inativos desde antes de `deactivated_before`.
+
+        Cada lote é copiado (upsert, reexecução segura) e só então removido da
+        coleção quente; um product reativado no meio do lote fica na quente e sua
+        cópia é descartada do arquivo.
+        """
+        from pymongo import ReplaceOne
+
+        # inativos anteriores ao deactivated_at passam a contar a retenção agora
+        await self._col.update_many(
+            {"active": False, "deactivated_at": {"$exists": False}},
+            {"$set": {"deactivated_at": datetime.now(timezone.utc)}},
         )
+        due = {"active": False, "deactivated_at": {"$lte": deactivated_before}}
+        moved: List[str] = []
+        while True:
+            docs = await self._col.find(due).limit(batch_size).to_list(batch_size)
+            if not docs:
+                return moved
+            archived_at = datetime.now(timezone.utc)
+            await self._archive.bulk_write(
+                [
+                    ReplaceOne({"_id": d["_id"]}, _archived(d, archived_at), upsert=True)
+                    for d in docs
+                ],
+                ordered=False,
+            )
+            ids = [d["_id"] for d in docs]
+            res = await self._col.delete_many({"_id": {"$in": ids}} | due)
+            kept = set()
+            if res.deleted_count < len(ids):
+                kept = {d["_id"] async for d in self._col.find({"_id": {"$in": ids}}, {"_id": 1})}
+                await self._archive.delete_many({"_id": {"$in": list(kept)}})
+            moved += [str(i) for i in ids if i not in kept]
+            if len(docs) < batch_size:
+                return moved
 
     async def reserve_stock(self, pid: str, qty: int) -> None:
-        res = await _col.update_one(
+        res = await self._col.update_one(
             {"_id": ObjectId(pid), "active": True, "stock": {"$gte": qty}},
             {"$inc": {"stock": -qty}},
         )
         if res.modified_count == 0:
             raise OutOfStockException("Not enough stock or product inactive")
 
+    async def adjust_stock(self, deltas: dict[str, int]) -> set[str]:
+        from pymongo import UpdateOne
+
+        batch_id = ObjectId()
+        oids, ops = [], []
+        for pid, delta in deltas.items():
+            if not ObjectId.is_valid(pid):
+                continue
+            query = {"_id": ObjectId(pid)}
+            if delta < 0:
+                query["stock"] = {"$gte": -delta}
+            oids.append(query["_id"])
+            ops.append(UpdateOne(query, {
+                "$inc": {"stock": delta},
+                "$push": {_ADJUST_FIELD: {"$each": [batch_id], "$slice": -_ADJUST_MARKERS}},
+            }))
+        if not ops:
+            return set()
+
+        res = await self._col.bulk_write(ops, ordered=False)
+        if res.matched_count == len(ops):
+            return {str(oid) for oid in oids}
+        # caminho raro: algum id não existe ou ficaria negativo; o marcador diz quais aplicaram
+        cursor = self._col.find({"_id": {"$in": oids}, _ADJUST_FIELD: batch_id}, {"_id": 1})
+        return {str(d["_id"]) async for d in cursor}
+
+    @classmethod
+    def _to_entities(cls, docs: List[dict]) -> List[Product]:
+        with phase("decode"):
+            return [cls._doc_to_entity(d) for d in docs]
+
     @staticmethod
     def _doc_to_entity(d: dict) -> Product:
-        d = d.copy()
-        d["id"] = str(d.pop("_id"))
-        d.pop("active", None)
-
-        price = d.get("price")
-        if isinstance(price, Decimal128):
-            d["price"] = float(price.to_decimal())
-        return Product(**d)
\ No newline at end of file
+        # preço persistido como centavos inteiros; documentos ainda não migrados
+        # (ver app/scripts/migrate_price_cents.py) caem no `price` legado
+        cents = d.get("price_cents")
+        return Product(
+            name=d["name"],
+            description=d.get("description"),
+            price=cents / 100 if cents is not None else _legacy_price(d.get("price")),
+            category=d["category"],
+            stock=d.get("stock", 0),
+            id=str(d["_id"]),
+        )
@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence
+
+from app.domain.entities.product import Product
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+from app.shared.enums.bulk_item_status import BulkItemStatus
+
+
+class ProductRepositoryDecorator(ProductRepositoryPort):
+    """Base para adapters que envolvem outro repositório; por padrão apenas delega."""
+
+    def __init__(self, inner: ProductRepositoryPort):
+        self._inner = inner
+
+    async def create(self, product: Product) -> Product:
+        return await self._inner.create(product)
+
+    async def find_by_id(self, product_id: str) -> Optional[Product]:
+        return await self._inner.find_by_id(product_id)
+
+    async def find_for_write(self, product_id: str) -> Optional[Product]:
+        return await self._inner.find_for_write(product_id)
+
+    async def is_active(self, product_id: str) -> bool:
+        return await self._inner.is_active(product_id)
+
+    async def find_many(self, product_ids: Sequence[str]) -> List[Product]:
+        return await self._inner.find_many(product_ids)
+
+    async def find_all(self, cat=None, active: bool | None = None, **filters) -> List[Product]:
+        return await self._inner.find_all(cat=cat, active=active, **filters)
+
+    def stream(self, cat=None, active: bool | None = None, **opts) -> AsyncIterator[List[Product]]:
+        return self._inner.stream(cat=cat, active=active, **opts)
+
+    async def update(self, product: Product) -> Product:
+        return await self._inner.update(product)
+
+    async def bulk_update(
+        self, changes: Sequence[tuple[str, dict]]
+    ) -> dict[str, BulkItemStatus]:
+        return await self._inner.bulk_update(changes)
+
+    async def update_where(self, changes: dict, **filters) -> List[str]:
+        return await self._inner.update_where(changes, **filters)
+
+    async def delete(self, product_id: str) -> None:
+        await self._inner.delete(product_id)
+
+    async def reserve_stock(self, product_id: str, qty: int) -> None:
+        await self._inner.reserve_stock(product_id, qty)
+
+    async def adjust_stock(self, deltas: dict[str, int]) -> set[str]:
+        return await self._inner.adjust_stock(deltas)
+
+    async def find_archived(self, product_id: str) -> Optional[Product]:
+        return await self._inner.find_archived(product_id)
+
+    async def archive_inactive(
+        self, deactivated_before: datetime, batch_size: int = 500
+    ) -> List[str]:
+        return await self._inner.archive_inactive(deactivated_before, batch_size)
+
+    async def prime(self, products: Sequence[Product]) -> None:
+        await self._inner.prime(products)
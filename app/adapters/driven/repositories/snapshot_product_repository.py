@@ -0,0 +1,123 @@
+import os
+import time
+from itertools import islice
+from typing import AsyncIterator, List, Optional, Sequence
+
+from bson import ObjectId
+
+from app.adapters.driven.repositories.product_repository_decorator import (
+    ProductRepositoryDecorator,
+)
+from app.adapters.driven.snapshot.catalog_snapshot import SnapshotReader
+from app.domain.entities.product import Product
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+from app.shared.enums.product_sort import ProductSort
+
+
+class SnapshotProductRepository(ProductRepositoryDecorator):
+    """Leituras servidas do snapshot mmap; escritas delegadas ao repositório interno.
+
+    O snapshot contém apenas produtos ativos: listagens com `active=True` saem
+    dele; `active` None/False, ids ausentes (criados depois da exportação ou
+    inativos) e `find_for_write` (leitura antes de PATCH, DELETE, ajuste de
+    estoque) vão ao repositório interno.
+
+    Preço e estoque refletem a última exportação. Um novo arquivo publicado
+    pelo exportador (rename atômico) é detectado em até `reload_interval`
+    segundos; um snapshot gerado há mais de `max_age` segundos (exportador
+    parado) deixa de ser usado e todas as leituras vão ao repositório interno.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        inner: ProductRepositoryPort,
+        reload_interval: float = 5.0,
+        max_age: float = 300.0,
+    ):
+        super().__init__(inner)
+        self._path = path
+        self._reload_interval = reload_interval
+        self._max_age = max_age
+        self._reader = SnapshotReader(path)
+        self._stat = self._file_id()
+        self._checked_at = time.monotonic()
+
+    def _file_id(self) -> tuple[int, int]:
+        st = os.stat(self._path)
+        return st.st_ino, st.st_mtime_ns
+
+    def _current(self) -> Optional[SnapshotReader]:
+        """Reader vigente, ou None se o snapshot passou de `max_age`.
+
+        O reader substituído não é fechado aqui: um `stream` em andamento ainda
+        o usa, e o mmap é liberado quando a última referência a ele some.
+        """
+        now = time.monotonic()
+        if now - self._checked_at >= self._reload_interval:
+            self._checked_at = now
+            if (file_id := self._file_id()) != self._stat:
+                self._reader, self._stat = SnapshotReader(self._path), file_id
+        if time.time() - self._reader.generated_at > self._max_age:
+            return None
+        return self._reader
+
+    async def find_by_id(self, product_id: str) -> Optional[Product]:
+        reader = self._current()
+        if reader is not None and ObjectId.is_valid(product_id):
+            if prod := reader.get(product_id):
+                return prod
+        return await self._inner.find_by_id(product_id)
+
+    async def find_all(
+        self,
+        cat: str | Sequence[str] | None = None,
+        active: bool | None = None,
+        *,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        sort: ProductSort | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> List[Product]:
+        reader = self._current()
+        if active is not True or reader is None:
+            return await self._inner.find_all(
+                cat=cat,
+                active=active,
+                min_price=min_price,
+                max_price=max_price,
+                sort=sort,
+                limit=limit,
+                offset=offset,
+            )
+        if cat is None or isinstance(cat, str):
+            prods = list(reader.scan(category=cat))
+        else:
+            prods = [p for c in dict.fromkeys(cat) for p in reader.scan(category=c)]
+        if min_price is not None:
+            prods = [p for p in prods if p.price >= min_price]
+        if max_price is not None:
+            prods = [p for p in prods if p.price <= max_price]
+        if sort:
+            prods.sort(key=lambda p: (getattr(p, sort.field), p.id), reverse=sort.descending)
+        end = offset + limit if limit else None
+        return prods[offset:end]
+
+    async def stream(
+        self,
+        cat: str | Sequence[str] | None = None,
+        active: bool | None = None,
+        *,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Product]]:
+        reader = self._current()
+        if active is not True or reader is None:
+            async for batch in self._inner.stream(cat=cat, active=active, batch_size=batch_size):
+                yield batch
+            return
+        cats = [cat] if cat is None or isinstance(cat, str) else list(dict.fromkeys(cat))
+        for c in cats:
+            rows = reader.scan(category=c)
+            while batch := list(islice(rows, batch_size)):
+                yield batch
@@ -0,0 +1,124 @@
+"""Snapshot binário do catálogo, lido via mmap e compartilhado entre workers.
+
+Layout (little-endian):
+    header   MAGIC, versão, nº de linhas, offset da tabela de strings, gerado_em
+    linhas   largura fixa, ordenadas pelo ObjectId (busca binária em find_by_id)
+    strings  UTF-8 concatenado; textos repetidos (categorias) gravados uma vez
+"""
+import mmap
+import os
+import struct
+import time
+from typing import Iterable, Iterator, Optional
+
+from bson import ObjectId
+
+from app.adapters.driven.repositories.mongo_product_repository import to_cents
+from app.domain.entities.product import Product
+
+MAGIC = b"CATS"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxIQd")
+# _id, name(off,len), description(off,len), category(off,len), price_cents, stock
+ROW = struct.Struct("<12sIIIIIHqi")
+NULL = 0xFFFFFFFF
+
+
+class SnapshotFormatError(Exception):
+    """Arquivo de snapshot inválido ou de versão incompatível."""
+
+
+def write_snapshot(products: Iterable[Product], path: str) -> int:
+    """Grava o snapshot de forma atômica (arquivo temporário + rename); retorna o nº de linhas."""
+    strings = bytearray()
+    interned: dict[str, tuple[int, int]] = {}
+
+    def ref(s: Optional[str]) -> tuple[int, int]:
+        if s is None:
+            return NULL, 0
+        if s not in interned:
+            raw = s.encode()
+            interned[s] = (len(strings), len(raw))
+            strings.extend(raw)
+        return interned[s]
+
+    rows = []
+    for p in sorted(products, key=lambda p: ObjectId(p.id).binary):
+        name_off, name_len = ref(p.name)
+        desc_off, desc_len = ref(p.description)
+        cat_off, cat_len = ref(str(getattr(p.category, "value", p.category)))
+        rows.append(ROW.pack(
+            ObjectId(p.id).binary, name_off, name_len, desc_off, desc_len,
+            cat_off, cat_len, to_cents(p.price), p.stock,
+        ))
+
+    strings_offset = HEADER.size + ROW.size * len(rows)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(rows), strings_offset, time.time()))
+        f.writelines(rows)
+        f.write(strings)
+    os.replace(tmp, path)
+    return len(rows)
+
+
+class SnapshotReader:
+    """Acesso somente-leitura ao snapshot; as páginas ficam no page cache do host."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self._strings, self.generated_at = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise SnapshotFormatError(f"unsupported snapshot {magic!r} v{version}")
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _str(self, off: int, length: int) -> Optional[str]:
+        if off == NULL:
+            return None
+        start = self._strings + off
+        return self._mm[start:start + length].decode()
+
+    def _row(self, i: int) -> tuple:
+        return ROW.unpack_from(self._mm, HEADER.size + i * ROW.size)
+
+    def _oid(self, i: int) -> bytes:
+        off = HEADER.size + i * ROW.size
+        return self._mm[off:off + 12]
+
+    def _entity(self, row: tuple) -> Product:
+        oid, name_off, name_len, desc_off, desc_len, cat_off, cat_len, cents, stock = row
+        return Product(
+            name=self._str(name_off, name_len),
+            description=self._str(desc_off, desc_len),
+            price=cents / 100,
+            category=self._str(cat_off, cat_len),
+            stock=stock,
+            id=str(ObjectId(oid)),
+        )
+
+    def get(self, product_id: str) -> Optional[Product]:
+        key = ObjectId(product_id).binary
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._oid(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._oid(lo) == key:
+            return self._entity(self._row(lo))
+        return None
+
+    def scan(self, category: Optional[str] = None) -> Iterator[Product]:
+        wanted = None if category is None else str(getattr(category, "value", category)).encode()
+        for i in range(self.count):
+            row = self._row(i)
+            if wanted is not None:
+                start = self._strings + row[5]
+                if self._mm[start:start + row[6]] != wanted:
+                    continue
+            yield self._entity(row)
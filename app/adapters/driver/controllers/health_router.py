@@ -0,0 +1,52 @@
+from os import getenv
+
+from fastapi import APIRouter, Response, status
+from fastapi.responses import PlainTextResponse
+
+from app import warmup
+from app.adapters.driven.mongo import ping
+
+router = APIRouter(tags=["health"])
+
+READY_TIMEOUT = float(getenv("READY_TIMEOUT", "1"))
+
+
+@router.get("/healthz")
+async def healthz():
+    # liveness: sem I/O, só confirma que o processo responde
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz(response: Response):
+    if not warmup.state.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming", "warmup": warmup.state.status, "loaded": warmup.state.loaded}
+    if not await ping(READY_TIMEOUT):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "unavailable", "mongo": False}
+    return {"status": "ready", "mongo": True}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    # formato de exposição do Prometheus (texto), sem dependência de client
+    s = warmup.state
+    lines = [
+        "# HELP catalog_warmup_products_loaded Products loaded into the read cache by the warm-up.",
+        "# TYPE catalog_warmup_products_loaded gauge",
+        f"catalog_warmup_products_loaded {s.loaded}",
+        "# HELP catalog_warmup_hot_ids Ids selected from the access log for the warm-up.",
+        "# TYPE catalog_warmup_hot_ids gauge",
+        f"catalog_warmup_hot_ids {s.hot_ids}",
+        "# HELP catalog_warmup_duration_seconds Duration of the last warm-up.",
+        "# TYPE catalog_warmup_duration_seconds gauge",
+        f"catalog_warmup_duration_seconds {s.duration or 0:.6f}",
+        "# HELP catalog_warmup_status Current warm-up status (1 for the active one).",
+        "# TYPE catalog_warmup_status gauge",
+        *(
+            f'catalog_warmup_status{{status="{name}"}} {int(s.status == name)}'
+            for name in ("disabled", "pending", "running", "done", "failed")
+        ),
+    ]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,85 @@
+from dataclasses import asdict
+from typing import Annotated
+
+from fastapi import status
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from app.adapters.driver.dependencies.di import get_inventory_repo, get_repo
+from app.adapters.driver.dependencies.throttling import read_guard, write_guard
+from app.domain.services.list_store_stock import ListStoreStockService
+from app.domain.services.reserve_store_stock import ReserveStoreStockService
+from app.domain.services.set_store_stock import SetStoreStockService
+from app.shared.exceptions.inventory import OutOfStockException
+
+router = APIRouter(prefix="/inventory", tags=["inventory"])
+
+
+class StoreStockIn(BaseModel):
+    stock: int = Field(ge=0)
+
+
+class StoreStockOut(BaseModel):
+    product_id: str
+    store_id: str
+    stock: int
+
+
+class StoreReserveBody(BaseModel):
+    qty: int = Field(gt=0, description="Quantidade a reservar")
+
+
+@router.get("/", response_model=list[StoreStockOut], dependencies=[Depends(read_guard)])
+async def list_store_stock(
+    product_id: Annotated[list[str], Query(description="Um ou mais products (repita o parâmetro)")],
+    store_id: Annotated[
+        list[str] | None,
+        Query(description="Uma ou mais lojas; omita para todas"),
+    ] = None,
+    inventory=Depends(get_inventory_repo),
+):
+    service = ListStoreStockService(inventory)
+    try:
+        stocks = await service.execute(product_id, store_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return [StoreStockOut(**asdict(s)) for s in stocks]
+
+
+@router.put(
+    "/{store_id}/products/{pid}",
+    response_model=StoreStockOut,
+    dependencies=[Depends(write_guard)],
+)
+async def set_store_stock(
+    store_id: str,
+    pid: str,
+    body: StoreStockIn,
+    inventory=Depends(get_inventory_repo),
+    repo=Depends(get_repo),
+):
+    service = SetStoreStockService(inventory, repo)
+    try:
+        stock = await service.execute(pid, store_id, body.stock)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return StoreStockOut(**asdict(stock))
+
+
+@router.post(
+    "/{store_id}/products/{pid}/reserve",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(write_guard)],
+)
+async def reserve_store_stock(
+    store_id: str,
+    pid: str,
+    body: StoreReserveBody,
+    inventory=Depends(get_inventory_repo),
+    repo=Depends(get_repo),
+):
+    service = ReserveStoreStockService(inventory, repo)
+    try:
+        await service.execute(pid, store_id, body.qty)
+    except OutOfStockException as e:
+        raise HTTPException(status_code=409, detail=str(e))
@@ -1,19 +1,30 @@
+import hashlib
+from collections import Counter
 from dataclasses import asdict
+from typing import Annotated, Any, Literal
 
 from fastapi import status
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
 
-from app.adapters.driver.dependencies.di import get_repo
+from app.adapters.driver.dependencies.di import get_idempotency, get_repo, get_stock_adjuster
+from app.adapters.driver.dependencies.throttling import read_guard, write_guard
+from app.adapters.driver.export.catalog_export import ExportFormat, encode
 from app.domain.entities.product import Product
+from app.domain.services.bulk_update_products import BulkUpdateProductsService
 from app.domain.services.create_product import CreateProductService
 from app.domain.services.delete_product import DeleteProductService
 from app.domain.services.get_product import GetProductService
 from app.domain.services.list_product import ListProductsService
 from app.domain.services.reserve_stock import ReserveStockService
 from app.domain.services.update_product import UpdateProductService
+from app.shared.enums.bulk_item_status import BulkItemStatus
 from app.shared.enums.category import Category
+from app.shared.enums.product_sort import ProductSort
+from app.shared.exceptions.idempotency import IdempotencyConflictException
 from app.shared.exceptions.inventory import OutOfStockException
+from app.shared.handlers.profiling import PhaseTimedJSONResponse, phase
 
 router = APIRouter(prefix="/products", tags=["products"])
 
@@ -33,46 +44,241 @@ class ProductPatchIn(BaseModel):
     stock: int | None = Field(default=None, ge=0)
     active: bool | None = None
 
+class BulkPatchChanges(ProductPatchIn):
+    # num lote, um campo digitado errado não pode virar "updated" sem alterar nada
+    model_config = ConfigDict(extra="forbid")
+
+class BulkPatchItem(BaseModel):
+    id: str
+    changes: dict[str, Any]
+
+class BulkPatchFilter(BaseModel):
+    category: list[Category] | None = None
+    active: bool | None = None
+    min_price: float | None = Field(default=None, ge=0)
+    max_price: float | None = Field(default=None, ge=0)
+
+class BulkPatchIn(BaseModel):
+    """Ou `items` (alterações por id) ou `filter` + `$set` (mesma alteração para todos).
+
+    `$set` sem filtro alteraria o catálogo inteiro: exige `all: true` explícito.
+    """
+    model_config = ConfigDict(populate_by_name=True)
+
+    items: list[BulkPatchItem] | None = Field(default=None, max_length=5000)
+    filter: BulkPatchFilter | None = None
+    set: ProductPatchIn | None = Field(default=None, alias="$set")
+    all: bool = False
+
+    @model_validator(mode="after")
+    def _one_mode(self):
+        if (self.items is None) == (self.set is None):
+            raise ValueError("Provide either items or filter + $set")
+        if self.set is None:
+            if self.filter is not None or self.all:
+                raise ValueError("filter and all only apply to $set")
+            return self
+        has_filter = self.filter is not None and self.filter.model_dump(exclude_none=True)
+        if bool(has_filter) == self.all:
+            raise ValueError("$set needs a non-empty filter, or all: true without one")
+        return self
+
+class BulkItemResult(BaseModel):
+    id: str
+    status: Literal["updated", "not_found", "conflict", "failed", "invalid"]
+    errors: list[str] | None = None
+
+class BulkPatchOut(BaseModel):
+    results: list[BulkItemResult] = []
+    matched: int | None = None
+
 class ReserveBody(BaseModel):
     qty: int = Field(gt=0, description="Quantidade a reservar")
 
+class StockAdjustBody(BaseModel):
+    delta: int = Field(description="Variação do estoque: positiva para entrada, negativa para saída")
+
+    @model_validator(mode="after")
+    def _non_zero(self):
+        if self.delta == 0:
+            raise ValueError("delta must be non-zero")
+        return self
+
 class ProductOut(ProductIn):
     id: str
 
 
-@router.post("/", response_model=ProductOut, status_code=status.HTTP_201_CREATED)
-async def create_product(body: ProductIn, repo=Depends(get_repo)):
-    service = CreateProductService(repo)
-    entity = Product(**body.model_dump())
-    created = await service.execute(entity)
-    return ProductOut(**asdict(created))
+IdempotencyKey = Annotated[
+    str | None,
+    Header(
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Repetições com a mesma chave não reexecutam a operação",
+    ),
+]
+
+
+def _fingerprint(body: BaseModel) -> str:
+    return hashlib.sha256(body.model_dump_json().encode()).hexdigest()
+
+
+async def _idempotent(idempotency, key: str, body: BaseModel, action):
+    try:
+        return await idempotency.execute(key, _fingerprint(body), action)
+    except IdempotencyConflictException as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post(
+    "/",
+    response_model=ProductOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(write_guard)],
+)
+async def create_product(
+    body: ProductIn,
+    repo=Depends(get_repo),
+    idempotency_key: IdempotencyKey = None,
+    idempotency=Depends(get_idempotency),
+):
+    async def _create() -> dict:
+        service = CreateProductService(repo)
+        entity = Product(**body.model_dump())
+        created = await service.execute(entity)
+        return ProductOut(**asdict(created)).model_dump(mode="json")
+
+    if idempotency_key is None:
+        return ProductOut(**await _create())
+    return ProductOut(**await _idempotent(idempotency, f"create:{idempotency_key}", body, _create))
 
 
-@router.get("/", response_model=list[ProductOut])
+@router.get(
+    "/",
+    response_model=list[ProductOut],
+    response_class=PhaseTimedJSONResponse,
+    dependencies=[Depends(read_guard)],
+)
 async def list_products(
-    category: Category | None = Query(
-        default=None,
-        description="Filtra por categoria; omita para todas",
-    ),
-    active: bool | None = Query(
-        default=None,
-        description="true = ativos, false = inativos, omitido = todos",
-    ),
+    category: Annotated[
+        list[Category] | None,
+        Query(description="Filtra por uma ou mais categorias (repita o parâmetro); omita para todas"),
+    ] = None,
+    active: Annotated[
+        bool | None,
+        Query(description="true = ativos, false = inativos, omitido = todos"),
+    ] = None,
+    min_price: Annotated[float | None, Query(ge=0, description="Preço mínimo (inclusivo)")] = None,
+    max_price: Annotated[float | None, Query(ge=0, description="Preço máximo (inclusivo)")] = None,
+    sort: Annotated[
+        ProductSort | None,
+        Query(description="Campo de ordenação; prefixo '-' para decrescente"),
+    ] = None,
+    limit: Annotated[int | None, Query(ge=1, le=1000)] = None,
+    offset: Annotated[int, Query(ge=0)] = 0,
     repo=Depends(get_repo),
 ):
     service = ListProductsService(repo)
-    prods = await service.execute(category=category, active=active)
-    return [ProductOut(**asdict(p)) for p in prods]
+    try:
+        prods = await service.execute(
+            category=category,
+            active=active,
+            min_price=min_price,
+            max_price=max_price,
+            sort=sort,
+            limit=limit,
+            offset=offset,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    with phase("pydantic"):
+        return [ProductOut(**asdict(p)) for p in prods]
+
+
+@router.get("/export", dependencies=[Depends(read_guard)])
+async def export_products(
+    format: Annotated[ExportFormat, Query(description="ndjson, csv ou parquet")] = ExportFormat.NDJSON,
+    gzip: Annotated[bool, Query(description="Comprime a saída com gzip durante o envio")] = False,
+    batch_size: Annotated[int, Query(ge=1, le=10_000)] = 1000,
+    category: Annotated[list[Category] | None, Query()] = None,
+    active: Annotated[bool | None, Query()] = None,
+    repo=Depends(get_repo),
+):
+    if not format.available:
+        raise HTTPException(status_code=501, detail=f"{format.value} export is not available")
+
+    filename = f"catalog.{format.value}" + (".gz" if gzip else "")
+    batches = repo.stream(cat=category, active=active, batch_size=batch_size)
+    return StreamingResponse(
+        encode(format, batches, gzip=gzip),
+        media_type="application/gzip" if gzip else format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.patch("/bulk", response_model=BulkPatchOut, dependencies=[Depends(write_guard)])
+async def bulk_patch_products(body: BulkPatchIn, repo=Depends(get_repo)):
+    service = BulkUpdateProductsService(repo)
+
+    if body.set is not None:
+        flt = body.filter or BulkPatchFilter()
+        try:
+            matched = await service.execute_where(
+                body.set.model_dump(exclude_unset=True, mode="json"),
+                cat=flt.category,
+                active=flt.active,
+                min_price=flt.min_price,
+                max_price=flt.max_price,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return BulkPatchOut(matched=matched)
+
+    # validação por item com as mesmas regras do PATCH unitário; inválidos não abortam o lote
+    results: dict[str, BulkItemResult] = {}
+    valid: list[tuple[str, dict]] = []
+    seen = Counter(item.id for item in body.items)
+    for item in body.items:
+        if seen[item.id] > 1:
+            # com entradas repetidas não há um resultado único a relatar: nenhuma é aplicada
+            results[item.id] = BulkItemResult(
+                id=item.id, status="invalid", errors=["Duplicate id in batch"]
+            )
+            continue
+        try:
+            changes = BulkPatchChanges.model_validate(item.changes).model_dump(
+                exclude_none=True, mode="json"
+            )
+        except ValidationError as e:
+            results[item.id] = BulkItemResult(
+                id=item.id,
+                status="invalid",
+                errors=[f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()],
+            )
+            continue
+        if not changes:
+            results[item.id] = BulkItemResult(id=item.id, status="invalid", errors=["No changes"])
+            continue
+        valid.append((item.id, changes))
 
+    found = await service.execute(valid) if valid else {}
+    for pid, st in found.items():
+        errors = ["Name already in use"] if st == BulkItemStatus.CONFLICT else None
+        results[pid] = BulkItemResult(id=pid, status=st.value, errors=errors)
+    return BulkPatchOut(results=[results[pid] for pid in dict.fromkeys(i.id for i in body.items)])
 
-@router.patch("/{pid}", response_model=ProductOut)
+
+@router.patch("/{pid}", response_model=ProductOut, dependencies=[Depends(write_guard)])
 async def patch_product(pid: str, body: ProductPatchIn, repo=Depends(get_repo)):
     service = UpdateProductService(repo)
     updated = await service.execute(pid, body.model_dump(exclude_unset=True))
     return ProductOut(**asdict(updated))
 
 
-@router.delete("/{pid}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{pid}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(write_guard)],
+)
 async def delete_product(pid: str, repo=Depends(get_repo)):
     service = DeleteProductService(repo)
     try:
@@ -81,19 +287,71 @@ async def delete_product(pid: str, repo=Depends(get_repo)):
         # produto não existe ou já está inativo
         raise HTTPException(status_code=404, detail=str(e))
 
-@router.get("/{pid}", response_model=ProductOut, status_code=status.HTTP_200_OK)
-async def get_product(pid: str, repo=Depends(get_repo)):
+@router.get(
+    "/{pid}",
+    response_model=ProductOut,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(read_guard)],
+)
+async def get_product(
+    pid: str,
+    include_archived: Annotated[
+        bool,
+        Query(description="Busca também no arquivo de produtos inativos removidos da coleção principal"),
+    ] = False,
+    repo=Depends(get_repo),
+):
     service = GetProductService(repo)
     try:
-        prod = await service.execute(pid)
+        prod = await service.execute(pid, include_archived=include_archived)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     return ProductOut(**asdict(prod))
 
-@router.post("/{pid}/reserve", status_code=status.HTTP_204_NO_CONTENT)
-async def reserve_stock(pid: str, body: ReserveBody, repo=Depends(get_repo)):
-    service = ReserveStockService(repo)
-    try:
-        await service.execute(pid, body.qty)
-    except OutOfStockException as e:
-        raise HTTPException(status_code=409, detail=str(e))
+@router.post(
+    "/{pid}/reserve",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(write_guard)],
+)
+async def reserve_stock(
+    pid: str,
+    body: ReserveBody,
+    repo=Depends(get_repo),
+    idempotency_key: IdempotencyKey = None,
+    idempotency=Depends(get_idempotency),
+):
+    async def _reserve() -> None:
+        service = ReserveStockService(repo)
+        try:
+            await service.execute(pid, body.qty)
+        except OutOfStockException as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+    if idempotency_key is None:
+        return await _reserve()
+    await _idempotent(idempotency, f"reserve:{pid}:{idempotency_key}", body, _reserve)
+
+
+@router.post(
+    "/{pid}/stock/adjust",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(write_guard)],
+)
+async def adjust_stock(
+    pid: str,
+    body: StockAdjustBody,
+    adjuster=Depends(get_stock_adjuster),
+    idempotency_key: IdempotencyKey = None,
+    idempotency=Depends(get_idempotency),
+):
+    async def _adjust() -> None:
+        try:
+            await adjuster.execute(pid, body.delta)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except OutOfStockException as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+    if idempotency_key is None:
+        return await _adjust()
+    await _idempotent(idempotency, f"adjust:{pid}:{idempotency_key}", body, _adjust)
@@ -1,5 +1,148 @@
 from functools import lru_cache
+from os import getenv
+
+from fastapi import Depends
+
 from app.adapters.driven.repositories.mongo_product_repository import MongoProductRepository
+from app.domain.services.adjust_stock import AdjustStockService
+from app.domain.services.idempotency import IdempotencyService
+
+
+def read_cache_scope() -> str | None:
+    """`local` (um cache por processo), `shared` (Redis) ou None sem cache de leitura."""
+    url = getenv("CACHE_URL")
+    if not url:
+        return None
+    return "local" if url.startswith("memory://") else "shared"
+
+
+def _cache_backend():
+    url = getenv("CACHE_URL")
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        from app.adapters.driven.cache.in_memory_cache import InMemoryCache
+        return InMemoryCache(max_entries=int(getenv("CACHE_MAX_ENTRIES", "100000")))
+    from app.adapters.driven.cache.redis_cache import RedisCache
+    return RedisCache(url, max_connections=int(getenv("CACHE_MAX_CONNECTIONS", "50")))
+
+
+def _with_circuit_breaker(repo):
+    import asyncio
+
+    from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+
+    from app.adapters.driven.repositories.circuit_breaker_product_repository import (
+        CircuitBreaker,
+        CircuitBreakerProductRepository,
+    )
+    return CircuitBreakerProductRepository(
+        repo,
+        CircuitBreaker(
+            failure_threshold=int(getenv("BREAKER_FAILURE_THRESHOLD", "5")),
+            reset_timeout=float(getenv("BREAKER_RESET_TIMEOUT", "10")),
+        ),
+        timeout=float(getenv("REPO_CALL_TIMEOUT", "2")),
+        # lotes grandes (bulk PATCH, repreço por filtro) legitimamente levam mais
+        bulk_timeout=float(getenv("REPO_BULK_CALL_TIMEOUT", "30")),
+        failures=(asyncio.TimeoutError, OSError, ConnectionFailure),
+        # sem servidor selecionado a escrita nem saiu do processo
+        unsent=(ConnectionRefusedError, ServerSelectionTimeoutError),
+    )
+
+
 @lru_cache
-def _singleton(): return MongoProductRepository()
+def _singleton():
+    repo = MongoProductRepository()
+    if snapshot := getenv("CATALOG_SNAPSHOT_PATH"):
+        from app.adapters.driven.repositories.snapshot_product_repository import (
+            SnapshotProductRepository,
+        )
+        repo = SnapshotProductRepository(
+            snapshot,
+            repo,
+            reload_interval=float(getenv("CATALOG_SNAPSHOT_RELOAD", "5")),
+            max_age=float(getenv("CATALOG_SNAPSHOT_MAX_AGE", "300")),
+        )
+    if getenv("CIRCUIT_BREAKER_ENABLED", "").lower() in ("1", "true"):
+        repo = _with_circuit_breaker(repo)
+    if cache := _cache_backend():
+        from app.adapters.driven.repositories.cached_product_repository import (
+            CachedProductRepository,
+        )
+        repo = CachedProductRepository(repo, cache, ttl=int(getenv("CACHE_TTL", "300")))
+    if getenv("ACCESS_LOG_ENABLED", "").lower() in ("1", "true"):
+        from app.adapters.driven.repositories.access_logging_product_repository import (
+            AccessLoggingProductRepository,
+        )
+        repo = AccessLoggingProductRepository(
+            repo, get_access_log(), flush_interval=float(getenv("ACCESS_LOG_FLUSH_INTERVAL", "30"))
+        )
+    return repo
+
+
 def get_repo(): return _singleton()
+
+
+def get_archive_repo():
+    """Mongo direto para o job de arquivamento; com cache compartilhado, os
+    arquivados são removidos do L2 que as instâncias da API leem."""
+    repo = MongoProductRepository()
+    if read_cache_scope() == "shared":
+        from app.adapters.driven.repositories.cached_product_repository import (
+            CachedProductRepository,
+        )
+        repo = CachedProductRepository(repo, _cache_backend(), ttl=int(getenv("CACHE_TTL", "300")))
+    return repo
+
+
+async def shutdown() -> None:
+    """Persiste o estado mantido só em memória (contagens do access log) no encerramento."""
+    if not _singleton.cache_info().currsize:
+        return
+    from app.adapters.driven.repositories.access_logging_product_repository import (
+        AccessLoggingProductRepository,
+    )
+    if isinstance(repo := _singleton(), AccessLoggingProductRepository):
+        await repo.close()
+
+
+@lru_cache
+def _stock_adjuster(repo):
+    # um batcher por repositório: os ajustes de todas as requisições caem no mesmo lote
+    return AdjustStockService(repo, window=float(getenv("STOCK_ADJUST_WINDOW_MS", "5")) / 1000)
+
+
+def get_stock_adjuster(repo=Depends(get_repo)): return _stock_adjuster(repo)
+
+
+@lru_cache
+def _access_log():
+    from app.adapters.driven.repositories.mongo_access_log import MongoAccessLog
+    return MongoAccessLog()
+
+
+def get_access_log(): return _access_log()
+
+
+@lru_cache
+def _idempotency():
+    from app.adapters.driven.repositories.mongo_idempotency_store import MongoIdempotencyStore
+    store = MongoIdempotencyStore(
+        lru_size=int(getenv("IDEMPOTENCY_LRU_SIZE", "10000")),
+        lock_timeout=float(getenv("IDEMPOTENCY_LOCK_TIMEOUT", "30")),
+    )
+    # renovações bem antes do vencimento: uma falha isolada não entrega a chave
+    return IdempotencyService(store, renew_interval=store.lock_timeout / 3)
+
+
+def get_idempotency(): return _idempotency()
+
+
+@lru_cache
+def _inventory():
+    from app.adapters.driven.repositories.mongo_inventory_repository import MongoInventoryRepository
+    return MongoInventoryRepository()
+
+
+def get_inventory_repo(): return _inventory()
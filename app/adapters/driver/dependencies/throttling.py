@@ -0,0 +1,159 @@
+import asyncio
+import ipaddress
+import math
+import time
+from collections import OrderedDict
+from os import getenv
+from typing import Iterable
+
+from fastapi import HTTPException, Request, status
+
+
+class TokenBucket:
+    """Rate limit por cliente: `rate` tokens/s com rajada de até `burst`."""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10_000):
+        self.rate = rate
+        self.burst = burst
+        self._max_clients = max_clients
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def try_acquire(self, key: str) -> float:
+        """Consome um token; retorna 0 se permitido ou os segundos até o próximo token."""
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self._max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class OverloadedError(Exception):
+    """Fila do limitador cheia ou espera acima do limite."""
+
+
+class ConcurrencyLimiter:
+    """No máximo `limit` requisições em execução e `max_queue` aguardando por até `max_wait` s."""
+
+    def __init__(self, limit: int, max_queue: int, max_wait: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._sem = asyncio.Semaphore(limit)
+        self._waiting = 0
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    async def acquire(self) -> None:
+        if self._sem.locked() and self._waiting >= self.max_queue:
+            raise OverloadedError("queue full")
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), self.max_wait)
+        except asyncio.TimeoutError:
+            raise OverloadedError("queue wait exceeded") from None
+        finally:
+            self._waiting -= 1
+
+    def release(self) -> None:
+        self._sem.release()
+
+
+Networks = tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]
+
+
+def parse_networks(spec: Iterable[str]) -> Networks:
+    return tuple(ipaddress.ip_network(s.strip(), strict=False) for s in spec if s.strip())
+
+
+def _trusted(host: str, proxies: Networks) -> bool:
+    try:
+        addr = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(addr in net for net in proxies)
+
+
+def _client_key(request: Request, proxies: Networks = ()) -> str:
+    """Chave do rate limit: o IP do par TCP.
+
+    Cabeçalhos são controlados pelo cliente; só valem quando o par é um proxy
+    confiável (`TRUSTED_PROXIES`). Nesse caso usa `X-Client-Id`, se o proxy o
+    repassou, ou o último endereço não confiável de `X-Forwarded-For`.
+    """
+    peer = request.client.host if request.client else "anonymous"
+    if not _trusted(peer, proxies):
+        return peer
+    if client_id := request.headers.get("X-Client-Id"):
+        return f"id:{client_id}"
+    hops = [h.strip() for h in request.headers.get("X-Forwarded-For", "").split(",") if h.strip()]
+    for hop in reversed(hops):
+        if not _trusted(hop, proxies):
+            return hop
+    return peer
+
+
+def _retry_after(seconds: float) -> dict:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+
+def make_guard(
+    limiter: ConcurrencyLimiter,
+    bucket: TokenBucket | None = None,
+    trusted_proxies: Networks = (),
+):
+    """Dependência FastAPI: 429 ao estourar o rate limit, 503 quando a fila enche."""
+
+    async def guard(request: Request):
+        if bucket is not None and (
+            wait := bucket.try_acquire(_client_key(request, trusted_proxies))
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers=_retry_after(wait),
+            )
+        try:
+            await limiter.acquire()
+        except OverloadedError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Service overloaded: {e}",
+                headers=_retry_after(limiter.max_wait),
+            )
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    return guard
+
+
+# leituras e escritas em pools separados: rajada de escrita não consome a vez das leituras
+read_limiter = ConcurrencyLimiter(
+    limit=int(getenv("READ_MAX_CONCURRENCY", "200")),
+    max_queue=int(getenv("READ_MAX_QUEUE", "1000")),
+    max_wait=float(getenv("READ_MAX_QUEUE_WAIT", "2")),
+)
+write_limiter = ConcurrencyLimiter(
+    limit=int(getenv("WRITE_MAX_CONCURRENCY", "50")),
+    max_queue=int(getenv("WRITE_MAX_QUEUE", "100")),
+    max_wait=float(getenv("WRITE_MAX_QUEUE_WAIT", "0.5")),
+)
+write_bucket = TokenBucket(
+    rate=float(getenv("WRITE_RATE_PER_CLIENT", "20")),
+    burst=int(getenv("WRITE_BURST_PER_CLIENT", "40")),
+)
+
+read_guard = make_guard(read_limiter)
+write_guard = make_guard(
+    write_limiter, write_bucket, parse_networks(getenv("TRUSTED_PROXIES", "").split(","))
+)
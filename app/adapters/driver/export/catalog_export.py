@@ -0,0 +1,132 @@
+"""Codificadores incrementais do export do catálogo.
+
+Cada formato consome lotes de Product e produz blocos de bytes à medida que os
+lotes chegam; a memória fica limitada a um lote, qualquer que seja o total.
+"""
+import csv
+import io
+import json
+import zlib
+from dataclasses import asdict
+from enum import Enum as PyEnum
+from importlib.util import find_spec
+from typing import AsyncIterator, List
+
+from app.domain.entities.product import Product
+
+FIELDS = ["id", "name", "description", "price", "category", "stock"]
+
+Batches = AsyncIterator[List[Product]]
+
+
+class ExportFormat(str, PyEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+    @property
+    def media_type(self) -> str:
+        return _MEDIA_TYPES[self]
+
+    @property
+    def available(self) -> bool:
+        return self is not ExportFormat.PARQUET or find_spec("pyarrow") is not None
+
+
+_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _row(p: Product) -> dict:
+    row = asdict(p)
+    row["category"] = getattr(p.category, "value", p.category)
+    return {f: row[f] for f in FIELDS}
+
+
+async def ndjson(batches: Batches) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield "".join(json.dumps(_row(p), ensure_ascii=False) + "\n" for p in batch).encode()
+
+
+async def csv_(batches: Batches) -> AsyncIterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=FIELDS, lineterminator="\n")
+    writer.writeheader()
+    async for batch in batches:
+        writer.writerows(_row(p) for p in batch)
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():  # catálogo vazio: só o cabeçalho
+        yield buf.getvalue().encode()
+
+
+class _Drain(io.RawIOBase):
+    """Destino do ParquetWriter que entrega os bytes escritos a cada row group."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def take(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+async def parquet(batches: Batches) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("name", pa.string()),
+        ("description", pa.string()),
+        ("price", pa.float64()),
+        ("category", pa.string()),
+        ("stock", pa.int64()),
+    ])
+    sink = _Drain()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        async for batch in batches:
+            # um row group por lote
+            writer.write_batch(pa.RecordBatch.from_pylist([_row(p) for p in batch], schema=schema))
+            if data := sink.take():
+                yield data
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+async def gzipped(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    comp = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: container gzip
+    async for chunk in chunks:
+        if data := comp.compress(chunk):
+            yield data
+    yield comp.flush()
+
+
+_ENCODERS = {
+    ExportFormat.NDJSON: ndjson,
+    ExportFormat.CSV: csv_,
+    ExportFormat.PARQUET: parquet,
+}
+
+
+def encode(fmt: ExportFormat, batches: Batches, gzip: bool = False) -> AsyncIterator[bytes]:
+    chunks = _ENCODERS[fmt](batches)
+    return gzipped(chunks) if gzip else chunks
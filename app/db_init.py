@@ -1,19 +1,89 @@
 import asyncio
-import os
+import logging
+from os import getenv
+
+from app.adapters.driven.mongo import DB_NAME, get_client, get_collection
+
+log = logging.getLogger(__name__)
+
+# Equality-Sort-Range: filtros (active, category) -> campo de ordenação -> faixa de preço.
+# Cobrem GET /products com e sem categoria (uma ou $in, via SORT_MERGE) e cada `sort`.
+PRODUCT_INDEXES = [
+    [("active", 1), ("category", 1), ("price_cents", 1), ("_id", 1)],
+    [("active", 1), ("category", 1), ("name", 1), ("_id", 1), ("price_cents", 1)],
+    [("active", 1), ("category", 1), ("stock", 1), ("_id", 1), ("price_cents", 1)],
+    [("active", 1), ("price_cents", 1), ("_id", 1)],
+    [("active", 1), ("name", 1), ("_id", 1), ("price_cents", 1)],
+    [("active", 1), ("stock", 1), ("_id", 1), ("price_cents", 1)],
+]
+
+INVENTORY_INDEXES = [
+    [("store_id", 1), ("product_id", 1)],
+    [("product_id", 1), ("store_id", 1)],
+]
+# hash de store_id espalha as lojas (e, portanto, as linhas de um mesmo SKU) entre
+# os shards; product_id no sufixo mantém as consultas por loja num único shard
+INVENTORY_SHARD_KEY = {"store_id": "hashed", "product_id": 1}
+
+
+async def ensure_inventory_sharding(client) -> None:
+    await client.admin.command("enableSharding", DB_NAME)
+    await client.admin.command(
+        "shardCollection", f"{DB_NAME}.inventory", key=INVENTORY_SHARD_KEY
+    )
 
-import motor
-from motor.motor_asyncio import AsyncIOMotorClient
 
 async def ensure_indexes(retries: int = 10, delay: float = 2):
+    sharded = getenv("MONGO_SHARDED", "").lower() in ("1", "true")
     for i in range(retries):
         try:
-            cli = motor.motor_asyncio.AsyncIOMotorClient(os.getenv("MONGO_URI"))
-            col = cli["catalog_db"]["products"]
+            col = get_collection("products")
             await col.create_index("name", unique=True)
-            await col.create_index([("category", 1), ("active", 1)])
-            return
+            for keys in PRODUCT_INDEXES:
+                await col.create_index(keys)
+            # parcial: só os inativos entram, o índice não cresce com o cardápio ativo
+            await col.create_index(
+                "deactivated_at", partialFilterExpression={"active": False}
+            )
+            await get_collection("products_archive").create_index(
+                "archived_at", expireAfterSeconds=int(getenv("ARCHIVE_TTL", str(365 * 86400)))
+            )
+            inventory = get_collection("inventory")
+            for keys in INVENTORY_INDEXES:
+                await inventory.create_index(keys)
+            if sharded:
+                # shardCollection numa coleção com dados exige um índice da chave
+                await inventory.create_index(list(INVENTORY_SHARD_KEY.items()))
+            await get_collection("idempotency_keys").create_index(
+                "created_at", expireAfterSeconds=int(getenv("IDEMPOTENCY_TTL", "86400"))
+            )
+            access = get_collection("product_access")
+            await access.create_index([("hits", -1)])
+            await access.create_index(
+                "last_seen", expireAfterSeconds=int(getenv("ACCESS_LOG_TTL", "604800"))
+            )
+            break
         except Exception as e:
             if i == retries - 1:
                 raise
+            log.warning("ensure_indexes attempt %d/%d failed: %s", i + 1, retries, e)
             await asyncio.sleep(delay)
 
+    if sharded:
+        # fora do laço: uma falha aqui não repete nem impede a criação dos índices
+        try:
+            await ensure_inventory_sharding(get_client())
+        except Exception:
+            log.warning("inventory sharding skipped", exc_info=True)
+
+
+def schedule_indexes(**kwargs) -> asyncio.Task:
+    """Cria os índices em background para não atrasar o startup nem o readiness."""
+    task = asyncio.create_task(ensure_indexes(**kwargs))
+    task.add_done_callback(_log_index_failure)
+    return task
+
+
+def _log_index_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception():
+        log.error("ensure_indexes gave up", exc_info=task.exception())
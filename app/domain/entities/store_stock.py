@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class StoreStock:
+    product_id: str
+    store_id: str
+    stock: int = 0
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class AccessLogPort(ABC):
+    @abstractmethod
+    async def record(self, counts: dict[str, int]) -> None:
+        """Soma os acessos por id de product ao histórico persistido."""
+        pass
+
+    @abstractmethod
+    async def top(self, n: int) -> List[str]:
+        """Retorna os `n` ids mais acessados, do mais para o menos acessado."""
+        pass
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+
+class CachePort(ABC):
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Retorna os valores na mesma ordem das chaves (None para ausentes)."""
+        pass
+
+    @abstractmethod
+    async def set_many(self, items: dict[str, bytes], ttl: int) -> None:
+        """Grava vários valores com expiração de `ttl` segundos."""
+        pass
+
+    @abstractmethod
+    async def delete_many(self, keys: List[str]) -> None:
+        """Remove as chaves informadas."""
+        pass
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Incrementa um contador e retorna o novo valor."""
+        pass
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class IdempotencyRecord:
+    fingerprint: str
+    done: bool
+    result: Any = None
+
+
+class IdempotencyStorePort(ABC):
+    @abstractmethod
+    async def claim(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        """Reserva a chave; retorna None se a reserva foi obtida ou o registro existente."""
+        pass
+
+    @abstractmethod
+    async def complete(self, key: str, fingerprint: str, result: Any) -> None:
+        """Grava o resultado de uma chave reservada."""
+        pass
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Libera uma chave reservada cuja execução falhou."""
+        pass
+
+    async def renew(self, key: str, fingerprint: str) -> None:
+        """Estende a reserva de uma chave ainda em execução; sem expiração, não faz nada."""
+        return None
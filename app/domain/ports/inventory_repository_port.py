@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+
+from app.domain.entities.store_stock import StoreStock
+
+
+class InventoryRepositoryPort(ABC):
+    @abstractmethod
+    async def set_stock(self, product_id: str, store_id: str, stock: int) -> StoreStock:
+        """Define o saldo do product na loja (cria o registro se não existir)."""
+        pass
+
+    @abstractmethod
+    async def reserve(self, product_id: str, store_id: str, qty: int) -> None:
+        """Baixa `qty` do saldo da loja; lança OutOfStockException se insuficiente."""
+        pass
+
+    @abstractmethod
+    async def find_stock(
+        self, product_ids: Sequence[str], store_ids: Optional[Sequence[str]] = None
+    ) -> List[StoreStock]:
+        """Saldos de vários products em várias lojas (todas, se `store_ids` omitido)."""
+        pass
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence
 from app.domain.entities.product import Product
+from app.shared.enums.bulk_item_status import BulkItemStatus
+from app.shared.enums.product_sort import ProductSort
 
 class ProductRepositoryPort(ABC):
     @abstractmethod
@@ -13,9 +16,48 @@ class ProductRepositoryPort(ABC):
         """Retorna um Product (ou None se não encontrado)."""
         pass
 
+    async def find_for_write(self, product_id: str) -> Optional[Product]:
+        """Leitura que antecede uma escrita: sempre da fonte primária, nunca de cópias.
+
+        Snapshot, cache e fallback do circuit breaker podem estar atrasados; um
+        read-modify-write sobre eles regravaria valores antigos.
+        """
+        return await self.find_by_id(product_id)
+
+    @abstractmethod
+    async def is_active(self, product_id: str) -> bool:
+        """Se o product existe e está ativo, lido da fonte primária (como `find_for_write`)."""
+        pass
+
+    @abstractmethod
+    async def find_many(self, product_ids: Sequence[str]) -> List[Product]:
+        """Retorna os products existentes entre os ids, numa única consulta (ordem livre)."""
+        pass
+
     @abstractmethod
-    async def find_all(self, cat: str | None = None, active: bool | None = None) -> List[Product]:
-        """Lista todos os products."""
+    async def find_all(
+        self,
+        cat: str | Sequence[str] | None = None,
+        active: bool | None = None,
+        *,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        sort: ProductSort | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> List[Product]:
+        """Lista os products; `cat` aceita uma ou várias categorias e a faixa de preço é inclusiva."""
+        pass
+
+    @abstractmethod
+    def stream(
+        self,
+        cat: str | Sequence[str] | None = None,
+        active: bool | None = None,
+        *,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Product]]:
+        """Percorre os products em lotes de até `batch_size`, sem materializar a lista inteira."""
         pass
 
     @abstractmethod
@@ -23,6 +65,29 @@ class ProductRepositoryPort(ABC):
         """Atualiza um product existente."""
         pass
 
+    @abstractmethod
+    async def bulk_update(
+        self, changes: Sequence[tuple[str, dict]]
+    ) -> dict[str, BulkItemStatus]:
+        """Aplica alterações parciais por id; retorna o resultado de cada id.
+
+        Um item que falha (nome duplicado, por exemplo) não impede os demais.
+        """
+        pass
+
+    @abstractmethod
+    async def update_where(
+        self,
+        changes: dict,
+        *,
+        cat: str | Sequence[str] | None = None,
+        active: bool | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> List[str]:
+        """Aplica as mesmas alterações a todos os products do filtro; retorna os ids alterados."""
+        pass
+
     @abstractmethod
     async def delete(self, product_id: str) -> None:
         """Remove o product pelo ID."""
@@ -33,3 +98,28 @@ class ProductRepositoryPort(ABC):
         """Remove o product pelo ID."""
         pass
 
+    @abstractmethod
+    async def adjust_stock(self, deltas: dict[str, int]) -> set[str]:
+        """Soma cada delta (com sinal) ao estoque, numa única escrita em lote.
+
+        Retorna os ids ajustados; ficam de fora os inexistentes e os que ficariam
+        com estoque negativo.
+        """
+        pass
+
+    @abstractmethod
+    async def find_archived(self, product_id: str) -> Optional[Product]:
+        """Busca um product já movido para o arquivo (ou None)."""
+        pass
+
+    @abstractmethod
+    async def archive_inactive(
+        self, deactivated_before: datetime, batch_size: int = 500
+    ) -> List[str]:
+        """Move para o arquivo, em lotes, os inativos desde antes da data; retorna os ids movidos."""
+        pass
+
+    async def prime(self, products: Sequence[Product]) -> None:
+        """Pré-carrega products já lidos nos caches de leitura; sem cache, não faz nada."""
+        return None
+
@@ -0,0 +1,93 @@
+import asyncio
+from typing import Optional
+
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+from app.shared.exceptions.inventory import OutOfStockException
+
+
+class AdjustStockService:
+    """Ajustes de estoque com sinal, agrupados em micro-lotes.
+
+    Deltas que chegam dentro de `window` segundos são somados por product e
+    gravados num único `adjust_stock` (um bulk_write de `$inc`). Cada chamador
+    aguarda o próprio future, resolvido quando o lote é gravado. Se o delta
+    somado de um product é recusado (estoque ficaria negativo), os deltas
+    daquele product são reaplicados um a um, para que só os chamadores que
+    realmente não cabem recebam erro.
+
+    Cancelar a espera não retira o delta do lote.
+    """
+
+    def __init__(self, repo: ProductRepositoryPort, window: float = 0.005):
+        self._repo = repo
+        self._window = window
+        self._pending: dict[str, list[tuple[int, asyncio.Future]]] = {}
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def execute(self, pid: str, delta: int) -> None:
+        if delta == 0:
+            raise ValueError("delta must be non-zero")
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(pid, []).append((delta, fut))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+        await asyncio.shield(fut)
+
+    async def _run(self) -> None:
+        # lotes em série: o próximo acumula enquanto o atual é gravado
+        while self._pending:
+            await asyncio.sleep(self._window)
+            batch, self._pending = self._pending, {}
+            await self._flush(batch)
+
+    async def _flush(self, batch: dict[str, list[tuple[int, asyncio.Future]]]) -> None:
+        merged = {pid: sum(d for d, _ in items) for pid, items in batch.items()}
+        try:
+            applied = await self._repo.adjust_stock(merged)
+        except Exception as e:
+            for items in batch.values():
+                for _, fut in items:
+                    _fail(fut, e)
+            return
+
+        for pid, items in batch.items():
+            if pid in applied:
+                for _, fut in items:
+                    _resolve(fut)
+            else:
+                await self._settle_one_by_one(pid, items)
+
+    async def _settle_one_by_one(self, pid: str, items) -> None:
+        if len(items) > 1:
+            # entradas antes de saídas maximiza quantos deltas cabem no estoque
+            for delta, fut in sorted(items, key=lambda i: -i[0]):
+                try:
+                    ok = pid in await self._repo.adjust_stock({pid: delta})
+                except Exception as e:
+                    _fail(fut, e)
+                    continue
+                if ok:
+                    _resolve(fut)
+                else:
+                    _fail(fut, await self._rejection(pid))
+        else:
+            _fail(items[0][1], await self._rejection(pid))
+
+    async def _rejection(self, pid: str) -> Exception:
+        try:
+            exists = await self._repo.find_for_write(pid) is not None
+        except Exception as e:
+            return e
+        if not exists:
+            return ValueError("Product not found")
+        return OutOfStockException("Adjustment would make stock negative")
+
+
+def _resolve(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+def _fail(fut: asyncio.Future, exc: Exception) -> None:
+    if not fut.done():
+        fut.set_exception(exc)
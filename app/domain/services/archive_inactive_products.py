@@ -0,0 +1,16 @@
+from datetime import datetime, timedelta, timezone
+
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+
+
+class ArchiveInactiveProductsService:
+    def __init__(self, repo: ProductRepositoryPort):
+        self._repo = repo
+
+    async def execute(self, retention: timedelta, batch_size: int = 500) -> int:
+        if retention < timedelta(0):
+            raise ValueError("retention cannot be negative")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        cutoff = datetime.now(timezone.utc) - retention
+        return len(await self._repo.archive_inactive(cutoff, batch_size))
@@ -0,0 +1,27 @@
+from typing import Sequence
+
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+from app.shared.enums.bulk_item_status import BulkItemStatus
+
+
+def _clean(changes: dict) -> dict:
+    if (price := changes.get("price")) is not None and price < 0:
+        raise ValueError("Price cannot be negative")
+    return {k: v for k, v in changes.items() if v is not None}
+
+
+class BulkUpdateProductsService:
+    def __init__(self, repo: ProductRepositoryPort):
+        self._repo = repo
+
+    async def execute(self, changes: Sequence[tuple[str, dict]]) -> dict[str, BulkItemStatus]:
+        return await self._repo.bulk_update([(pid, _clean(item)) for pid, item in changes])
+
+    async def execute_where(self, changes: dict, **filters) -> int:
+        clean = _clean(changes)
+        if not clean:
+            raise ValueError("No changes to apply")
+        if "name" in clean:
+            # nome é único: o mesmo valor em vários products só pode colidir
+            raise ValueError("name cannot be set by filter")
+        return len(await self._repo.update_where(clean, **filters))
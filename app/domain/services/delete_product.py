@@ -6,7 +6,7 @@ class DeleteProductService:
         self._repo = repo
 
     async def execute(self, pid: str) -> None:
-        prod = await self._repo.find_by_id(pid)
+        prod = await self._repo.find_for_write(pid)
         if not prod or prod.stock <= 0:
             raise ValueError("Product not found or already inactive")
         await self._repo.delete(pid)
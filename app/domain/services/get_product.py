@@ -6,8 +6,10 @@ class GetProductService:
     def __init__(self, repo: ProductRepositoryPort):
         self._repo = repo
 
-    async def execute(self, pid: str) -> Product:
+    async def execute(self, pid: str, include_archived: bool = False) -> Product:
         prod = await self._repo.find_by_id(pid)
+        if not prod and include_archived:
+            prod = await self._repo.find_archived(pid)
         if not prod:
             raise ValueError("Product not found")
         return prod
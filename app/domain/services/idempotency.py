@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from app.domain.ports.idempotency_store_port import IdempotencyStorePort
+from app.shared.exceptions.idempotency import IdempotencyConflictException
+
+log = logging.getLogger(__name__)
+
+
+class IdempotencyService:
+    """Executa `action` no máximo uma vez por chave.
+
+    Duplicatas concorrentes no mesmo processo aguardam a execução em andamento;
+    entre réplicas a reserva atômica no store garante a exclusividade.
+
+    A reserva é renovada a cada `renew_interval` segundos enquanto a ação roda
+    e até o resultado ser gravado, para que outra réplica não a assuma. Se a
+    gravação do resultado falha depois de a ação ter sido aplicada, ela é
+    repetida em background (com a reserva ainda renovada) em vez de liberar a
+    chave para uma reexecução.
+    """
+
+    def __init__(
+        self,
+        store: IdempotencyStorePort,
+        renew_interval: float = 10.0,
+        complete_retry: float = 0.2,
+        complete_retry_max: float = 5.0,
+    ):
+        self._store = store
+        self._renew_interval = renew_interval
+        self._complete_retry = complete_retry
+        self._complete_retry_max = complete_retry_max
+        self._inflight: dict[str, tuple[asyncio.Future, str]] = {}
+        self._completing: set[asyncio.Task] = set()
+
+    async def execute(
+        self, key: str, fingerprint: str, action: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        if (inflight := self._inflight.get(key)) is not None:
+            fut, running_fp = inflight
+            self._check(fingerprint, running_fp)
+            return await asyncio.shield(fut)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (fut, fingerprint)
+        try:
+            result = await self._run(key, fingerprint, action)
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # evita o aviso de exceção não consumida sem aguardantes
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def _run(self, key: str, fingerprint: str, action) -> Any:
+        existing = await self._store.claim(key, fingerprint)
+        if existing is not None:
+            self._check(fingerprint, existing.fingerprint)
+            if not existing.done:
+                raise IdempotencyConflictException("A request with this Idempotency-Key is in progress")
+            return existing.result
+
+        lease = asyncio.create_task(self._renew(key, fingerprint))
+        try:
+            result = await action()
+        except BaseException:
+            lease.cancel()
+            await self._store.release(key)
+            raise
+
+        try:
+            await self._store.complete(key, fingerprint, result)
+        except BaseException as e:
+            # a ação já foi aplicada: a chave não pode voltar a ficar livre
+            task = asyncio.create_task(self._complete_later(key, fingerprint, result, lease))
+            self._completing.add(task)
+            task.add_done_callback(self._completing.discard)
+            if not isinstance(e, Exception):
+                raise
+            log.warning("idempotency complete failed for %s; retrying", key, exc_info=True)
+        else:
+            lease.cancel()
+        return result
+
+    async def _renew(self, key: str, fingerprint: str) -> None:
+        while True:
+            await asyncio.sleep(self._renew_interval)
+            try:
+                await self._store.renew(key, fingerprint)
+            except Exception:
+                log.warning("idempotency lease renewal failed for %s", key, exc_info=True)
+
+    async def _complete_later(
+        self, key: str, fingerprint: str, result: Any, lease: asyncio.Task
+    ) -> None:
+        delay = self._complete_retry
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                try:
+                    await self._store.complete(key, fingerprint, result)
+                    return
+                except Exception:
+                    log.warning("idempotency complete retry failed for %s", key, exc_info=True)
+                delay = min(delay * 2, self._complete_retry_max)
+        finally:
+            lease.cancel()
+
+    @staticmethod
+    def _check(fingerprint: str, stored: str) -> None:
+        if fingerprint != stored:
+            raise IdempotencyConflictException("Idempotency-Key reused with a different payload")
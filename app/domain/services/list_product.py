@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from app.domain.entities.product import Product
 from app.domain.ports.product_repository_port import ProductRepositoryPort
+from app.shared.enums.product_sort import ProductSort
 
 
 class ListProductsService:
@@ -9,6 +10,24 @@ class ListProductsService:
         self._repo = repo
 
     async def execute(
-        self, *, active: bool | None = None, category: Optional[str] = None
+        self,
+        *,
+        active: bool | None = None,
+        category: Optional[str | Sequence[str]] = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        sort: ProductSort | None = None,
+        limit: int | None = None,
+        offset: int = 0,
     ) -> List[Product]:
-        return await self._repo.find_all(cat=category, active=active)
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("min_price cannot be greater than max_price")
+        return await self._repo.find_all(
+            cat=category,
+            active=active,
+            min_price=min_price,
+            max_price=max_price,
+            sort=sort,
+            limit=limit,
+            offset=offset,
+        )
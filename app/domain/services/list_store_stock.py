@@ -0,0 +1,20 @@
+from typing import List, Optional, Sequence
+
+from app.domain.entities.store_stock import StoreStock
+from app.domain.ports.inventory_repository_port import InventoryRepositoryPort
+
+
+class ListStoreStockService:
+    def __init__(self, repo: InventoryRepositoryPort, max_products: int = 500):
+        self._repo = repo
+        self._max_products = max_products
+
+    async def execute(
+        self, product_ids: Sequence[str], store_ids: Optional[Sequence[str]] = None
+    ) -> List[StoreStock]:
+        ids = list(dict.fromkeys(product_ids))
+        if not ids:
+            raise ValueError("At least one product id is required")
+        if len(ids) > self._max_products:
+            raise ValueError(f"At most {self._max_products} product ids per request")
+        return await self._repo.find_stock(ids, store_ids)
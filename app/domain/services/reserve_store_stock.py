@@ -0,0 +1,17 @@
+from app.domain.ports.inventory_repository_port import InventoryRepositoryPort
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+from app.shared.exceptions.inventory import OutOfStockException
+
+
+class ReserveStoreStockService:
+    def __init__(self, inventory: InventoryRepositoryPort, products: ProductRepositoryPort):
+        self._inventory = inventory
+        self._products = products
+
+    async def execute(self, pid: str, store_id: str, qty: int) -> None:
+        if qty <= 0:
+            raise ValueError("qty must be positive")
+        # mesma regra da reserva global: inativo ou arquivado não é vendável
+        if not await self._products.is_active(pid):
+            raise OutOfStockException("Product inactive or not found")
+        await self._inventory.reserve(pid, store_id, qty)
@@ -0,0 +1,16 @@
+from app.domain.entities.store_stock import StoreStock
+from app.domain.ports.inventory_repository_port import InventoryRepositoryPort
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+
+
+class SetStoreStockService:
+    def __init__(self, inventory: InventoryRepositoryPort, products: ProductRepositoryPort):
+        self._inventory = inventory
+        self._products = products
+
+    async def execute(self, pid: str, store_id: str, stock: int) -> StoreStock:
+        if stock < 0:
+            raise ValueError("stock cannot be negative")
+        if not await self._products.find_for_write(pid):
+            raise ValueError("Product not found")
+        return await self._inventory.set_stock(pid, store_id, stock)
@@ -8,7 +8,7 @@ class UpdateProductService:
         self._repo = repo
 
     async def execute(self, pid: str, changes: dict) -> Product:
-        current = await self._repo.find_by_id(pid)
+        current = await self._repo.find_for_write(pid)
         if not current:
             raise ValueError("Product not found")
 
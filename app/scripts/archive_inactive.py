@@ -0,0 +1,25 @@
+"""Move para `products_archive` os produtos inativos há mais que a retenção.
+
+Pensado para rodar periodicamente (cron / CronJob); pode ser reexecutado a
+qualquer momento, inclusive após uma interrupção no meio de um lote.
+
+Uso: MONGO_URI=... python -m app.scripts.archive_inactive --retention-days 30
+"""
+import argparse
+import asyncio
+from datetime import timedelta
+
+from app.adapters.driver.dependencies.di import get_archive_repo
+from app.domain.services.archive_inactive_products import ArchiveInactiveProductsService
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--retention-days", type=float, default=30)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    service = ArchiveInactiveProductsService(get_archive_repo())
+    moved = asyncio.run(
+        service.execute(timedelta(days=args.retention_days), batch_size=args.batch_size)
+    )
+    print(f"{moved} products archived")
@@ -0,0 +1,50 @@
+"""Exporta o catálogo em NDJSON, CSV ou Parquet, em streaming a partir do cursor do Mongo.
+
+Uso: MONGO_URI=... python -m app.scripts.export_catalog --format csv --gzip -o catalog.csv.gz
+"""
+import argparse
+import asyncio
+import sys
+
+from app.adapters.driven.repositories.mongo_product_repository import MongoProductRepository
+from app.adapters.driver.export.catalog_export import ExportFormat, encode
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+
+
+async def export(
+    repo: ProductRepositoryPort,
+    out,
+    fmt: ExportFormat,
+    gzip: bool = False,
+    batch_size: int = 1000,
+    active: bool | None = None,
+) -> int:
+    written = 0
+    async for chunk in encode(fmt, repo.stream(active=active, batch_size=batch_size), gzip=gzip):
+        out.write(chunk)
+        written += len(chunk)
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--format", type=ExportFormat, default=ExportFormat.NDJSON)
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--active-only", action="store_true")
+    parser.add_argument("-o", "--output", help="arquivo de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        asyncio.run(export(
+            MongoProductRepository(),
+            out,
+            args.format,
+            gzip=args.gzip,
+            batch_size=args.batch_size,
+            active=True if args.active_only else None,
+        ))
+    finally:
+        if args.output:
+            out.close()
@@ -0,0 +1,23 @@
+"""Exporta os produtos ativos para o snapshot binário lido pelos workers.
+
+Uso: MONGO_URI=... python -m app.scripts.export_snapshot /var/lib/catalog/catalog.snap
+"""
+import argparse
+import asyncio
+
+from app.adapters.driven.repositories.mongo_product_repository import MongoProductRepository
+from app.adapters.driven.snapshot.catalog_snapshot import write_snapshot
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+
+
+async def export(repo: ProductRepositoryPort, path: str) -> int:
+    return write_snapshot(await repo.find_all(active=True), path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    total = asyncio.run(export(MongoProductRepository(), args.path))
+    print(f"{total} products written to {args.path}")
@@ -0,0 +1,47 @@
+"""Migração única: `price` (float ou Decimal128) -> `price_cents` (int).
+
+Uso: MONGO_URI=... python -m app.scripts.migrate_price_cents [--batch-size 500]
+"""
+import argparse
+import asyncio
+
+from bson.decimal128 import Decimal128
+from pymongo import UpdateOne
+
+from app.adapters.driven.mongo import get_collection
+from app.adapters.driven.repositories.mongo_product_repository import to_cents
+
+# $type em vez de $exists: $exists casa também `price: null`, que não tem o que converter
+PENDING = {"price": {"$type": "number"}, "price_cents": {"$exists": False}}
+
+
+def migration_op(doc: dict) -> UpdateOne:
+    price = doc["price"]
+    if isinstance(price, Decimal128):
+        price = price.to_decimal()
+    return UpdateOne(
+        {"_id": doc["_id"], "price_cents": {"$exists": False}},
+        {"$set": {"price_cents": to_cents(price)}, "$unset": {"price": ""}},
+    )
+
+
+async def migrate(col, batch_size: int = 500) -> int:
+    migrated = 0
+    ops: list[UpdateOne] = []
+    async for doc in col.find(PENDING, {"price": 1}, batch_size=batch_size):
+        ops.append(migration_op(doc))
+        if len(ops) >= batch_size:
+            migrated += (await col.bulk_write(ops, ordered=False)).modified_count
+            ops = []
+    if ops:
+        migrated += (await col.bulk_write(ops, ordered=False)).modified_count
+    return migrated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    total = asyncio.run(migrate(get_collection("products"), args.batch_size))
+    print(f"{total} products migrated to price_cents")
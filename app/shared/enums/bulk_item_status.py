@@ -0,0 +1,8 @@
+from enum import Enum as PyEnum
+
+
+class BulkItemStatus(str, PyEnum):
+    UPDATED = "updated"
+    NOT_FOUND = "not_found"
+    CONFLICT = "conflict"  # violaria o índice único de nome
+    FAILED = "failed"
@@ -0,0 +1,18 @@
+from enum import Enum as PyEnum
+
+
+class ProductSort(str, PyEnum):
+    PRICE_ASC = "price"
+    PRICE_DESC = "-price"
+    NAME_ASC = "name"
+    NAME_DESC = "-name"
+    STOCK_ASC = "stock"
+    STOCK_DESC = "-stock"
+
+    @property
+    def field(self) -> str:
+        return self.value.lstrip("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.value.startswith("-")
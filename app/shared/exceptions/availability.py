@@ -0,0 +1,10 @@
+class RepositoryUnavailableException(Exception):
+    """Lançada quando o banco está indisponível ou o circuit breaker está aberto."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RepositoryOutcomeUnknownException(Exception):
+    """Escrita enviada ao banco sem resposta: pode ou não ter sido aplicada."""
@@ -0,0 +1,2 @@
+class IdempotencyConflictException(Exception):
+    """Lançada quando a chave está em uso por outra requisição ou foi reutilizada com outro payload."""
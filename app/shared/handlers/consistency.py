@@ -0,0 +1,57 @@
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+CONSISTENCY_HEADER = "X-Consistency-Token"
+
+
+class _Consistency:
+    __slots__ = ("read_after", "written_at")
+
+    def __init__(self, read_after: Optional[str] = None):
+        self.read_after = read_after
+        self.written_at: Optional[str] = None
+
+
+_current: ContextVar[Optional[_Consistency]] = ContextVar("consistency", default=None)
+
+
+def read_after() -> Optional[str]:
+    """Token recebido do cliente: leituras devem refletir escritas até esse ponto."""
+    c = _current.get()
+    return c.read_after if c is not None else None
+
+
+def record_write(token: str) -> None:
+    """Registra o ponto da última escrita da requisição atual (token opaco)."""
+    if (c := _current.get()) is not None:
+        c.written_at = token
+
+
+class CausalConsistencyMiddleware:
+    """Propaga o token de consistência causal entre requisições.
+
+    Respostas de escrita levam `X-Consistency-Token`; o cliente o reenvia nas
+    leituras seguintes para ler as próprias escritas mesmo em secundários.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        consistency = _Consistency(Headers(scope=scope).get(CONSISTENCY_HEADER))
+        token = _current.set(consistency)
+
+        async def send_with_token(message):
+            if message["type"] == "http.response.start" and consistency.written_at:
+                MutableHeaders(scope=message).append(CONSISTENCY_HEADER, consistency.written_at)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_token)
+        finally:
+            _current.reset(token)
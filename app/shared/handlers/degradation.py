@@ -0,0 +1,70 @@
+import math
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+
+from app.shared.exceptions.availability import (
+    RepositoryOutcomeUnknownException,
+    RepositoryUnavailableException,
+)
+
+
+class _Staleness:
+    __slots__ = ("stored_at",)
+
+    def __init__(self):
+        self.stored_at: Optional[float] = None
+
+
+_current: ContextVar[Optional[_Staleness]] = ContextVar("staleness", default=None)
+
+
+def mark_stale(stored_at: float) -> None:
+    """Sinaliza que a resposta atual usa dados gravados em `stored_at` (time.monotonic)."""
+    if (s := _current.get()) is not None:
+        s.stored_at = stored_at if s.stored_at is None else min(s.stored_at, stored_at)
+
+
+class StalenessHeaderMiddleware:
+    """Adiciona `Warning: 110` e `Age` às respostas servidas do último estado conhecido."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        staleness = _Staleness()
+        token = _current.set(staleness)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and staleness.stored_at is not None:
+                headers = MutableHeaders(scope=message)
+                headers.append("Warning", '110 - "Response is Stale"')
+                headers.append("Age", str(int(time.monotonic() - staleness.stored_at)))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+
+
+async def repository_unavailable_handler(request: Request, exc: RepositoryUnavailableException):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+async def repository_outcome_unknown_handler(
+    request: Request, exc: RepositoryOutcomeUnknownException
+):
+    # sem Retry-After: repetir às cegas pode aplicar a escrita duas vezes
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
@@ -0,0 +1,182 @@
+import cProfile
+import hmac
+import io
+import logging
+import marshal
+import pstats
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from os import getenv
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+log = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+
+
+class _Timings:
+    __slots__ = ("phases", "stack")
+
+    def __init__(self):
+        self.phases: dict[str, float] = defaultdict(float)
+        self.stack: list[float] = []
+
+
+_current: ContextVar[Optional[_Timings]] = ContextVar("timings", default=None)
+
+
+@contextmanager
+def phase(name: str):
+    """Acumula o tempo do bloco na fase `name` da requisição atual.
+
+    Fases aninhadas são descontadas da externa (tempo exclusivo): `mongo` em volta
+    de um laço que chama `decode` mede só a espera pelo banco. Fora de uma
+    requisição o custo é um `ContextVar.get`.
+    """
+    t = _current.get()
+    if t is None:
+        yield
+        return
+    start = time.perf_counter()
+    t.stack.append(0.0)
+    try:
+        yield
+    finally:
+        children = t.stack.pop()
+        elapsed = time.perf_counter() - start
+        t.phases[name] += elapsed - children
+        if t.stack:
+            t.stack[-1] += elapsed
+
+
+class PhaseTimedJSONResponse(JSONResponse):
+    """JSONResponse que contabiliza a serialização na fase `json`."""
+
+    def render(self, content) -> bytes:
+        with phase("json"):
+            return super().render(content)
+
+
+def _fmt_phases(phases: dict[str, float], total: float) -> str:
+    parts = [f"{k}={v * 1000:.1f}ms" for k, v in phases.items()]
+    parts.append(f"other={(total - sum(phases.values())) * 1000:.1f}ms")
+    return " ".join(parts)
+
+
+class ProfilingMiddleware:
+    """Perfil sob demanda e log de requisições lentas.
+
+    - `X-Profile: <PROFILE_TOKEN>` executa a requisição sob cProfile e devolve o
+      perfil (formato pstats, abra com `python -m pstats` ou snakeviz) no lugar
+      da resposta; o status original vai em `X-Profiled-Status`.
+    - `PROFILE_SAMPLE_RATE` (0..1) perfila uma amostra das requisições e registra
+      as funções mais caras no log, sem alterar a resposta.
+    - Requisições acima de `SLOW_REQUEST_MS` são registradas com o tempo por fase
+      (mongo, decode, pydantic, json); todas as respostas levam `Server-Timing`.
+
+    cProfile é por thread: corrotinas concorrentes no mesmo event loop aparecem
+    no perfil. Apenas um perfil roda por vez; as demais requisições seguem sem.
+    """
+
+    def __init__(
+        self,
+        app,
+        token: Optional[str] = None,
+        sample_rate: Optional[float] = None,
+        slow_ms: Optional[float] = None,
+    ):
+        self.app = app
+        self.token = token if token is not None else getenv("PROFILE_TOKEN", "")
+        self.sample_rate = (
+            sample_rate if sample_rate is not None else float(getenv("PROFILE_SAMPLE_RATE", "0"))
+        )
+        self.slow_ms = slow_ms if slow_ms is not None else float(getenv("SLOW_REQUEST_MS", "500"))
+        self._busy = False
+
+    def _profile_mode(self, scope) -> Optional[str]:
+        requested = Headers(scope=scope).get(PROFILE_HEADER)
+        if requested and self.token and hmac.compare_digest(requested, self.token):
+            return "download"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "log"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = _Timings()
+        token = _current.set(timings)
+        mode = None if self._busy else self._profile_mode(scope)
+        profiler = cProfile.Profile() if mode else None
+        status_code = 0
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if timings.phases:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        ", ".join(f"{k};dur={v * 1000:.1f}" for k, v in timings.phases.items()),
+                    )
+            if mode != "download":
+                await send(message)
+
+        try:
+            if profiler:
+                self._busy = True
+                profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                if profiler:
+                    profiler.disable()
+                    self._busy = False
+        finally:
+            _current.reset(token)
+
+        total = time.perf_counter() - start
+        if total * 1000 >= self.slow_ms:
+            log.warning(
+                "slow request %s %s status=%s total=%.1fms %s",
+                scope["method"],
+                scope["path"],
+                status_code,
+                total * 1000,
+                _fmt_phases(timings.phases, total),
+            )
+
+        if mode == "log":
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(30)
+            log.info("profile %s %s\n%s", scope["method"], scope["path"], out.getvalue())
+        elif mode == "download":
+            await self._send_profile(send, profiler, status_code)
+
+    @staticmethod
+    async def _send_profile(send, profiler: cProfile.Profile, status_code: int) -> None:
+        profiler.create_stats()
+        body = marshal.dumps(profiler.stats)
+        filename = f"profile-{int(time.time())}.prof"
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/octet-stream"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"content-disposition", f'attachment; filename="{filename}"'.encode()),
+                    (b"x-profiled-status", str(status_code).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
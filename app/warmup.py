@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from os import getenv
+from typing import Optional
+
+from app.domain.ports.access_log_port import AccessLogPort
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmUpState:
+    # disabled | pending | running | done | failed
+    status: str = "disabled"
+    loaded: int = 0
+    hot_ids: int = 0
+    duration: Optional[float] = None
+    # só um cache do próprio processo justifica segurar o readiness
+    gates_readiness: bool = True
+
+    @property
+    def ready(self) -> bool:
+        # falha não bloqueia o readiness: a réplica atende com o cache frio
+        return not self.gates_readiness or self.status not in ("pending", "running")
+
+
+state = WarmUpState()
+
+
+async def warm_up(
+    repo: ProductRepositoryPort,
+    modes: set[str],
+    *,
+    access_log: Optional[AccessLogPort] = None,
+    top_n: int = 1000,
+    batch_size: int = 1000,
+    progress: WarmUpState = state,
+) -> WarmUpState:
+    """Carrega products nos caches de leitura do repositório antes do readiness.
+
+    - `hot`: os `top_n` ids mais acessados do access log, numa única consulta;
+    - `active`: todos os products ativos, num único cursor em lotes de `batch_size`.
+    """
+    progress.status, progress.loaded = "running", 0
+    started = time.perf_counter()
+    try:
+        if "hot" in modes and access_log is not None:
+            ids = await access_log.top(top_n)
+            progress.hot_ids = len(ids)
+            hot = await repo.find_many(ids)
+            await repo.prime(hot)
+            progress.loaded += len(hot)
+        if "active" in modes:
+            async for batch in repo.stream(active=True, batch_size=batch_size):
+                await repo.prime(batch)
+                progress.loaded += len(batch)
+        progress.status = "done"
+    except Exception:
+        progress.status = "failed"
+        raise
+    finally:
+        progress.duration = time.perf_counter() - started
+    log.info("warm-up loaded %d products in %.2fs", progress.loaded, progress.duration)
+    return progress
+
+
+def schedule_warm_up() -> Optional[asyncio.Task]:
+    """Agenda o warm-up configurado em WARMUP (`active`, `hot` ou ambos, separados por vírgula).
+
+    Roda em background para o processo responder /healthz. Sem CACHE_URL não há
+    o que aquecer e nada roda. Com cache em memória (por processo) /readyz fica
+    em 503 até terminar ou estourar WARMUP_TIMEOUT; com cache compartilhado
+    (Redis) as outras réplicas já o aquecem e o readiness não espera.
+    """
+    from app.adapters.driver.dependencies.di import get_access_log, get_repo, read_cache_scope
+
+    modes = {m.strip() for m in getenv("WARMUP", "").split(",") if m.strip()}
+    scope = read_cache_scope()
+    if not modes or scope is None:
+        if modes:
+            log.info("WARMUP=%s ignored: no read cache configured (CACHE_URL)", ",".join(modes))
+        state.status = "disabled"
+        return None
+
+    state.status = "pending"
+    state.gates_readiness = scope == "local"
+    task = asyncio.create_task(
+        asyncio.wait_for(
+            warm_up(
+                get_repo(),
+                modes,
+                access_log=get_access_log() if "hot" in modes else None,
+                top_n=int(getenv("WARMUP_TOP_N", "1000")),
+                batch_size=int(getenv("WARMUP_BATCH_SIZE", "1000")),
+            ),
+            float(getenv("WARMUP_TIMEOUT", "60")),
+        )
+    )
+    task.add_done_callback(_log_warm_up_failure)
+    return task
+
+
+def _log_warm_up_failure(task: asyncio.Task) -> None:
+    if task.cancelled() or not task.exception():
+        return
+    # timeout cancela warm_up antes de ele marcar o estado
+    state.status = "failed"
+    log.error("warm-up failed; serving with a cold cache", exc_info=task.exception())
@@ -0,0 +1,130 @@
+"""Benchmark da decodificação de `find_all` (10k e 100k linhas).
+
+Compara, sobre os mesmos lotes BSON:
+  * motor – caminho atual, equivalente ao cursor do Motor: cada lote do
+            servidor é decodificado de uma vez em dicts (`decode_all`) e
+            `MongoProductRepository._to_entities` monta os Products;
+  * raw   – `document_class=RawBSONDocument`: os documentos ficam como
+            buffers e os campos são lidos direto deles por `_doc_to_entity`.
+
+O cursor do Motor não cede o event loop por documento, só por lote; a
+linha de base faz o mesmo, senão mede o scheduler e não a decodificação.
+
+Sem argumentos roda offline, sobre buffers BSON sintéticos. Com `--mongo`
+semeia uma coleção temporária em MONGO_URI e mede as duas `document_class`
+ponta a ponta.
+
+Uso: python -m benchmarks.decode_bench [--rows 10000 100000] [--mongo]
+"""
+import argparse
+import asyncio
+import time
+from os import getenv
+
+from bson import ObjectId, decode_all, encode
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+from app.adapters.driven.repositories.mongo_product_repository import (
+    _PROJECTION,
+    MongoProductRepository,
+)
+
+BATCH_BYTES = 4 * 1024 * 1024  # próximo do tamanho de lote que o servidor devolve
+RAW = CodecOptions(document_class=RawBSONDocument)
+
+
+def _docs(n: int) -> list[dict]:
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Produto {i}",
+            "description": "Descrição de teste",
+            "price_cents": 1000 + i % 5000,
+            "category": "Lanche",
+            "stock": i % 100,
+            "active": True,
+        }
+        for i in range(n)
+    ]
+
+
+def _batches(docs: list[dict]) -> list[bytes]:
+    out, cur, size = [], [], 0
+    for d in docs:
+        raw = encode(d)
+        cur.append(raw)
+        size += len(raw)
+        if size >= BATCH_BYTES:
+            out.append(b"".join(cur))
+            cur, size = [], 0
+    if cur:
+        out.append(b"".join(cur))
+    return out
+
+
+async def _timeit(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _report(label: str, rows: int, t_motor: float, t_raw: float) -> None:
+    print(
+        f"{label:<7} rows={rows:>7}  motor={t_motor * 1000:8.1f} ms  "
+        f"raw={t_raw * 1000:8.1f} ms  speedup={t_motor / t_raw:4.2f}x"
+    )
+
+
+async def bench_offline(rows: int) -> None:
+    batches = _batches(_docs(rows))
+
+    async def cursor(codec_options=None):
+        # um await por lote, como o cursor do Motor
+        for batch in batches:
+            await asyncio.sleep(0)
+            for d in decode_all(batch, codec_options) if codec_options else decode_all(batch):
+                yield d
+
+    async def motor_path():
+        MongoProductRepository._to_entities([d async for d in cursor()])
+
+    async def raw_path():
+        MongoProductRepository._to_entities([d async for d in cursor(RAW)])
+
+    _report("offline", rows, await _timeit(motor_path), await _timeit(raw_path))
+
+
+async def bench_mongo(rows: int) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    col = AsyncIOMotorClient(getenv("MONGO_URI"))["catalog_bench"]["products"]
+    await col.drop()
+    await col.insert_many(_docs(rows), ordered=False)
+    raw_col = col.with_options(codec_options=RAW)
+    try:
+        async def motor_path():
+            MongoProductRepository._to_entities([d async for d in col.find({}, _PROJECTION)])
+
+        async def raw_path():
+            MongoProductRepository._to_entities([d async for d in raw_col.find({}, _PROJECTION)])
+
+        t_motor, t_raw = await _timeit(motor_path, 3), await _timeit(raw_path, 3)
+    finally:
+        await col.drop()
+    _report("mongo", rows, t_motor, t_raw)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--mongo", action="store_true", help="mede também contra MONGO_URI")
+    args = parser.parse_args()
+
+    for n in args.rows:
+        asyncio.run(bench_offline(n))
+        if args.mongo:
+            asyncio.run(bench_mongo(n))
@@ -1,13 +1,40 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from app.adapters.driver.controllers.health_router import router as health_router
+from app.adapters.driver.controllers.inventory_router import router as inventory_router
 from app.adapters.driver.controllers.product_router import router
-from app.db_init import ensure_indexes
+from app.adapters.driver.dependencies import di
+from app.db_init import schedule_indexes
+from app.warmup import schedule_warm_up
+from app.shared.exceptions.availability import (
+    RepositoryOutcomeUnknownException,
+    RepositoryUnavailableException,
+)
+from app.shared.handlers.consistency import CausalConsistencyMiddleware
+from app.shared.handlers.degradation import (
+    StalenessHeaderMiddleware,
+    repository_outcome_unknown_handler,
+    repository_unavailable_handler,
+)
+from app.shared.handlers.profiling import ProfilingMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await ensure_indexes()
+    indexes = schedule_indexes()
+    warm = schedule_warm_up()
     yield
+    indexes.cancel()
+    if warm:
+        warm.cancel()
+    await di.shutdown()
 
 app = FastAPI(title="Catalog Service", lifespan=lifespan)
-app.include_router(router)
\ No newline at end of file
+app.add_middleware(StalenessHeaderMiddleware)
+app.add_middleware(CausalConsistencyMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_exception_handler(RepositoryUnavailableException, repository_unavailable_handler)
+app.add_exception_handler(RepositoryOutcomeUnknownException, repository_outcome_unknown_handler)
+app.include_router(health_router)
+app.include_router(router)
+app.include_router(inventory_router)
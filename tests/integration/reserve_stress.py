@@ -0,0 +1,177 @@
+"""Harness de contenção para `POST /products/{pid}/reserve`.
+
+Dispara `requests` reservas de 1 unidade com `concurrency` clientes simultâneos
+pela aplicação ASGI e mede sucessos (204), conflitos (409), vazão e o menor
+estoque observado durante a corrida.
+
+Uso direto (varredura de concorrência):
+    python -m tests.integration.reserve_stress --stock 1000 --requests 5000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+import httpx
+
+import main
+from app.adapters.driver.controllers import product_router as router_mod
+from app.adapters.driver.dependencies import throttling
+from app.domain.entities.product import Product
+from app.domain.ports.product_repository_port import ProductRepositoryPort
+from app.shared.enums.category import Category
+
+
+@dataclass
+class ContentionReport:
+    concurrency: int
+    requests: int
+    initial_stock: int
+    final_stock: int
+    min_stock_seen: int
+    elapsed: float
+    statuses: Counter = field(default_factory=Counter)
+
+    @property
+    def successes(self) -> int:
+        return self.statuses[204]
+
+    @property
+    def conflicts(self) -> int:
+        return self.statuses[409]
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def conflict_rate(self) -> float:
+        return self.conflicts / self.requests if self.requests else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"concurrency={self.concurrency:>4} requests={self.requests} "
+            f"ok={self.successes} conflicts={self.conflicts} "
+            f"other={self.requests - self.successes - self.conflicts} "
+            f"stock={self.initial_stock}->{self.final_stock} min={self.min_stock_seen} "
+            f"{self.throughput:,.0f} req/s conflict_rate={self.conflict_rate:.1%}"
+        )
+
+
+async def _no_guard() -> None:
+    return None
+
+
+async def seed(repo: ProductRepositoryPort, stock: int) -> str:
+    prod = await repo.create(
+        Product(
+            name=f"stress-{time.monotonic_ns()}",
+            description="stress",
+            price=1.0,
+            category=Category.DRINK,
+            stock=stock,
+        )
+    )
+    return prod.id
+
+
+async def run_contention(
+    repo: ProductRepositoryPort,
+    *,
+    stock: int,
+    requests: int,
+    concurrency: int,
+    poll_interval: float = 0.001,
+) -> ContentionReport:
+    """Cria um produto com `stock` unidades e o disputa via HTTP.
+
+    O rate limit de escrita é desligado: o objetivo é medir o repositório, não
+    o `write_guard`.
+    """
+    pid = await seed(repo, stock)
+    overrides = main.app.dependency_overrides
+    overrides[router_mod.get_repo] = lambda: repo
+    overrides[router_mod.get_idempotency] = lambda: None
+    overrides[throttling.write_guard] = _no_guard
+
+    statuses: Counter = Counter()
+    remaining = iter(range(requests))
+    min_seen = stock
+    done = asyncio.Event()
+
+    async def monitor() -> None:
+        nonlocal min_seen
+        while not done.is_set():
+            prod = await repo.find_by_id(pid)
+            min_seen = min(min_seen, prod.stock)
+            await asyncio.sleep(poll_interval)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for _ in remaining:
+            resp = await client.post(f"/products/{pid}/reserve", json={"qty": 1})
+            statuses[resp.status_code] += 1
+
+    transport = httpx.ASGITransport(app=main.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://stress") as client:
+            watcher = asyncio.create_task(monitor())
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+            done.set()
+            await watcher
+    finally:
+        overrides.pop(router_mod.get_repo, None)
+        overrides.pop(router_mod.get_idempotency, None)
+        overrides.pop(throttling.write_guard, None)
+
+    final = (await repo.find_by_id(pid)).stock
+    return ContentionReport(
+        concurrency=concurrency,
+        requests=requests,
+        initial_stock=stock,
+        final_stock=final,
+        min_stock_seen=min(min_seen, final),
+        elapsed=elapsed,
+        statuses=statuses,
+    )
+
+
+def _main() -> None:
+    from app.adapters.driven.repositories.in_memory_product_repository import (
+        InMemoryProductRepository,
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stock", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--latency", type=float, default=0.0005)
+    parser.add_argument("--mongo-uri", help="usa um mongod real em vez do repositório em memória")
+    args = parser.parse_args()
+
+    async def sweep() -> None:
+        for c in args.concurrency:
+            if args.mongo_uri:
+                from motor.motor_asyncio import AsyncIOMotorClient
+
+                from app.adapters.driven.repositories.mongo_product_repository import (
+                    MongoProductRepository,
+                )
+
+                col = AsyncIOMotorClient(args.mongo_uri)["stress"]["products"]
+                repo = MongoProductRepository(col)
+            else:
+                repo = InMemoryProductRepository(latency=args.latency)
+            print(await run_contention(
+                repo, stock=args.stock, requests=args.requests, concurrency=c
+            ))
+
+    asyncio.run(sweep())
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from app.adapters.driven.repositories.in_memory_product_repository import (
+    InMemoryProductRepository,
+)
+from tests.integration.reserve_stress import run_contention
+
+STOCK = int(os.getenv("STRESS_STOCK", "200"))
+REQUESTS = int(os.getenv("STRESS_REQUESTS", "600"))
+MONGO_URI = os.getenv("STRESS_MONGO_URI")
+
+
+def _assert_invariants(report):
+    print(report)
+    assert report.statuses.keys() <= {204, 409}
+    assert report.successes == report.initial_stock
+    assert report.conflicts == report.requests - report.initial_stock
+    assert report.final_stock == 0
+    assert report.min_stock_seen >= 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrency", [1, 10, 100, 500])
+async def test_no_overselling_in_memory(concurrency):
+    repo = InMemoryProductRepository(latency=0.0001)
+
+    report = await run_contention(
+        repo, stock=STOCK, requests=REQUESTS, concurrency=concurrency
+    )
+
+    _assert_invariants(report)
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not MONGO_URI, reason="STRESS_MONGO_URI não definido")
+@pytest.mark.parametrize("concurrency", [10, 100])
+async def test_no_overselling_mongo(concurrency):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from app.adapters.driven.repositories.mongo_product_repository import (
+        MongoProductRepository,
+    )
+
+    client = AsyncIOMotorClient(MONGO_URI)
+    col = client["stress"]["products"]
+    try:
+        report = await run_contention(
+            MongoProductRepository(col),
+            stock=STOCK,
+            requests=REQUESTS,
+            concurrency=concurrency,
+        )
+    finally:
+        await col.drop()
+        client.close()
+
+    _assert_invariants(report)
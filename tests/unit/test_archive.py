@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+import main
+from app.adapters.driven.cache.in_memory_cache import InMemoryCache
+from app.adapters.driven.repositories.cached_product_repository import (
+    CachedProductRepository,
+)
+from app.adapters.driven.repositories.in_memory_product_repository import (
+    InMemoryProductRepository,
+)
+from app.adapters.driven.repositories.mongo_product_repository import (
+    MongoProductRepository,
+    _changes_to_update,
+)
+from app.adapters.driver.controllers import product_router as router_mod
+from app.domain.entities.product import Product
+from app.domain.services.archive_inactive_products import ArchiveInactiveProductsService
+from app.shared.enums.category import Category
+
+CUTOFF = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _doc(**extra) -> dict:
+    return {
+        "_id": ObjectId(),
+        "name": "Old",
+        "price_cents": 500,
+        "category": "Lanche",
+        "stock": 0,
+        "active": False,
+        "deactivated_at": CUTOFF - timedelta(days=1),
+    } | extra
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def limit(self, n):
+        return self
+
+    async def to_list(self, n):
+        return self._docs[:n]
+
+    def __aiter__(self):
+        async def _gen():
+            for d in self._docs:
+                yield d
+        return _gen()
+
+
+def _cols(batches, deleted=None):
+    col = MagicMock()
+    col.update_many = AsyncMock()
+    col.find = MagicMock(side_effect=[_Cursor(b) for b in batches])
+    col.delete_many = AsyncMock(
+        side_effect=[SimpleNamespace(deleted_count=n) for n in (deleted or [len(b) for b in batches])]
+    )
+    archive = MagicMock()
+    archive.bulk_write = AsyncMock()
+    archive.delete_many = AsyncMock()
+    archive.find_one = AsyncMock()
+    return col, archive
+
+
+def test_deactivation_starts_and_reactivation_clears_retention():
+    [stage] = _changes_to_update({"active": False, "name": "$5 menu"})
+    cond, if_inactive, if_active = stage["$set"]["deactivated_at"]["$cond"]
+    # já inativo: mantém a data original; ativo -> inativo: agora
+    assert cond == {"$eq": ["$active", False]}
+    assert if_inactive == {"$ifNull": ["$deactivated_at", if_active]}
+    assert isinstance(if_active, datetime)
+    assert stage["$set"]["name"] == {"$literal": "$5 menu"}
+
+    assert _changes_to_update({"active": True})["$set"]["deactivated_at"] is None
+    assert _changes_to_update({"stock": 1}) == {"$set": {"stock": 1}}
+
+
+@pytest.mark.asyncio
+async def test_repeated_deactivation_keeps_retention_clock():
+    repo = InMemoryProductRepository()
+    prod = await repo.create(
+        Product(name="Old", description="", price=5.0, category=Category.LUNCH, stock=0)
+    )
+    await repo.delete(prod.id)
+    first = repo._deactivated_at[prod.id]
+
+    await repo.update_where({"active": False}, cat=Category.LUNCH)
+
+    assert repo._deactivated_at[prod.id] == first
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_due_products_in_batches():
+    docs = [_doc(stock_batches=[ObjectId()]), _doc(), _doc()]
+    col, archive = _cols([docs[:2], docs[2:]])
+    repo = MongoProductRepository(col, archive_col=archive)
+
+    moved = await repo.archive_inactive(CUTOFF, batch_size=2)
+
+    assert moved == [str(d["_id"]) for d in docs]
+    due = {"active": False, "deactivated_at": {"$lte": CUTOFF}}
+    assert col.find.call_args_list[0].args == (due,)
+    # legado sem deactivated_at passa a contar a retenção
+    assert col.update_many.call_args.args[0] == {
+        "active": False,
+        "deactivated_at": {"$exists": False},
+    }
+    first_ops = archive.bulk_write.await_args_list[0].args[0]
+    assert [op._filter for op in first_ops] == [{"_id": d["_id"]} for d in docs[:2]]
+    assert all(op._upsert and "archived_at" in op._doc for op in first_ops)
+    assert "stock_batches" not in first_ops[0]._doc
+    assert col.delete_many.await_args_list[0].args[0] == {
+        "_id": {"$in": [d["_id"] for d in docs[:2]]}
+    } | due
+    archive.delete_many.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_archive_drops_copies_of_products_reactivated_mid_batch():
+    docs = [_doc(), _doc()]
+    col, archive = _cols([docs], deleted=[1])
+    col.find.side_effect = [_Cursor(docs), _Cursor([{"_id": docs[1]["_id"]}])]
+    repo = MongoProductRepository(col, archive_col=archive)
+
+    moved = await repo.archive_inactive(CUTOFF, batch_size=10)
+
+    assert moved == [str(docs[0]["_id"])]
+    archive.delete_many.assert_awaited_once_with({"_id": {"$in": [docs[1]["_id"]]}})
+
+
+@pytest.mark.asyncio
+async def test_find_archived_reads_archive_collection():
+    doc = _doc()
+    col, archive = _cols([])
+    archive.find_one.return_value = doc
+    repo = MongoProductRepository(col, archive_col=archive)
+
+    prod = await repo.find_archived(str(doc["_id"]))
+
+    assert prod.id == str(doc["_id"]) and prod.price == 5.0
+    assert await repo.find_archived("not-an-id") is None
+    col.find_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_service_computes_cutoff_from_retention():
+    repo = MagicMock()
+    repo.archive_inactive = AsyncMock(return_value=["a", "b", "c", "d"])
+
+    moved = await ArchiveInactiveProductsService(repo).execute(timedelta(days=30), batch_size=100)
+
+    cutoff, batch_size = repo.archive_inactive.await_args.args
+    expected = datetime.now(timezone.utc) - timedelta(days=30)
+    assert moved == 4 and batch_size == 100
+    assert abs((cutoff - expected).total_seconds()) < 5
+    with pytest.raises(ValueError):
+        await ArchiveInactiveProductsService(repo).execute(timedelta(days=-1))
+
+
+@pytest.mark.asyncio
+async def test_cached_repository_evicts_archived_products():
+    inner = InMemoryProductRepository()
+    prod = await inner.create(
+        Product(name="Old", description="", price=5.0, category=Category.LUNCH, stock=0)
+    )
+    repo = CachedProductRepository(inner, InMemoryCache(), ttl=60)
+    await repo.delete(prod.id)
+    assert await repo.find_by_id(prod.id) is not None  # inativo, em cache
+
+    await repo.archive_inactive(datetime.now(timezone.utc))
+
+    assert await repo.find_by_id(prod.id) is None
+    assert await repo.find_all(active=False) == []
+
+
+def test_archived_product_is_served_on_demand():
+    repo = InMemoryProductRepository()
+
+    async def _setup():
+        prod = await repo.create(
+            Product(name="Old", description="", price=5.0, category=Category.LUNCH, stock=0)
+        )
+        live = await repo.create(
+            Product(name="Live", description="", price=5.0, category=Category.LUNCH, stock=1)
+        )
+        await repo.delete(prod.id)
+        await ArchiveInactiveProductsService(repo).execute(timedelta(0))
+        return prod.id, live.id
+
+    pid, live_id = asyncio.run(_setup())
+    main.app.dependency_overrides[router_mod.get_repo] = lambda: repo
+    try:
+        client = TestClient(main.app)
+        assert client.get(f"/products/{pid}").status_code == 404
+        resp = client.get(f"/products/{pid}", params={"include_archived": "true"})
+        assert resp.status_code == 200 and resp.json()["name"] == "Old"
+        assert client.get(f"/products/{live_id}").status_code == 200
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert [p.name for p in asyncio.run(repo.find_all())] == ["Live"]
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.adapters.driven.cache.in_memory_cache import InMemoryCache
+from app.adapters.driven.repositories.cached_product_repository import (
+    CachedProductRepository,
+)
+from app.domain.entities.product import Product
+from app.shared.enums.bulk_item_status import BulkItemStatus
+from app.shared.enums.category import Category
+
+
+@pytest.fixture
+def sample_product() -> Product:
+    return Product(
+        name="Burger",
+        description="Cheese Burger",
+        price=12.5,
+        category=Category.LUNCH,
+        stock=10,
+        id="p1",
+    )
+
+
+@pytest.fixture
+def inner(sample_product) -> AsyncMock:
+    repo = AsyncMock()
+    repo.find_by_id.return_value = sample_product
+    repo.find_all.return_value = [sample_product]
+    return repo
+
+
+@pytest.fixture
+def repo(inner) -> CachedProductRepository:
+    return CachedProductRepository(inner, InMemoryCache(), ttl=60)
+
+
+class _BrokenCache(InMemoryCache):
+    async def get_many(self, keys):
+        raise ConnectionError("redis down")
+
+    async def set_many(self, items, ttl):
+        raise ConnectionError("redis down")
+
+    async def incr(self, key):
+        raise ConnectionError("redis down")
+
+
+@pytest.mark.asyncio
+async def test_find_by_id_is_read_through(repo, inner, sample_product):
+    first = await repo.find_by_id("p1")
+    second = await repo.find_by_id("p1")
+
+    inner.find_by_id.assert_awaited_once_with("p1")
+    assert first == second == sample_product
+
+
+@pytest.mark.asyncio
+async def test_find_by_id_miss_is_not_cached(repo, inner):
+    inner.find_by_id.return_value = None
+    assert await repo.find_by_id("nope") is None
+    assert await repo.find_by_id("nope") is None
+    assert inner.find_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_find_all_cached_per_filter(repo, inner, sample_product):
+    assert await repo.find_all(cat=Category.LUNCH, active=True) == [sample_product]
+    assert await repo.find_all(cat=Category.LUNCH, active=True) == [sample_product]
+    inner.find_all.assert_awaited_once_with(cat=Category.LUNCH, active=True)
+
+    await repo.find_all(cat=None, active=True)
+    assert inner.find_all.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_find_all_populates_item_keys(repo, inner):
+    await repo.find_all()
+    await repo.find_by_id("p1")
+    inner.find_by_id.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reserve_invalidates_item_but_list_stays_fresh(repo, inner, sample_product):
+    await repo.find_all()
+    inner.find_all.return_value = [replace(sample_product, stock=8)]
+    inner.find_by_id.return_value = replace(sample_product, stock=8)
+
+    await repo.reserve_stock("p1", 2)
+    prods = await repo.find_all()
+
+    inner.reserve_stock.assert_awaited_once_with("p1", 2)
+    assert prods[0].stock == 8
+    assert inner.find_all.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_lists(repo, inner, sample_product):
+    await repo.find_all()
+    inner.create.return_value = replace(sample_product, id="p2")
+    await repo.create(replace(sample_product, id=None))
+    await repo.find_all()
+    assert inner.find_all.await_count == 2
+
+    inner.update.return_value = sample_product
+    await repo.update(sample_product)
+    await repo.find_all()
+    assert inner.find_all.await_count == 3
+
+    await repo.delete("p1")
+    await repo.find_by_id("p1")
+    inner.delete.assert_awaited_once_with("p1")
+    inner.find_by_id.assert_awaited_once_with("p1")
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_inner_when_cache_unavailable(inner, sample_product):
+    repo = CachedProductRepository(inner, _BrokenCache())
+
+    assert await repo.find_by_id("p1") == sample_product
+    assert await repo.find_all() == [sample_product]
+    await repo.create(sample_product)
+
+    inner.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_expires(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(
+        "app.adapters.driven.cache.in_memory_cache.time.monotonic", lambda: now[0]
+    )
+    cache = InMemoryCache()
+    await cache.set_many({"a": b"1"}, ttl=10)
+    assert await cache.get_many(["a", "b"]) == [b"1", None]
+
+    now[0] = 11
+    assert await cache.get_many(["a"]) == [None]
+    assert await cache.incr("gen") == 1 and await cache.incr("gen") == 2
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_is_bounded_and_sweeps_unread_keys(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(
+        "app.adapters.driven.cache.in_memory_cache.time.monotonic", lambda: now[0]
+    )
+    cache = InMemoryCache(max_entries=2, sweep_interval=60)
+    await cache.set_many({"a": b"1", "b": b"2"}, ttl=10)
+    await cache.get_many(["a"])
+    await cache.set_many({"c": b"3"}, ttl=10)
+    assert await cache.get_many(["a", "b", "c"]) == [b"1", None, b"3"]  # b era o menos usado
+
+    now[0] = 61
+    await cache.set_many({"d": b"4"}, ttl=100)
+    assert list(cache._data) == ["d"]  # vencidas saem sem precisar de leitura
+
+
+@pytest.mark.asyncio
+async def test_find_all_cache_key_includes_every_filter(repo, inner):
+    await repo.find_all(cat=[Category.LUNCH], sort="price", limit=10)
+    await repo.find_all(cat=[Category.LUNCH], sort="price", limit=10)
+    await repo.find_all(cat=[Category.LUNCH], sort="price", limit=10, offset=10)
+    await repo.find_all(cat=[Category.LUNCH], sort="-price", limit=10)
+
+    assert inner.find_all.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_invalidates_items_and_lists(repo, inner):
+    await repo.find_all()
+    inner.bulk_update.return_value = {"p1": BulkItemStatus.UPDATED}
+
+    await repo.bulk_update([("p1", {"price": 1.0})])
+    await repo.find_by_id("p1")
+    await repo.find_all()
+
+    inner.find_by_id.assert_awaited_once_with("p1")
+    assert inner.find_all.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_update_where_invalidates_matched_items(repo, inner, sample_product):
+    await repo.find_by_id("p1")
+    inner.update_where.return_value = ["p1"]
+    inner.find_by_id.return_value = replace(sample_product, price=1.0)
+
+    await repo.update_where({"price": 1.0}, cat=Category.LUNCH)
+
+    assert (await repo.find_by_id("p1")).price == 1.0
+    assert inner.find_by_id.await_count == 2
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.adapters.driver.controllers import product_router as router_mod
+from app.adapters.driver.export.catalog_export import ExportFormat, encode
+from app.domain.entities.product import Product
+from app.scripts.export_catalog import export
+from app.shared.enums.category import Category
+
+
+def _products(n: int, start: int = 0) -> list[Product]:
+    return [
+        Product(
+            name=f"Item {i}",
+            description=None if i % 3 == 0 else f"Desc, \"{i}\"",
+            price=1.5 + i,
+            category=Category.DRINK,
+            stock=i,
+            id=f"id-{i}",
+        )
+        for i in range(start, start + n)
+    ]
+
+
+class _Repo:
+    def __init__(self, batches: int, size: int):
+        self.batches, self.size = batches, size
+        self.consumed = 0
+        self.calls = []
+
+    async def stream(self, cat=None, active=None, *, batch_size=1000):
+        self.calls.append((cat, active, batch_size))
+        for b in range(self.batches):
+            self.consumed += 1
+            yield _products(self.size, start=b * self.size)
+
+
+async def _collect(chunks) -> bytes:
+    return b"".join([c async for c in chunks])
+
+
+@pytest.mark.asyncio
+async def test_ndjson_one_object_per_line():
+    data = await _collect(encode(ExportFormat.NDJSON, _Repo(2, 3).stream()))
+    rows = [json.loads(line) for line in data.decode().splitlines()]
+    assert len(rows) == 6
+    assert rows[1] == {
+        "id": "id-1",
+        "name": "Item 1",
+        "description": 'Desc, "1"',
+        "price": 2.5,
+        "category": "Bebida",
+        "stock": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_csv_has_single_header_and_escapes():
+    data = await _collect(encode(ExportFormat.CSV, _Repo(3, 2).stream()))
+    rows = list(csv.DictReader(io.StringIO(data.decode())))
+    assert len(rows) == 6 and rows[2]["description"] == 'Desc, "2"'
+    assert rows[0]["description"] == ""
+
+
+@pytest.mark.asyncio
+async def test_csv_empty_catalog_emits_header():
+    data = await _collect(encode(ExportFormat.CSV, _Repo(0, 0).stream()))
+    assert data == b"id,name,description,price,category,stock\n"
+
+
+@pytest.mark.asyncio
+async def test_encoding_is_incremental():
+    repo = _Repo(batches=50, size=10)
+    chunks = encode(ExportFormat.NDJSON, repo.stream(), gzip=True)
+
+    await chunks.__anext__()
+
+    assert repo.consumed < repo.batches
+    await chunks.aclose()
+
+
+@pytest.mark.asyncio
+async def test_gzip_roundtrip():
+    plain = await _collect(encode(ExportFormat.NDJSON, _Repo(4, 5).stream()))
+    packed = await _collect(encode(ExportFormat.NDJSON, _Repo(4, 5).stream(), gzip=True))
+    assert gzip.decompress(packed) == plain
+
+
+@pytest.mark.asyncio
+async def test_parquet_one_row_group_per_batch():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    data = await _collect(encode(ExportFormat.PARQUET, _Repo(3, 4).stream()))
+
+    f = pq.ParquetFile(io.BytesIO(data))
+    assert f.metadata.num_rows == 12 and f.metadata.num_row_groups == 3
+    table = f.read()
+    assert table.column("name")[5].as_py() == "Item 5"
+    assert table.column("description")[0].as_py() is None
+
+
+@pytest.mark.asyncio
+async def test_cli_export_writes_stream():
+    out = io.BytesIO()
+    repo = _Repo(2, 2)
+
+    written = await export(repo, out, ExportFormat.CSV, batch_size=2, active=True)
+
+    assert written == len(out.getvalue()) and out.getvalue().count(b"\n") == 5
+    assert repo.calls == [(None, True, 2)]
+
+
+def test_http_export_streams_with_headers():
+    repo = _Repo(2, 3)
+    main.app.dependency_overrides[router_mod.get_repo] = lambda: repo
+    try:
+        resp = TestClient(main.app).get(
+            "/products/export",
+            params={"format": "ndjson", "gzip": True, "batch_size": 3, "category": "Bebida"},
+        )
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/gzip"
+    assert 'filename="catalog.ndjson.gz"' in resp.headers["content-disposition"]
+    assert len(gzip.decompress(resp.content).splitlines()) == 6
+    assert repo.calls == [([Category.DRINK], None, 3)]
+
+
+def test_http_export_parquet_unavailable(monkeypatch):
+    monkeypatch.setattr(
+        "app.adapters.driver.export.catalog_export.find_spec", lambda name: None
+    )
+    main.app.dependency_overrides[router_mod.get_repo] = lambda: MagicMock()
+    try:
+        resp = TestClient(main.app).get("/products/export", params={"format": "parquet"})
+    finally:
+        main.app.dependency_overrides.clear()
+    assert resp.status_code == 501
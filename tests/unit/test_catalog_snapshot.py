@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import os
+from dataclasses import replace
+from unittest.mock import AsyncMock
+
+import pytest
+from bson import ObjectId
+
+from app.adapters.driven.repositories.in_memory_product_repository import (
+    InMemoryProductRepository,
+)
+from app.adapters.driven.repositories.snapshot_product_repository import (
+    SnapshotProductRepository,
+)
+from app.adapters.driven.snapshot.catalog_snapshot import (
+    HEADER,
+    ROW,
+    SnapshotFormatError,
+    SnapshotReader,
+    write_snapshot,
+)
+from app.domain.entities.product import Product
+from app.domain.services.update_product import UpdateProductService
+from app.scripts.export_snapshot import export
+from app.shared.enums.category import Category
+from app.shared.enums.product_sort import ProductSort
+
+
+@pytest.fixture
+def products() -> list[Product]:
+    return [
+        Product(
+            name=f"Item {i}",
+            description=None if i == 3 else f"Descrição {i} ção",
+            price=9.99 + i,
+            category=Category.LUNCH if i % 2 else Category.DRINK,
+            stock=i,
+            id=str(ObjectId()),
+        )
+        for i in range(6)
+    ]
+
+
+@pytest.fixture
+def snap_path(tmp_path, products) -> str:
+    path = str(tmp_path / "catalog.snap")
+    write_snapshot(products, path)
+    return path
+
+
+def test_roundtrip_by_id(snap_path, products):
+    reader = SnapshotReader(snap_path)
+    try:
+        assert reader.count == len(products)
+        for p in products:
+            got = reader.get(p.id)
+            assert got == replace(p, category=p.category.value)
+        assert reader.get(str(ObjectId())) is None
+    finally:
+        reader.close()
+
+
+def test_scan_filters_category(snap_path):
+    reader = SnapshotReader(snap_path)
+    try:
+        drinks = list(reader.scan(category=Category.DRINK))
+        assert len(drinks) == 3 and {p.category for p in drinks} == {"Bebida"}
+        assert len(list(reader.scan())) == 6
+    finally:
+        reader.close()
+
+
+def test_file_is_compact_and_strings_interned(snap_path, products):
+    size = os.path.getsize(snap_path)
+    text = sum(len(p.name.encode()) + len((p.description or "").encode()) for p in products)
+    categories = len("Lanche") + len("Bebida")
+    assert size == HEADER.size + ROW.size * len(products) + text + categories
+
+
+def test_rejects_unknown_format(tmp_path):
+    path = tmp_path / "bad.snap"
+    path.write_bytes(b"XXXX" + bytes(HEADER.size))
+    with pytest.raises(SnapshotFormatError):
+        SnapshotReader(str(path))
+
+
+@pytest.mark.asyncio
+async def test_repository_reads_from_snapshot_and_delegates_writes(snap_path, products):
+    inner = AsyncMock()
+    repo = SnapshotProductRepository(snap_path, inner)
+
+    assert (await repo.find_by_id(products[0].id)).name == "Item 0"
+    assert len(await repo.find_all(cat=Category.LUNCH, active=True)) == 3
+
+    await repo.reserve_stock(products[0].id, 1)
+    inner.reserve_stock.assert_awaited_once_with(products[0].id, 1)
+    inner.find_by_id.assert_not_called()
+    inner.find_all.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_misses_and_non_active_lists_go_to_inner(snap_path, products):
+    inner = InMemoryProductRepository()
+    new = await inner.create(replace(products[0], id=None, name="New"))
+    gone = await inner.create(replace(products[1], id=None, name="Gone"))
+    await inner.delete(gone.id)
+    repo = SnapshotProductRepository(snap_path, inner)
+
+    assert (await repo.find_by_id(new.id)).name == "New"
+    assert (await repo.find_by_id(gone.id)).name == "Gone"
+    assert await repo.find_by_id("not-an-id") is None
+    assert [p.name for p in await repo.find_all(active=False)] == ["Gone"]
+    assert {p.name for p in await repo.find_all()} == {"New", "Gone"}
+    assert [p.name for b in [b async for b in repo.stream()] for p in b] == ["New", "Gone"]
+
+
+@pytest.mark.asyncio
+async def test_expired_snapshot_falls_back_to_inner(snap_path, products):
+    inner = InMemoryProductRepository()
+    live = await inner.create(replace(products[0], id=None, stock=1))
+    repo = SnapshotProductRepository(snap_path, inner, max_age=0)
+
+    assert [p.id for p in await repo.find_all(active=True)] == [live.id]
+    assert await repo.find_by_id(products[0].id) is None
+
+
+@pytest.mark.asyncio
+async def test_stream_survives_snapshot_reload(snap_path, products):
+    repo = SnapshotProductRepository(snap_path, AsyncMock(), reload_interval=0)
+    batches = repo.stream(active=True, batch_size=2)
+    first = await anext(batches)
+
+    write_snapshot(products[:1], snap_path)
+    assert len(await repo.find_all(active=True)) == 1  # troca o reader
+    rest = [b async for b in batches]
+
+    assert [len(b) for b in [first, *rest]] == [2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_repository_picks_up_new_snapshot(snap_path, products):
+    repo = SnapshotProductRepository(snap_path, AsyncMock(), reload_interval=0)
+    write_snapshot(products[:2], snap_path)
+
+    assert len(await repo.find_all(active=True)) == 2
+
+
+@pytest.mark.asyncio
+async def test_export_writes_active_products(tmp_path, products):
+    source = AsyncMock()
+    source.find_all.return_value = products
+    path = str(tmp_path / "out.snap")
+
+    assert await export(source, path) == len(products)
+    source.find_all.assert_awaited_once_with(active=True)
+    assert SnapshotReader(path).count == len(products)
+
+
+@pytest.mark.asyncio
+async def test_repository_applies_filters_sort_and_pagination(snap_path, products):
+    repo = SnapshotProductRepository(snap_path, AsyncMock())
+
+    prods = await repo.find_all(
+        cat=[Category.LUNCH, Category.DRINK],
+        active=True,
+        min_price=10,
+        max_price=14.99,
+        sort=ProductSort.PRICE_DESC,
+        limit=2,
+        offset=1,
+    )
+
+    assert [p.name for p in prods] == ["Item 4", "Item 3"]
+
+
+@pytest.mark.asyncio
+async def test_repository_streams_in_batches(snap_path):
+    repo = SnapshotProductRepository(snap_path, AsyncMock())
+
+    batches = [b async for b in repo.stream(active=True, batch_size=4)]
+    lunch = [b async for b in repo.stream(cat=[Category.LUNCH], active=True, batch_size=10)]
+
+    assert [len(b) for b in batches] == [4, 2]
+    assert [len(b) for b in lunch] == [3]
+
+
+@pytest.mark.asyncio
+async def test_update_reads_primary_not_snapshot(snap_path, products):
+    inner = InMemoryProductRepository()
+    live = await inner.create(replace(products[0], id=None, stock=3))
+    write_snapshot([replace(live, stock=10)], snap_path)
+    repo = SnapshotProductRepository(snap_path, inner)
+
+    updated = await UpdateProductService(repo).execute(live.id, {"name": "Renamed"})
+
+    assert updated.stock == 3
+    assert (await inner.find_by_id(live.id)).stock == 3
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.adapters.driven.repositories.circuit_breaker_product_repository import (
+    CircuitBreaker,
+    CircuitBreakerProductRepository,
+)
+from app.adapters.driver.controllers.product_router import get_repo
+from app.domain.entities.product import Product
+from app.shared.enums.category import Category
+from app.shared.exceptions.availability import (
+    RepositoryOutcomeUnknownException,
+    RepositoryUnavailableException,
+)
+from app.shared.exceptions.inventory import OutOfStockException
+
+SAMPLE = Product(
+    name="Burger",
+    description="Cheese Burger",
+    price=12.5,
+    category=Category.LUNCH,
+    stock=10,
+    id="64b000000000000000000001",
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_after_threshold_and_probes_once():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    assert breaker.retry_in() == 5
+
+    clock.now = 5
+    assert breaker.state == "half_open"
+    assert breaker.allow() and not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.fixture
+def inner() -> AsyncMock:
+    repo = AsyncMock()
+    repo.find_by_id.return_value = SAMPLE
+    repo.find_all.return_value = [SAMPLE]
+    return repo
+
+
+@pytest.fixture
+def repo(inner) -> CircuitBreakerProductRepository:
+    return CircuitBreakerProductRepository(
+        inner, CircuitBreaker(failure_threshold=2, reset_timeout=0.05), timeout=0.05
+    )
+
+
+@pytest.mark.asyncio
+async def test_reads_fall_back_to_last_known_good(repo, inner):
+    assert await repo.find_all(cat=Category.LUNCH) == [SAMPLE]
+
+    inner.find_all.side_effect = ConnectionRefusedError()
+    with pytest.raises(RepositoryUnavailableException):
+        await repo.find_all(cat=Category.LUNCH)  # circuito fechado: falha isolada não vira stale
+    assert await repo.find_all(cat=Category.LUNCH) == [SAMPLE]  # abriu
+    assert repo.breaker.state == "open"
+
+    with pytest.raises(RepositoryUnavailableException):
+        await repo.find_all(cat=Category.DRINK)  # sem último estado conhecido
+
+
+@pytest.mark.asyncio
+async def test_slow_database_counts_as_failure(repo, inner):
+    async def _slow(*_):
+        await asyncio.sleep(1)
+
+    inner.find_by_id.side_effect = _slow
+    for _ in range(2):
+        with pytest.raises(RepositoryUnavailableException):
+            await repo.find_by_id("x")
+    assert repo.breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_writes_fail_fast_when_open(repo, inner):
+    inner.update.side_effect = ConnectionRefusedError()
+    for _ in range(2):
+        with pytest.raises(RepositoryUnavailableException):
+            await repo.update(SAMPLE)
+
+    with pytest.raises(RepositoryUnavailableException) as exc:
+        await repo.reserve_stock(SAMPLE.id, 1)
+
+    inner.reserve_stock.assert_not_called()
+    assert 0 < exc.value.retry_after <= 0.05
+
+
+@pytest.mark.asyncio
+async def test_timed_out_write_reports_unknown_outcome(repo, inner):
+    async def _slow(*_):
+        await asyncio.sleep(1)
+
+    inner.reserve_stock.side_effect = _slow
+    with pytest.raises(RepositoryOutcomeUnknownException):
+        await repo.reserve_stock(SAMPLE.id, 1)
+
+
+@pytest.mark.asyncio
+async def test_read_before_write_never_gets_stale_data(repo, inner):
+    inner.find_for_write.return_value = SAMPLE
+    await repo.find_for_write(SAMPLE.id)
+    inner.find_for_write.side_effect = ConnectionRefusedError()
+
+    for _ in range(3):
+        with pytest.raises(RepositoryUnavailableException):
+            await repo.find_for_write(SAMPLE.id)
+    assert repo.breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_domain_errors_do_not_trip_the_breaker(repo, inner):
+    inner.reserve_stock.side_effect = OutOfStockException("no stock")
+    for _ in range(3):
+        with pytest.raises(OutOfStockException):
+            await repo.reserve_stock(SAMPLE.id, 99)
+    assert repo.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_revalidated_in_background(repo, inner):
+    await repo.find_by_id(SAMPLE.id)
+    inner.find_by_id.side_effect = ConnectionRefusedError()
+    with pytest.raises(RepositoryUnavailableException):
+        await repo.find_by_id(SAMPLE.id)
+    assert await repo.find_by_id(SAMPLE.id) == SAMPLE
+    assert repo.breaker.state == "open"
+
+    fresh = replace(SAMPLE, stock=3)
+    inner.find_by_id.side_effect = None
+    inner.find_by_id.return_value = fresh
+    await asyncio.wait_for(repo._refresher, 1)
+
+    assert repo.breaker.state == "closed"
+    assert await repo.find_by_id(SAMPLE.id) == fresh
+
+
+@pytest.mark.asyncio
+async def test_only_canonical_lists_are_kept_within_budget(inner):
+    repo = CircuitBreakerProductRepository(inner, max_products=2)
+    inner.find_all.return_value = [SAMPLE, SAMPLE]
+
+    await repo.find_all(cat=[Category.LUNCH], active=True, limit=10, offset=5)
+    await repo.find_all(cat=[Category.LUNCH], active=True, min_price=1.0)
+    assert repo._lkg_size == 0
+
+    await repo.find_all(cat=[Category.DRINK, Category.LUNCH], active=True, limit=None, offset=0)
+    await repo.find_all(cat=[Category.LUNCH, Category.DRINK], active=True)
+    assert len(repo._lkg) == 1 and repo._lkg_size == 2
+
+    await repo.find_by_id(SAMPLE.id)
+    assert list(repo._lkg) == [("id", SAMPLE.id)] and repo._lkg_size == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_writes_use_their_own_timeout(inner):
+    async def _slow(*_, **__):
+        await asyncio.sleep(0.1)
+        return {}
+
+    inner.bulk_update.side_effect = _slow
+    inner.reserve_stock.side_effect = _slow
+    repo = CircuitBreakerProductRepository(inner, timeout=0.05, bulk_timeout=1)
+
+    assert await repo.bulk_update([(SAMPLE.id, {"stock": 1})]) == {}
+    with pytest.raises(RepositoryOutcomeUnknownException):
+        await repo.reserve_stock(SAMPLE.id, 1)
+
+
+@pytest.fixture
+def client(repo):
+    main.app.dependency_overrides[get_repo] = lambda: repo
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+
+
+def test_http_stale_read_carries_warning_header(client, inner):
+    assert "Warning" not in client.get(f"/products/{SAMPLE.id}").headers
+
+    inner.find_by_id.side_effect = ConnectionRefusedError()
+    assert client.get(f"/products/{SAMPLE.id}").status_code == 503
+    resp = client.get(f"/products/{SAMPLE.id}")
+
+    assert resp.status_code == 200
+    assert resp.headers["Warning"] == '110 - "Response is Stale"'
+    assert int(resp.headers["Age"]) >= 0
+
+
+def test_http_write_returns_503_with_retry_after(client, inner):
+    inner.reserve_stock.side_effect = ConnectionRefusedError()
+    resp = client.post(f"/products/{SAMPLE.id}/reserve", json={"qty": 1})
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+
+
+def test_http_timed_out_write_returns_504_without_retry_after(client, inner):
+    async def _slow(*_):
+        await asyncio.sleep(1)
+
+    inner.reserve_stock.side_effect = _slow
+    resp = client.post(f"/products/{SAMPLE.id}/reserve", json={"qty": 1})
+
+    assert resp.status_code == 504
+    assert "Retry-After" not in resp.headers
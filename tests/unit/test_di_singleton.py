@@ -27,3 +27,16 @@ def test_get_repo_returns_same_instance(monkeypatch):
     assert repo1 is repo2
     assert created == 1
     assert isinstance(repo1, DummyRepo)
+
+
+def test_get_repo_wraps_with_cache_when_configured(monkeypatch):
+    monkeypatch.setenv("CACHE_URL", "memory://")
+    di = importlib.reload(importlib.import_module("app.adapters.driver.dependencies.di"))
+    try:
+        from app.adapters.driven.repositories.cached_product_repository import (
+            CachedProductRepository,
+        )
+
+        assert isinstance(di.get_repo(), CachedProductRepository)
+    finally:
+        di._singleton.cache_clear()
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+
+from app.adapters.driven.repositories.mongo_idempotency_store import MongoIdempotencyStore
+from app.adapters.driver.controllers import product_router as router_mod
+from app.domain.ports.idempotency_store_port import IdempotencyRecord, IdempotencyStorePort
+from app.domain.services.idempotency import IdempotencyService
+from app.shared.exceptions.idempotency import IdempotencyConflictException
+
+
+class _MemoryStore(IdempotencyStorePort):
+    def __init__(self):
+        self.records: dict[str, IdempotencyRecord] = {}
+        self.renewals = 0
+
+    async def claim(self, key, fingerprint):
+        if key in self.records:
+            return self.records[key]
+        self.records[key] = IdempotencyRecord(fingerprint, False)
+        return None
+
+    async def complete(self, key, fingerprint, result):
+        self.records[key] = IdempotencyRecord(fingerprint, True, result)
+
+    async def release(self, key):
+        self.records.pop(key, None)
+
+    async def renew(self, key, fingerprint):
+        self.renewals += 1
+
+
+@pytest.fixture
+def service() -> IdempotencyService:
+    return IdempotencyService(_MemoryStore())
+
+
+@pytest.mark.asyncio
+async def test_replay_returns_stored_result(service):
+    action = AsyncMock(return_value={"id": "p1"})
+
+    first = await service.execute("k", "fp", action)
+    second = await service.execute("k", "fp", action)
+
+    assert first == second == {"id": "p1"}
+    action.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_are_collapsed(service):
+    calls = 0
+
+    async def action():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(service.execute("k", "fp", action) for _ in range(20)))
+
+    assert calls == 1 and set(results) == {1}
+
+
+@pytest.mark.asyncio
+async def test_collapsed_waiters_see_the_failure_and_key_is_released(service):
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(
+        service.execute("k", "fp", boom), service.execute("k", "fp", boom), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    assert await service.execute("k", "fp", AsyncMock(return_value="ok")) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_key_reused_with_other_payload_conflicts(service):
+    await service.execute("k", "fp-1", AsyncMock(return_value=None))
+    with pytest.raises(IdempotencyConflictException, match="different payload"):
+        await service.execute("k", "fp-2", AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_key_pending_in_other_replica_conflicts():
+    store = _MemoryStore()
+    store.records["k"] = IdempotencyRecord("fp", False)
+    with pytest.raises(IdempotencyConflictException, match="in progress"):
+        await IdempotencyService(store).execute("k", "fp", AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_failed_completion_is_retried_not_released():
+    store = _MemoryStore()
+    store.complete = AsyncMock(side_effect=[ConnectionError("down"), None])
+    service = IdempotencyService(store, complete_retry=0.001)
+    action = AsyncMock(return_value="ok")
+
+    assert await service.execute("k", "fp", action) == "ok"
+    assert store.records["k"] == IdempotencyRecord("fp", False)  # segue reservada
+    await asyncio.gather(*service._completing)
+
+    assert store.complete.await_count == 2
+    store.complete.assert_awaited_with("k", "fp", "ok")
+    action.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_lease_is_renewed_while_action_runs():
+    store = _MemoryStore()
+    service = IdempotencyService(store, renew_interval=0.005)
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    await service.execute("k", "fp", slow)
+    renewals = store.renewals
+    await asyncio.sleep(0.02)
+
+    assert renewals >= 3
+    assert store.renewals == renewals  # parou ao concluir
+
+
+@pytest.fixture
+def mock_col() -> MagicMock:
+    col = MagicMock()
+    col.insert_one = AsyncMock()
+    col.find_one = AsyncMock()
+    col.find_one_and_update = AsyncMock(return_value=None)
+    col.update_one = AsyncMock()
+    col.delete_one = AsyncMock()
+    return col
+
+
+@pytest.mark.asyncio
+async def test_store_claims_new_key(mock_col):
+    store = MongoIdempotencyStore(mock_col)
+    assert await store.claim("k", "fp") is None
+    doc = mock_col.insert_one.call_args.args[0]
+    assert doc["_id"] == "k" and doc["done"] is False and doc["created_at"]
+
+
+@pytest.mark.asyncio
+async def test_store_replays_completed_key_from_lru(mock_col):
+    store = MongoIdempotencyStore(mock_col)
+    await store.complete("k", "fp", {"id": "p1"})
+
+    record = await store.claim("k", "fp")
+
+    assert record == IdempotencyRecord("fp", True, {"id": "p1"})
+    mock_col.insert_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_store_reads_existing_key_and_caches_when_done(mock_col):
+    mock_col.insert_one.side_effect = DuplicateKeyError("dup")
+    mock_col.find_one.return_value = {"_id": "k", "fingerprint": "fp", "done": True, "result": 1}
+    store = MongoIdempotencyStore(mock_col)
+
+    assert await store.claim("k", "fp") == IdempotencyRecord("fp", True, 1)
+    assert await store.claim("k", "fp") == IdempotencyRecord("fp", True, 1)
+    mock_col.find_one.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_store_takes_over_abandoned_claim(mock_col):
+    mock_col.insert_one.side_effect = DuplicateKeyError("dup")
+    mock_col.find_one_and_update.return_value = {"_id": "k"}
+    store = MongoIdempotencyStore(mock_col)
+
+    assert await store.claim("k", "fp") is None
+    mock_col.find_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_store_renews_only_pending_claim(mock_col):
+    await MongoIdempotencyStore(mock_col, lock_timeout=30).renew("k", "fp")
+
+    flt, update = mock_col.update_one.call_args.args
+    assert flt == {"_id": "k", "fingerprint": "fp", "done": False}
+    assert "locked_until" in update["$set"]
+
+
+@pytest.mark.asyncio
+async def test_store_lru_is_bounded(mock_col):
+    store = MongoIdempotencyStore(mock_col, lru_size=2)
+    for key in ("a", "b", "c"):
+        await store.complete(key, "fp", None)
+    assert list(store._lru) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_reserve_route_replays_without_touching_stock(service):
+    repo = AsyncMock()
+    body = router_mod.ReserveBody(qty=2)
+
+    for _ in range(3):
+        await router_mod.reserve_stock("pid", body, repo, idempotency_key="order-1", idempotency=service)
+
+    repo.reserve_stock.assert_awaited_once_with("pid", 2)
+
+
+@pytest.mark.asyncio
+async def test_reserve_route_maps_conflict_to_409(service):
+    await router_mod.reserve_stock(
+        "pid", router_mod.ReserveBody(qty=2), AsyncMock(), idempotency_key="k", idempotency=service
+    )
+    with pytest.raises(HTTPException) as exc:
+        await router_mod.reserve_stock(
+            "pid", router_mod.ReserveBody(qty=3), AsyncMock(), idempotency_key="k", idempotency=service
+        )
+    assert exc.value.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_create_route_replays_same_product(service):
+    repo = AsyncMock()
+    body = router_mod.ProductIn(name="Burger", description="x", price=10, category="Lanche")
+    repo.create.side_effect = lambda p: replace(p, id="new-id")
+    first = await router_mod.create_product(body, repo, idempotency_key="k", idempotency=service)
+    second = await router_mod.create_product(body, repo, idempotency_key="k", idempotency=service)
+
+    assert first == second and first.id == "new-id"
+    repo.create.assert_awaited_once()
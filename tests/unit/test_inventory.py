@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.adapters.driven.repositories.mongo_inventory_repository import (
+    MongoInventoryRepository,
+)
+from app.adapters.driver.controllers import inventory_router
+from app.adapters.driven.repositories.in_memory_product_repository import (
+    InMemoryProductRepository,
+)
+from app.adapters.driven.repositories.mongo_product_repository import MongoProductRepository
+from app.db_init import INVENTORY_SHARD_KEY, ensure_inventory_sharding
+from app.domain.entities.product import Product
+from app.domain.entities.store_stock import StoreStock
+from app.domain.services.list_store_stock import ListStoreStockService
+from app.domain.services.reserve_store_stock import ReserveStoreStockService
+from app.domain.services.set_store_stock import SetStoreStockService
+from app.shared.enums.category import Category
+from app.shared.exceptions.inventory import OutOfStockException
+
+
+class _FakeCursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def __aiter__(self):
+        async def _gen():
+            for d in self._docs:
+                yield d
+        return _gen()
+
+
+@pytest.fixture
+def mock_col() -> MagicMock:
+    col = MagicMock()
+    col.update_one = AsyncMock()
+    col.find = MagicMock()
+    return col
+
+
+@pytest.fixture
+def repo(mock_col) -> MongoInventoryRepository:
+    return MongoInventoryRepository(mock_col)
+
+
+@pytest.mark.asyncio
+async def test_reserve_targets_single_store_document(repo, mock_col):
+    mock_col.update_one.return_value = SimpleNamespace(modified_count=1)
+
+    await repo.reserve("p1", "s1", 2)
+
+    mock_col.update_one.assert_awaited_once_with(
+        {"_id": "s1:p1", "store_id": "s1", "product_id": "p1", "stock": {"$gte": 2}},
+        {"$inc": {"stock": -2}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_reserve_out_of_stock_raises(repo, mock_col):
+    mock_col.update_one.return_value = SimpleNamespace(modified_count=0)
+    with pytest.raises(OutOfStockException):
+        await repo.reserve("p1", "s1", 99)
+
+
+@pytest.mark.asyncio
+async def test_set_stock_upserts(repo, mock_col):
+    stock = await repo.set_stock("p1", "s1", 7)
+
+    mock_col.update_one.assert_awaited_once_with(
+        {"_id": "s1:p1", "store_id": "s1", "product_id": "p1"},
+        {"$set": {"stock": 7}},
+        upsert=True,
+    )
+    assert stock == StoreStock("p1", "s1", 7)
+
+
+@pytest.mark.asyncio
+async def test_find_stock_is_one_batched_query(repo, mock_col):
+    mock_col.find.return_value = _FakeCursor([
+        {"product_id": "p1", "store_id": "s1", "stock": 3},
+        {"product_id": "p2", "store_id": "s1", "stock": 0},
+    ])
+
+    stocks = await repo.find_stock(["p1", "p2"], ["s1"])
+
+    query = mock_col.find.call_args.args[0]
+    assert query == {"product_id": {"$in": ["p1", "p2"]}, "store_id": {"$in": ["s1"]}}
+    assert stocks == [StoreStock("p1", "s1", 3), StoreStock("p2", "s1", 0)]
+
+
+@pytest.mark.asyncio
+async def test_sharding_uses_hashed_store_key():
+    client = MagicMock()
+    client.admin.command = AsyncMock()
+
+    await ensure_inventory_sharding(client)
+
+    client.admin.command.assert_awaited_with(
+        "shardCollection", "catalog_db.inventory", key=INVENTORY_SHARD_KEY
+    )
+    assert INVENTORY_SHARD_KEY == {"store_id": "hashed", "product_id": 1}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("qty", [0, -1])
+async def test_reserve_service_rejects_invalid_qty(qty):
+    inventory = AsyncMock()
+    with pytest.raises(ValueError):
+        await ReserveStoreStockService(inventory, AsyncMock()).execute("p1", "s1", qty)
+    inventory.reserve.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reserve_service_requires_active_product():
+    products = InMemoryProductRepository()
+    prod = await products.create(
+        Product(name="Old", description="", price=1.0, category=Category.DRINK, stock=5)
+    )
+    await products.delete(prod.id)
+    inventory = AsyncMock()
+    service = ReserveStoreStockService(inventory, products)
+
+    for pid in (prod.id, "missing"):
+        with pytest.raises(OutOfStockException):
+            await service.execute(pid, "s1", 1)
+    inventory.reserve.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_set_service_requires_existing_product():
+    products = AsyncMock()
+    products.find_for_write.return_value = None
+    inventory = AsyncMock()
+
+    with pytest.raises(ValueError, match="not found"):
+        await SetStoreStockService(inventory, products).execute("p1", "s1", 5)
+    inventory.set_stock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_service_dedupes_and_bounds_ids():
+    inventory = AsyncMock()
+    service = ListStoreStockService(inventory, max_products=2)
+
+    await service.execute(["p1", "p1", "p2"])
+    inventory.find_stock.assert_awaited_once_with(["p1", "p2"], None)
+
+    with pytest.raises(ValueError):
+        await service.execute(["p1", "p2", "p3"])
+    with pytest.raises(ValueError):
+        await service.execute([])
+
+
+@pytest.fixture
+def client():
+    inventory = AsyncMock()
+    products = AsyncMock()
+    main.app.dependency_overrides[inventory_router.get_inventory_repo] = lambda: inventory
+    main.app.dependency_overrides[inventory_router.get_repo] = lambda: products
+    yield TestClient(main.app), inventory, products
+    main.app.dependency_overrides.clear()
+
+
+def test_http_store_reserve(client):
+    http, inventory, _ = client
+
+    assert http.post("/inventory/s1/products/p1/reserve", json={"qty": 2}).status_code == 204
+    inventory.reserve.assert_awaited_once_with("p1", "s1", 2)
+
+    inventory.reserve.side_effect = OutOfStockException("Not enough stock in store")
+    resp = http.post("/inventory/s1/products/p1/reserve", json={"qty": 2})
+    assert resp.status_code == 409
+
+
+def test_http_store_reserve_rejects_inactive_product(client):
+    http, inventory, products = client
+    products.is_active.return_value = False
+
+    assert http.post("/inventory/s1/products/p1/reserve", json={"qty": 1}).status_code == 409
+    products.is_active.assert_awaited_once_with("p1")
+    inventory.reserve.assert_not_called()
+
+
+def test_http_batched_stock_query(client):
+    http, inventory, _ = client
+    inventory.find_stock.return_value = [StoreStock("p1", "s1", 4)]
+
+    resp = http.get("/inventory/", params=[("product_id", "p1"), ("store_id", "s1"), ("store_id", "s2")])
+
+    assert resp.json() == [{"product_id": "p1", "store_id": "s1", "stock": 4}]
+    inventory.find_stock.assert_awaited_once_with(["p1"], ["s1", "s2"])
+
+
+def test_http_set_stock(client):
+    http, inventory, products = client
+    inventory.set_stock.return_value = StoreStock("p1", "s1", 9)
+
+    resp = http.put("/inventory/s1/products/p1", json={"stock": 9})
+
+    assert resp.status_code == 200 and resp.json()["stock"] == 9
+    products.find_for_write.assert_awaited_once_with("p1")
+
+
+@pytest.mark.asyncio
+async def test_mongo_is_active_reads_primary_with_active_filter():
+    col = MagicMock()
+    col.count_documents = AsyncMock(return_value=1)
+    pid = "64b000000000000000000001"
+
+    assert await MongoProductRepository(col).is_active(pid)
+    assert col.count_documents.call_args.args[0]["active"] is True
+    assert not await MongoProductRepository(col).is_active("bad")
@@ -1,19 +1,29 @@
 from __future__ import annotations
 
 from dataclasses import asdict
+from decimal import Decimal
+from types import SimpleNamespace
 from typing import Any, List
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import ANY, AsyncMock, MagicMock
 
 from bson import ObjectId
 from bson.decimal128 import Decimal128
+from pymongo.errors import BulkWriteError
 
 from app.domain.entities.product import Product
 from app.shared.exceptions.inventory import OutOfStockException
 from app.adapters.driven.repositories.mongo_product_repository import (
     MongoProductRepository,
+    _PROJECTION,
+    _SORT_FIELDS,
+    to_cents,
 )
+from app.db_init import PRODUCT_INDEXES
+from app.shared.enums.bulk_item_status import BulkItemStatus
+from app.shared.enums.product_sort import ProductSort
+from app.scripts.migrate_price_cents import migrate, migration_op
 
 
 class _FakeResult:
@@ -33,6 +43,13 @@ class _FakeCursor:
         return _gen()
 
 
+def _db_doc(p: Product, **extra) -> dict:
+    doc = asdict(p)
+    doc.pop("id")
+    doc["price_cents"] = round(doc.pop("price") * 100)
+    return doc | extra
+
+
 @pytest.fixture
 def sample_product() -> Product:
     return Product(
@@ -45,21 +62,18 @@ def sample_product() -> Product:
     )
 
 @pytest.fixture
-def mock_col(monkeypatch) -> MagicMock:
+def mock_col() -> MagicMock:
     mock_col = MagicMock()
     mock_col.insert_one = AsyncMock()
     mock_col.find_one = AsyncMock()
     mock_col.update_one = AsyncMock()
     mock_col.find = MagicMock()
-    monkeypatch.setattr(
-        "app.adapters.driven.repositories.mongo_product_repository._col", mock_col
-    )
     return mock_col
 
 
 @pytest.fixture
 def repo(mock_col) -> MongoProductRepository:
-    return MongoProductRepository()
+    return MongoProductRepository(mock_col)
 
 
 @pytest.mark.asyncio
@@ -73,6 +87,7 @@ async def test_create_inserts_doc_and_returns_entity(repo, mock_col, sample_prod
     sent_doc = mock_col.insert_one.call_args.args[0]
     assert sent_doc["name"] == "Burger"
     assert sent_doc["active"] is True
+    assert sent_doc["price_cents"] == 1250 and "price" not in sent_doc
     assert prod.id == str(inserted_id)
     assert not hasattr(prod, "active")
 
@@ -80,7 +95,7 @@ async def test_create_inserts_doc_and_returns_entity(repo, mock_col, sample_prod
 @pytest.mark.asyncio
 async def test_find_by_id_maps_doc_to_entity(repo, mock_col, sample_product):
     oid = ObjectId()
-    db_doc = asdict(sample_product) | {"_id": oid, "active": True}
+    db_doc = _db_doc(sample_product, _id=oid, active=True)
     mock_col.find_one.return_value = db_doc
 
     prod = await repo.find_by_id(str(oid))
@@ -104,34 +119,47 @@ async def test_find_by_id_not_found_returns_none(repo, mock_col):
 
 @pytest.mark.asyncio
 async def test_find_all_with_filters(repo, mock_col, sample_product):
-    db_doc = asdict(sample_product) | {"_id": ObjectId(), "active": True}
+    db_doc = _db_doc(sample_product, _id=ObjectId(), active=True)
     mock_col.find.return_value = _FakeCursor([db_doc])
 
     results = await repo.find_all(cat="BURGER", active=True)
 
-    mock_col.find.assert_called_once_with({"category": "BURGER", "active": True})
+    mock_col.find.assert_called_once_with(
+        {"category": "BURGER", "active": True}, _PROJECTION
+    )
     assert len(results) == 1 and results[0].name == "Burger"
 
 
 @pytest.mark.asyncio
 async def test_find_all_no_filters_returns_all(repo, mock_col, sample_product):
     docs = [
-        asdict(sample_product) | {"_id": ObjectId(), "active": True},
-        asdict(sample_product) | {"_id": ObjectId(), "active": False},
+        _db_doc(sample_product, _id=ObjectId(), active=True),
+        _db_doc(sample_product, _id=ObjectId(), active=False),
     ]
     mock_col.find.return_value = _FakeCursor(docs)
 
     results = await repo.find_all()
 
-    mock_col.find.assert_called_once_with({})
+    mock_col.find.assert_called_once_with({}, _PROJECTION)
     assert len(results) == 2
 
 
+@pytest.mark.asyncio
+async def test_find_all_decodes_every_document(repo, mock_col, sample_product):
+    docs = [_db_doc(sample_product, _id=ObjectId(), stock=i) for i in range(5)]
+    mock_col.find.return_value = _FakeCursor(docs)
+
+    results = await repo.find_all()
+
+    assert [p.stock for p in results] == [0, 1, 2, 3, 4]
+    assert all(p.price == 12.5 for p in results)
+
+
 @pytest.mark.asyncio
 async def test_update_success(repo, mock_col, sample_product):
     pid = str(ObjectId())
     mock_col.update_one.return_value = _FakeResult()
-    mock_col.find_one.return_value = asdict(sample_product) | {"_id": ObjectId(pid)}
+    mock_col.find_one.return_value = _db_doc(sample_product, _id=ObjectId(pid))
 
     data = asdict(sample_product).copy()
     data["id"] = pid
@@ -139,6 +167,7 @@ async def test_update_success(repo, mock_col, sample_product):
 
     sent = mock_col.update_one.call_args.args[1]["$set"]
     assert "active" not in sent
+    assert sent["price_cents"] == 1250 and "price" not in sent
     assert updated.id == pid
 
 
@@ -153,7 +182,8 @@ async def test_delete_sets_active_false(repo, mock_col):
     pid = str(ObjectId())
     await repo.delete(pid)
     mock_col.update_one.assert_awaited_with(
-        {"_id": ObjectId(pid)}, {"$set": {"active": False}}
+        {"_id": ObjectId(pid)},
+        [{"$set": {"active": {"$literal": False}, "deactivated_at": ANY}}],
     )
 
 
@@ -179,17 +209,212 @@ async def test_reserve_stock_out_of_stock_raises(repo, mock_col):
         await repo.reserve_stock(pid, 99)
 
 
-def test_doc_to_entity_converts_decimal128():
-    price_dec = Decimal128("12.50")
+def test_doc_to_entity_converts_cents():
     raw = {
         "_id": ObjectId(),
         "name": "Pizza",
         "description": "Mussarela",
-        "price": price_dec,
+        "price_cents": 1250,
         "category": "PIZZA",
         "stock": 5,
         "active": True,
     }
     prod = MongoProductRepository._doc_to_entity(raw)
     assert isinstance(prod.price, float) and prod.price == 12.5
-    assert prod.id
+    assert prod.id == str(raw["_id"])
+
+
+@pytest.mark.parametrize(
+    "price, cents",
+    [(12.5, 1250), (0.1 + 0.2, 30), ("19.99", 1999), (Decimal("1.005"), 101), (3, 300)],
+)
+def test_to_cents_is_exact(price, cents):
+    assert to_cents(price) == cents
+
+
+def test_migration_op_converts_decimal128_and_float():
+    oid = ObjectId()
+    op = migration_op({"_id": oid, "price": Decimal128("12.50")})
+    assert op._filter == {"_id": oid, "price_cents": {"$exists": False}}
+    assert op._doc == {"$set": {"price_cents": 1250}, "$unset": {"price": ""}}
+
+    op = migration_op({"_id": oid, "price": 9.9})
+    assert op._doc["$set"] == {"price_cents": 990}
+
+
+@pytest.mark.asyncio
+async def test_migrate_flushes_in_batches():
+    docs = [{"_id": ObjectId(), "price": float(i)} for i in range(5)]
+    col = MagicMock()
+    col.find = MagicMock(return_value=_FakeCursor(docs))
+    col.bulk_write = AsyncMock(side_effect=lambda ops, ordered: _FakeResult(modified_count=len(ops)))
+
+    total = await migrate(col, batch_size=2)
+
+    assert total == 5
+    assert [len(c.args[0]) for c in col.bulk_write.await_args_list] == [2, 2, 1]
+    assert col.find.call_args.args[0]["price"] == {"$type": "number"}
+
+
+@pytest.mark.asyncio
+async def test_unmigrated_documents_fall_back_to_legacy_price(repo, mock_col):
+    docs = [
+        {"_id": ObjectId(), "name": "A", "category": "Lanche", "price": 12.5},
+        {"_id": ObjectId(), "name": "B", "category": "Lanche", "price": Decimal128("3.10")},
+        {"_id": ObjectId(), "name": "C", "category": "Lanche", "price_cents": 99},
+    ]
+    mock_col.find.return_value = _FakeCursor(docs)
+
+    results = await repo.find_all()
+
+    assert [p.price for p in results] == [12.5, 3.1, 0.99]
+
+
+@pytest.mark.asyncio
+async def test_find_all_sort_price_range_and_pagination(repo, mock_col, sample_product):
+    mock_col.find.return_value = _FakeCursor([])
+
+    await repo.find_all(
+        cat=["Lanche", "Bebida"],
+        min_price=5,
+        max_price=19.99,
+        sort=ProductSort.PRICE_DESC,
+        limit=20,
+        offset=40,
+    )
+
+    mock_col.find.assert_called_once_with(
+        {
+            "category": {"$in": ["Lanche", "Bebida"]},
+            "price_cents": {"$gte": 500, "$lte": 1999},
+            "active": {"$in": [True, False, None]},
+        },
+        _PROJECTION,
+        sort=[("price_cents", -1), ("_id", -1)],
+        skip=40,
+        limit=20,
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_all_single_category_list_uses_equality(repo, mock_col):
+    mock_col.find.return_value = _FakeCursor([])
+
+    await repo.find_all(cat=["Lanche"], active=True, sort=ProductSort.NAME_ASC)
+
+    mock_col.find.assert_called_once_with(
+        {"category": "Lanche", "active": True},
+        _PROJECTION,
+        sort=[("name", 1), ("_id", 1)],
+    )
+
+
+@pytest.mark.parametrize("sort", list(ProductSort))
+def test_every_sort_has_a_matching_index(sort):
+    field = _SORT_FIELDS[sort.field]
+    # o desempate por _id precisa vir logo após o campo, senão o sort é em memória
+    for prefix in ([("active", 1), ("category", 1)], [("active", 1)]):
+        expected = prefix + [(field, 1), ("_id", 1)]
+        assert any(keys[: len(expected)] == expected for keys in PRODUCT_INDEXES), (sort, prefix)
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_chunks_and_reports_missing(mock_col):
+    repo = MongoProductRepository(mock_col, bulk_chunk_size=2)
+    ids = [str(ObjectId()) for _ in range(3)]
+    missing = str(ObjectId())
+    mock_col.find.side_effect = [
+        _FakeCursor([{"_id": ObjectId(ids[0])}, {"_id": ObjectId(ids[1])}]),
+        _FakeCursor([{"_id": ObjectId(ids[2])}]),
+        _FakeCursor([]),
+    ]
+    mock_col.bulk_write = AsyncMock()
+
+    found = await repo.bulk_update(
+        [
+            (ids[0], {"price": 9.9}),
+            (ids[1], {"active": False}),
+            (ids[2], {"stock": 1}),
+            (missing, {"stock": 1}),
+            ("not-an-id", {"stock": 1}),
+        ]
+    )
+
+    assert found == {
+        ids[0]: BulkItemStatus.UPDATED,
+        ids[1]: BulkItemStatus.UPDATED,
+        ids[2]: BulkItemStatus.UPDATED,
+        missing: BulkItemStatus.NOT_FOUND,
+        "not-an-id": BulkItemStatus.NOT_FOUND,
+    }
+    assert mock_col.find.call_count == 3
+    first_ops = mock_col.bulk_write.await_args_list[0].args[0]
+    assert [op._doc for op in first_ops] == [
+        {"$set": {"price_cents": 990}},
+        [{"$set": {"active": {"$literal": False}, "deactivated_at": ANY}}],
+    ]
+    assert mock_col.bulk_write.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_maps_write_errors_to_items(repo, mock_col):
+    ids = [str(ObjectId()) for _ in range(3)]
+    mock_col.find.return_value = _FakeCursor([{"_id": ObjectId(i)} for i in ids])
+    mock_col.bulk_write = AsyncMock(side_effect=BulkWriteError({
+        "writeErrors": [
+            {"index": 1, "code": 11000, "errmsg": "E11000 duplicate key"},
+            {"index": 2, "code": 121, "errmsg": "Document failed validation"},
+        ],
+    }))
+
+    found = await repo.bulk_update(
+        [(ids[0], {"stock": 1}), (ids[1], {"name": "X"}), (ids[2], {"stock": 2})]
+    )
+
+    assert found == {
+        ids[0]: BulkItemStatus.UPDATED,
+        ids[1]: BulkItemStatus.CONFLICT,
+        ids[2]: BulkItemStatus.FAILED,
+    }
+
+
+@pytest.mark.asyncio
+async def test_update_where_uses_list_filters(repo, mock_col):
+    oids = [ObjectId(), ObjectId()]
+    mock_col.find.return_value = _FakeCursor([{"_id": o} for o in oids])
+    mock_col.update_many = AsyncMock()
+    query = {"category": {"$in": ["Lanche", "Bebida"]}, "active": True}
+
+    matched = await repo.update_where({"price": 10}, cat=["Lanche", "Bebida"], active=True)
+
+    assert mock_col.find.call_args.args == (query, {"_id": 1})
+    # o filtro é repetido na escrita: quem deixou de casar não é alterado
+    mock_col.update_many.assert_awaited_once_with(
+        {"_id": {"$in": oids}} | query, {"$set": {"price_cents": 1000}}
+    )
+    assert matched == [str(o) for o in oids]
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_one_list_per_batch(repo, mock_col, sample_product):
+    docs = [_db_doc(sample_product, _id=ObjectId(), stock=i) for i in range(5)]
+    mock_col.find.return_value = _FakeCursor(docs)
+
+    batches = [b async for b in repo.stream(cat="Lanche", active=True, batch_size=2)]
+
+    mock_col.find.assert_called_once_with(
+        {"category": "Lanche", "active": True}, _PROJECTION, batch_size=2
+    )
+    assert [len(b) for b in batches] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_find_many_fetches_valid_ids_in_one_query(repo, mock_col, sample_product):
+    oid = ObjectId()
+    mock_col.find.return_value = _FakeCursor([_db_doc(sample_product, _id=oid)])
+
+    results = await repo.find_many([str(oid), "not-an-id"])
+
+    mock_col.find.assert_called_once_with({"_id": {"$in": [oid]}}, _PROJECTION)
+    assert [p.id for p in results] == [str(oid)]
+    assert await repo.find_many(["not-an-id"]) == []
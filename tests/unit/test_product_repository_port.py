@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import replace, asdict
+from datetime import datetime
 from types import SimpleNamespace
 import pytest
 
 from app.domain.entities.product import Product
+from app.shared.enums.bulk_item_status import BulkItemStatus
 from app.shared.enums.category import Category
 from app.domain.ports.product_repository_port import ProductRepositoryPort
 
@@ -24,7 +26,9 @@ def sample_product() -> Product:
 class DummyRepo(ProductRepositoryPort):
     def __init__(self, prod: Product):
         self._prod = prod
-        self.calls = SimpleNamespace(created=None, updated=None, deleted=None, reserved=None)
+        self.calls = SimpleNamespace(
+            created=None, updated=None, deleted=None, reserved=None, bulk=None, where=None
+        )
 
     async def create(self, product: Product) -> Product:
         self.calls.created = product
@@ -33,19 +37,50 @@ class DummyRepo(ProductRepositoryPort):
     async def find_by_id(self, product_id: str):
         return self._prod if product_id == self._prod.id else None
 
+    async def is_active(self, product_id):
+        return product_id == self._prod.id
+
+    async def find_many(self, product_ids):
+        return [self._prod] if self._prod.id in product_ids else []
+
     async def find_all(self, cat=None, active=None):
         return [self._prod]
 
+    async def stream(self, cat=None, active=None, *, batch_size=1000):
+        yield [self._prod]
+
     async def update(self, product: Product):
         self.calls.updated = product
         return product
 
+    async def bulk_update(self, changes):
+        self.calls.bulk = list(changes)
+        return {
+            pid: BulkItemStatus.UPDATED if pid == self._prod.id else BulkItemStatus.NOT_FOUND
+            for pid, _ in changes
+        }
+
+    async def update_where(self, changes, **filters):
+        self.calls.where = (changes, filters)
+        return [self._prod.id]
+
     async def delete(self, product_id: str):
         self.calls.deleted = product_id
 
     async def reserve_stock(self, product_id: str, qty: int):
         self.calls.reserved = (product_id, qty)
 
+    async def find_archived(self, product_id):
+        return None
+
+    async def archive_inactive(self, deactivated_before, batch_size=500):
+        self.calls.archived_before = deactivated_before
+        return []
+
+    async def adjust_stock(self, deltas):
+        self.calls.adjusted = dict(deltas)
+        return {pid for pid in deltas if pid == self._prod.id}
+
 
 def test_cannot_instantiate_port_directly():
     with pytest.raises(TypeError):
@@ -61,16 +96,32 @@ async def test_dummy_repo_implements_all_methods(sample_product):
 
     assert await repo.find_by_id("abc") == sample_product
     assert await repo.find_by_id("xyz") is None
+    assert await repo.find_many(["xyz", "abc"]) == [sample_product]
+    assert await repo.prime([sample_product]) is None  # hook padrão: sem cache
 
     all_items = await repo.find_all()
     assert len(all_items) == 1 and asdict(all_items[0]) == asdict(sample_product)
 
+    assert [b async for b in repo.stream(batch_size=10)] == [[sample_product]]
+
     updated_prod = replace(sample_product, price=15.0)
     updated = await repo.update(updated_prod)
     assert updated.price == 15.0 and repo.calls.updated is updated_prod
 
+    assert await repo.bulk_update([("abc", {"price": 1.0}), ("zzz", {})]) == {
+        "abc": BulkItemStatus.UPDATED,
+        "zzz": BulkItemStatus.NOT_FOUND,
+    }
+    assert await repo.update_where({"active": False}, cat="Lanche") == ["abc"]
+    assert repo.calls.where == ({"active": False}, {"cat": "Lanche"})
+
     await repo.delete("abc")
     assert repo.calls.deleted == "abc"
 
     await repo.reserve_stock("abc", 2)
     assert repo.calls.reserved == ("abc", 2)
+
+    assert await repo.adjust_stock({"abc": -1, "zzz": 5}) == {"abc"}
+    assert await repo.find_archived("abc") is None
+    assert await repo.archive_inactive(datetime(2024, 1, 1)) == []
+    assert await repo.is_active("abc") and not await repo.is_active("zzz")
@@ -42,21 +42,21 @@ def _mock_repo(**methods):
 
 @pytest.mark.asyncio
 async def test_delete_product_success(sample_product):
-    repo = _mock_repo(find_by_id=sample_product, delete=None)
+    repo = _mock_repo(find_for_write=sample_product, delete=None)
     await DeleteProductService(repo).execute(sample_product.id)
     repo.delete.assert_awaited_once_with(sample_product.id)
 
 
 @pytest.mark.asyncio
 async def test_delete_product_not_found(sample_product):
-    repo = _mock_repo(find_by_id=None)
+    repo = _mock_repo(find_for_write=None)
     with pytest.raises(ValueError):
         await DeleteProductService(repo).execute("x")
 
 
 @pytest.mark.asyncio
 async def test_delete_product_zero_stock(sample_product):
-    repo = _mock_repo(find_by_id=replace(sample_product, stock=0))
+    repo = _mock_repo(find_for_write=replace(sample_product, stock=0))
     with pytest.raises(ValueError):
         await DeleteProductService(repo).execute(sample_product.id)
 
@@ -79,10 +79,43 @@ async def test_list_products(sample_product):
     repo = _mock_repo(find_all=[sample_product])
     service = ListProductsService(repo)
     prods = await service.execute(active=True, category="BURGER")
-    repo.find_all.assert_awaited_once_with(cat="BURGER", active=True)
+    repo.find_all.assert_awaited_once_with(
+        cat="BURGER",
+        active=True,
+        min_price=None,
+        max_price=None,
+        sort=None,
+        limit=None,
+        offset=0,
+    )
     assert prods == [sample_product]
 
 
+@pytest.mark.asyncio
+async def test_list_products_forwards_filters(sample_product):
+    repo = _mock_repo(find_all=[sample_product])
+    await ListProductsService(repo).execute(
+        category=["Lanche", "Bebida"], min_price=5, max_price=20, sort="-price", limit=10, offset=20
+    )
+    repo.find_all.assert_awaited_once_with(
+        cat=["Lanche", "Bebida"],
+        active=None,
+        min_price=5,
+        max_price=20,
+        sort="-price",
+        limit=10,
+        offset=20,
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_products_rejects_inverted_price_range():
+    repo = _mock_repo()
+    with pytest.raises(ValueError):
+        await ListProductsService(repo).execute(min_price=20, max_price=5)
+    repo.find_all.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_reserve_stock_success():
     repo = _mock_repo(reserve_stock=None)
@@ -102,7 +135,7 @@ async def test_reserve_stock_invalid_qty(q):
 @pytest.mark.asyncio
 async def test_update_product_success(sample_product):
     repo = _mock_repo(
-        find_by_id=sample_product,
+        find_for_write=sample_product,
         update=replace(sample_product, price=15.0)
     )
     service = UpdateProductService(repo)
@@ -113,13 +146,37 @@ async def test_update_product_success(sample_product):
 
 @pytest.mark.asyncio
 async def test_update_product_not_found():
-    repo = _mock_repo(find_by_id=None)
+    repo = _mock_repo(find_for_write=None)
     with pytest.raises(ValueError):
         await UpdateProductService(repo).execute("pid", {})
 
 
 @pytest.mark.asyncio
 async def test_update_product_negative_price(sample_product):
-    repo = _mock_repo(find_by_id=sample_product)
+    repo = _mock_repo(find_for_write=sample_product)
     with pytest.raises(ValueError):
         await UpdateProductService(repo).execute(sample_product.id, {"price": -1})
+
+
+BulkUpdateProductsService = __import__("app.domain.services.bulk_update_products", fromlist=["BulkUpdateProductsService"]).BulkUpdateProductsService
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_drops_null_fields():
+    repo = _mock_repo(bulk_update={"a": "updated", "b": "not_found"})
+    found = await BulkUpdateProductsService(repo).execute(
+        [("a", {"price": 12.0, "description": None}), ("b", {"stock": 1})]
+    )
+    repo.bulk_update.assert_awaited_once_with([("a", {"price": 12.0}), ("b", {"stock": 1})])
+    assert found == {"a": "updated", "b": "not_found"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_where_requires_changes():
+    repo = _mock_repo(update_where=["a", "b", "c"])
+    with pytest.raises(ValueError):
+        await BulkUpdateProductsService(repo).execute_where({"name": None})
+    with pytest.raises(ValueError, match="name"):
+        await BulkUpdateProductsService(repo).execute_where({"name": "Same"}, active=True)
+    assert await BulkUpdateProductsService(repo).execute_where({"active": False}, active=True) == 3
+    repo.update_where.assert_awaited_once_with({"active": False}, active=True)
@@ -3,10 +3,14 @@ from __future__ import annotations
 import importlib
 from dataclasses import replace
 from typing import Any
+from unittest.mock import AsyncMock
 
 import pytest
 from bson import ObjectId
 from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import main
 
 ROUTER_PATH = "app.adapters.driver.controllers.product_router"
 router_mod = importlib.import_module(ROUTER_PATH)
@@ -15,6 +19,7 @@ ProductIn = router_mod.ProductIn
 Product = router_mod.Product
 Category = router_mod.Category
 OutOfStockException = router_mod.OutOfStockException
+BulkItemStatus = router_mod.BulkItemStatus
 
 SAMPLE_ENTITY = Product(
     id=str(ObjectId()),
@@ -125,3 +130,131 @@ async def test_reserve_stock_conflict(monkeypatch):
         await router_mod.reserve_stock(SAMPLE_ENTITY.id, body, repo="fake_repo")
 
     assert exc.value.status_code == 409 and exc.value.detail == "Not enough stock"
+
+
+def test_list_products_http_parses_multi_value_filters():
+    repo = AsyncMock()
+    repo.find_all.return_value = [SAMPLE_ENTITY]
+    # a dependência registrada nas rotas (o módulo di pode ter sido recarregado por outro teste)
+    main.app.dependency_overrides[router_mod.get_repo] = lambda: repo
+    try:
+        resp = TestClient(main.app).get(
+            "/products/",
+            params=[
+                ("category", "Lanche"),
+                ("category", "Bebida"),
+                ("sort", "-price"),
+                ("min_price", "5"),
+                ("limit", "10"),
+            ],
+        )
+        bad = TestClient(main.app).get("/products/", params={"min_price": 9, "max_price": 1})
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert resp.status_code == 200 and resp.json()[0]["name"] == "Burger"
+    kwargs = repo.find_all.await_args_list[0].kwargs
+    assert kwargs["cat"] == [Category.LUNCH, Category.DRINK]
+    assert kwargs["sort"] == "-price" and kwargs["min_price"] == 5 and kwargs["limit"] == 10
+    assert bad.status_code == 400
+
+
+def _bulk_client(repo):
+    main.app.dependency_overrides[router_mod.get_repo] = lambda: repo
+    return TestClient(main.app)
+
+
+def test_bulk_patch_items_reports_per_item_outcome():
+    repo = AsyncMock()
+    repo.bulk_update.side_effect = lambda changes: {
+        pid: {"gone": BulkItemStatus.NOT_FOUND, "taken": BulkItemStatus.CONFLICT}.get(
+            pid, BulkItemStatus.UPDATED
+        )
+        for pid, _ in changes
+    }
+    try:
+        resp = _bulk_client(repo).patch(
+            "/products/bulk",
+            json={
+                "items": [
+                    {"id": "a", "changes": {"price": 9.5, "category": "Bebida"}},
+                    {"id": "b", "changes": {"price": -1}},
+                    {"id": "gone", "changes": {"active": False}},
+                    {"id": "taken", "changes": {"name": "Burger"}},
+                    {"id": "twice", "changes": {"price": -1}},
+                    {"id": "twice", "changes": {"price": 3.0}},
+                    {"id": "typo", "changes": {"prce": 5}},
+                    {"id": "empty", "changes": {"name": None}},
+                ]
+            },
+        )
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [(r["id"], r["status"]) for r in results] == [
+        ("a", "updated"),
+        ("b", "invalid"),
+        ("gone", "not_found"),
+        ("taken", "conflict"),
+        ("twice", "invalid"),
+        ("typo", "invalid"),
+        ("empty", "invalid"),
+    ]
+    assert results[1]["errors"] and results[3]["errors"] == ["Name already in use"]
+    assert results[4]["errors"] == ["Duplicate id in batch"]
+    assert results[5]["errors"][0].startswith("prce:")
+    assert results[6]["errors"] == ["No changes"]
+    repo.bulk_update.assert_awaited_once_with(
+        [
+            ("a", {"price": 9.5, "category": "Bebida"}),
+            ("gone", {"active": False}),
+            ("taken", {"name": "Burger"}),
+        ]
+    )
+
+
+def test_bulk_patch_filter_and_set():
+    repo = AsyncMock()
+    repo.update_where.return_value = [f"p{i}" for i in range(12)]
+    try:
+        client = _bulk_client(repo)
+        resp = client.patch(
+            "/products/bulk",
+            json={"filter": {"category": ["Sobremesa"], "active": True}, "$set": {"active": False}},
+        )
+        invalid = client.patch("/products/bulk", json={"filter": {"active": True}})
+        renamed = client.patch("/products/bulk", json={"$set": {"name": "Same"}, "all": True})
+        unfiltered = [
+            client.patch("/products/bulk", json=body)
+            for body in (
+                {"$set": {"price": 1.0}},
+                {"filter": {}, "$set": {"price": 1.0}},
+                {"filter": {"active": True}, "$set": {"price": 1.0}, "all": True},
+            )
+        ]
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert resp.json()["matched"] == 12
+    repo.update_where.assert_awaited_once_with(
+        {"active": False}, cat=[Category.DESSERT], active=True, min_price=None, max_price=None
+    )
+    assert invalid.status_code == 422
+    assert renamed.status_code == 400
+    assert [r.status_code for r in unfiltered] == [422, 422, 422]
+
+
+def test_bulk_patch_all_updates_whole_catalog():
+    repo = AsyncMock()
+    repo.update_where.return_value = ["a", "b"]
+    try:
+        resp = _bulk_client(repo).patch("/products/bulk", json={"$set": {"stock": 0}, "all": True})
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert resp.json()["matched"] == 2
+    repo.update_where.assert_awaited_once_with(
+        {"stock": 0}, cat=None, active=None, min_price=None, max_price=None
+    )
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import logging
+import marshal
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.shared.handlers import profiling
+from app.shared.handlers.profiling import PhaseTimedJSONResponse, ProfilingMiddleware, phase
+
+
+def _app(**kwargs) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, **kwargs)
+
+    @app.get("/items", response_class=PhaseTimedJSONResponse)
+    async def items():
+        with phase("mongo"):
+            time.sleep(0.01)
+            with phase("decode"):
+                time.sleep(0.02)
+        return [{"n": i} for i in range(3)]
+
+    return app
+
+
+def test_phase_is_noop_outside_request():
+    with phase("mongo"):
+        pass
+
+
+def test_nested_phases_report_exclusive_time():
+    t = profiling._Timings()
+    token = profiling._current.set(t)
+    try:
+        with phase("mongo"):
+            time.sleep(0.01)
+            with phase("decode"):
+                time.sleep(0.02)
+    finally:
+        profiling._current.reset(token)
+
+    assert 0.01 <= t.phases["mongo"] < 0.02
+    assert t.phases["decode"] >= 0.02
+
+
+def test_server_timing_header_lists_phases():
+    resp = TestClient(_app(token="", sample_rate=0, slow_ms=10_000)).get("/items")
+
+    assert resp.status_code == 200 and len(resp.json()) == 3
+    timing = resp.headers["server-timing"]
+    assert "mongo;dur=" in timing and "decode;dur=" in timing and "json;dur=" in timing
+
+
+def test_profile_header_returns_pstats_download():
+    client = TestClient(_app(token="s3cret", sample_rate=0, slow_ms=10_000))
+
+    resp = client.get("/items", headers={"X-Profile": "s3cret"})
+
+    assert resp.status_code == 200
+    assert resp.headers["x-profiled-status"] == "200"
+    assert "attachment" in resp.headers["content-disposition"]
+    stats = marshal.loads(resp.content)
+    assert any(func[2] == "items" for func in stats)
+
+
+def test_wrong_profile_token_is_ignored():
+    client = TestClient(_app(token="s3cret", sample_rate=0, slow_ms=10_000))
+
+    resp = client.get("/items", headers={"X-Profile": "guess"})
+
+    assert resp.json() == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+
+def test_sampled_profile_is_logged(caplog):
+    client = TestClient(_app(token="", sample_rate=1, slow_ms=10_000))
+
+    with caplog.at_level(logging.INFO, logger=profiling.__name__):
+        resp = client.get("/items")
+
+    assert resp.status_code == 200
+    assert any("profile GET /items" in r.message for r in caplog.records)
+
+
+def test_slow_request_logs_phase_breakdown(caplog):
+    client = TestClient(_app(token="", sample_rate=0, slow_ms=0))
+
+    with caplog.at_level(logging.WARNING, logger=profiling.__name__):
+        client.get("/items")
+
+    (record,) = [r for r in caplog.records if "slow request" in r.message]
+    for name in ("mongo=", "decode=", "json=", "other="):
+        assert name in record.message
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import datetime
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId, Timestamp
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pymongo.hello import Hello
+from pymongo.server_description import ServerDescription
+from pymongo.topology_description import TOPOLOGY_TYPE, TopologyDescription
+
+from app.adapters.driven import mongo
+from app.adapters.driven.repositories.mongo_product_repository import MongoProductRepository
+from app.shared.handlers import consistency
+from app.shared.handlers.consistency import CausalConsistencyMiddleware, read_after, record_write
+
+try:
+    from pymongo.synchronous.settings import TopologySettings
+except ImportError:  # pymongo < 4.9
+    from pymongo.settings import TopologySettings
+
+DOC = {"_id": ObjectId(), "name": "Burger", "price_cents": 1250, "category": "Lanche", "stock": 3}
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def __aiter__(self):
+        async def _gen():
+            for d in self._docs:
+                yield d
+        return _gen()
+
+
+class _Session:
+    def __init__(self, operation_time=None):
+        self.operation_time = operation_time
+        self.advance_operation_time = MagicMock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _col(session=None) -> MagicMock:
+    col = MagicMock()
+    col.find = MagicMock(return_value=_Cursor([DOC]))
+    col.find_one = AsyncMock(return_value=DOC)
+    col.update_one = AsyncMock()
+    col.database.client.start_session = AsyncMock(return_value=session)
+    return col
+
+
+def _replica_set(secondary_lag: float) -> TopologyDescription:
+    def server(host, primary, lag):
+        hello = Hello({
+            "ok": 1,
+            "setName": "rs",
+            "hosts": ["p:1", "s:1"],
+            "maxWireVersion": 17,
+            "isWritablePrimary": primary,
+            "secondary": not primary,
+            "lastWrite": {
+                "lastWriteDate": datetime.datetime(2024, 1, 1) - datetime.timedelta(seconds=lag)
+            },
+        })
+        return ServerDescription((host, 1), hello, round_trip_time=0.001)
+
+    servers = {("p", 1): server("p", True, 0), ("s", 1): server("s", False, secondary_lag)}
+    return TopologyDescription(
+        TOPOLOGY_TYPE.ReplicaSetWithPrimary,
+        servers,
+        "rs",
+        None,
+        None,
+        TopologySettings(heartbeat_frequency=10),
+    )
+
+
+def test_read_preference_builds_mode_with_staleness():
+    pref = mongo.read_preference("secondaryPreferred", 120)
+
+    assert pref.document == {"mode": "secondaryPreferred", "maxStalenessSeconds": 120}
+    assert mongo.read_preference("primary").document == {"mode": "primary"}
+    with pytest.raises(ValueError):
+        mongo.read_preference("secondaryOnly")
+
+
+def test_list_read_preference_defaults_and_env(monkeypatch):
+    assert mongo.list_read_preference().document == {
+        "mode": "secondaryPreferred",
+        "maxStalenessSeconds": 90,
+    }
+    monkeypatch.setenv("LIST_READ_PREFERENCE", "nearest")
+    monkeypatch.setenv("LIST_MAX_STALENESS_SECONDS", "-1")
+    assert mongo.list_read_preference().document == {"mode": "nearest"}
+
+
+@pytest.mark.parametrize("lag, expected", [(5, ("s", 1)), (500, ("p", 1))])
+def test_list_preference_skips_stale_secondaries(lag, expected):
+    selected = _replica_set(lag).apply_selector(mongo.list_read_preference())
+
+    assert [s.address for s in selected] == [expected]
+
+
+def test_default_repository_routes_lists_to_secondaries(monkeypatch):
+    client = MagicMock()
+    monkeypatch.setattr(mongo, "get_client", lambda: client)
+    monkeypatch.setattr(
+        "app.adapters.driven.repositories.mongo_product_repository.get_collection",
+        mongo.get_collection,
+    )
+
+    MongoProductRepository()
+
+    col = client[mongo.DB_NAME]["products"]
+    col.with_options.assert_called_once()
+    pref = col.with_options.call_args.kwargs["read_preference"]
+    assert pref.document["mode"] == "secondaryPreferred"
+
+
+@pytest.mark.asyncio
+async def test_lists_use_read_collection_and_lookups_stay_on_primary():
+    primary, secondary = _col(), _col()
+    repo = MongoProductRepository(primary, read_col=secondary, causal=False)
+
+    await repo.find_all()
+    [batch] = [b async for b in repo.stream()]
+    await repo.find_by_id(str(DOC["_id"]))
+
+    assert secondary.find.call_count == 2
+    primary.find.assert_not_called()
+    primary.find_one.assert_awaited_once()
+    assert batch[0].name == "Burger"
+
+
+@pytest.mark.asyncio
+async def test_causal_write_records_operation_time_token():
+    session = _Session(operation_time=Timestamp(1700000000, 7))
+    primary = _col(session)
+    repo = MongoProductRepository(primary, read_col=_col(), causal=True)
+    state = consistency._Consistency()
+    token = consistency._current.set(state)
+    try:
+        await repo.delete(str(DOC["_id"]))
+    finally:
+        consistency._current.reset(token)
+
+    assert primary.update_one.call_args.kwargs["session"] is session
+    assert state.written_at == "1700000000.7"
+
+
+@pytest.mark.asyncio
+async def test_causal_read_waits_for_client_token():
+    session = _Session()
+    secondary = _col(session)
+    repo = MongoProductRepository(_col(), read_col=secondary, causal=True)
+    token = consistency._current.set(consistency._Consistency("1700000000.7"))
+    try:
+        await repo.find_all()
+    finally:
+        consistency._current.reset(token)
+
+    session.advance_operation_time.assert_called_once_with(Timestamp(1700000000, 7))
+    assert secondary.find.call_args.kwargs["session"] is session
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bad", ["garbage", "-1.0", f"{2**40}.1", f"{int(time.time()) + 3600}.1"])
+async def test_invalid_or_future_token_skips_session(bad):
+    secondary = _col()
+    repo = MongoProductRepository(_col(), read_col=secondary, causal=True)
+    token = consistency._current.set(consistency._Consistency(bad))
+    try:
+        await repo.find_all()
+    finally:
+        consistency._current.reset(token)
+
+    secondary.database.client.start_session.assert_not_called()
+    assert "session" not in secondary.find.call_args.kwargs
+
+
+def test_middleware_round_trips_consistency_token():
+    app = FastAPI()
+    app.add_middleware(CausalConsistencyMiddleware)
+
+    @app.patch("/w")
+    async def write():
+        record_write("42.1")
+        return {}
+
+    @app.get("/r")
+    async def read():
+        return {"after": read_after()}
+
+    client = TestClient(app)
+    written = client.patch("/w").headers["X-Consistency-Token"]
+
+    assert written == "42.1"
+    assert client.get("/r", headers={"X-Consistency-Token": written}).json() == {"after": "42.1"}
+    assert "X-Consistency-Token" not in client.get("/r").headers
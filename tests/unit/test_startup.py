@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app import db_init
+from app.adapters.driver.controllers import health_router
+
+ROOT = Path(__file__).parents[2]
+IMPORT_BUDGET = float(os.getenv("IMPORT_TIME_BUDGET", "1.5"))
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import main
+elapsed = time.perf_counter() - t0
+from app.adapters.driven.mongo import get_client
+print(json.dumps({
+    "elapsed": elapsed,
+    "driver_modules": sorted(m for m in sys.modules if m.split(".")[0] in ("motor", "pymongo")),
+    "clients": get_client.cache_info().currsize,
+}))
+"""
+
+
+def test_import_main_is_cheap_and_lazy():
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "MONGO_URI": "mongodb://unreachable:1"},
+    )
+    probe = json.loads(out.stdout.strip().splitlines()[-1])
+
+    assert probe["driver_modules"] == []
+    assert probe["clients"] == 0
+    assert probe["elapsed"] < IMPORT_BUDGET, (
+        f"import main took {probe['elapsed']:.2f}s (budget {IMPORT_BUDGET}s); "
+        "profile with: python -X importtime -c 'import main'"
+    )
+
+
+def test_startup_does_not_wait_for_indexes(monkeypatch):
+    started = []
+
+    async def _hang(**_):
+        started.append(True)
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(db_init, "ensure_indexes", _hang)
+
+    with TestClient(main.app) as client:
+        assert client.get("/healthz").json() == {"status": "ok"}
+
+    assert started == [True]
+
+
+@pytest.mark.parametrize("reachable, code", [(True, 200), (False, 503)])
+def test_readyz_reflects_mongo(monkeypatch, reachable, code):
+    monkeypatch.setattr(health_router, "ping", AsyncMock(return_value=reachable))
+    resp = TestClient(main.app).get("/readyz")
+    assert resp.status_code == code and resp.json()["mongo"] is reachable
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_retries_then_succeeds(monkeypatch):
+    failures = [ConnectionError("down")]
+
+    async def _create_index(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+
+    col = MagicMock()
+    col.create_index = AsyncMock(side_effect=_create_index)
+    monkeypatch.setattr(db_init, "get_collection", lambda _: col)
+
+    await db_init.ensure_indexes(retries=3, delay=0)
+
+    assert col.create_index.await_args_list[0] == col.create_index.await_args_list[1]
+    assert not failures
+
+
+@pytest.mark.asyncio
+async def test_sharding_failure_does_not_block_indexes(monkeypatch):
+    col = MagicMock()
+    col.create_index = AsyncMock()
+    client = MagicMock()
+    client.admin.command = AsyncMock(side_effect=RuntimeError("please create an index"))
+    monkeypatch.setenv("MONGO_SHARDED", "true")
+    monkeypatch.setattr(db_init, "get_collection", lambda _: col)
+    monkeypatch.setattr(db_init, "get_client", lambda: client)
+
+    await db_init.ensure_indexes(retries=3, delay=0)
+
+    keys = [c.args[0] for c in col.create_index.await_args_list]
+    assert [("store_id", "hashed"), ("product_id", 1)] in keys
+    assert "created_at" in keys and "last_seen" in keys  # TTLs criados mesmo sem shard
+    assert client.admin.command.await_count == 1  # sem novas tentativas
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+import main
+from app.adapters.driven.cache.in_memory_cache import InMemoryCache
+from app.adapters.driven.repositories.cached_product_repository import (
+    CachedProductRepository,
+)
+from app.adapters.driven.repositories.in_memory_product_repository import (
+    InMemoryProductRepository,
+)
+from app.adapters.driven.repositories.mongo_product_repository import MongoProductRepository
+from app.adapters.driver.controllers import product_router as router_mod
+from app.adapters.driver.dependencies import throttling
+from app.domain.entities.product import Product
+from app.domain.services.adjust_stock import AdjustStockService
+from app.shared.enums.category import Category
+from app.shared.exceptions.inventory import OutOfStockException
+
+
+async def _seed(repo, *stocks):
+    return [
+        (
+            await repo.create(
+                Product(name=f"P{i}", description="", price=1.0, category=Category.DRINK, stock=s)
+            )
+        ).id
+        for i, s in enumerate(stocks)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_deltas_are_merged_into_one_write():
+    repo = InMemoryProductRepository()
+    a, b = await _seed(repo, 10, 0)
+    repo.adjust_stock = AsyncMock(wraps=repo.adjust_stock)
+    service = AdjustStockService(repo, window=0.01)
+
+    await asyncio.gather(
+        *(service.execute(a, -1) for _ in range(5)),
+        *(service.execute(a, 2) for _ in range(3)),
+        *(service.execute(b, 4) for _ in range(2)),
+    )
+
+    repo.adjust_stock.assert_awaited_once_with({a: 1, b: 8})
+    assert (await repo.find_by_id(a)).stock == 11
+    assert (await repo.find_by_id(b)).stock == 8
+
+
+@pytest.mark.asyncio
+async def test_rejected_merge_is_settled_per_caller():
+    repo = InMemoryProductRepository()
+    (pid,) = await _seed(repo, 1)
+    service = AdjustStockService(repo, window=0.01)
+
+    results = await asyncio.gather(
+        service.execute(pid, -2),
+        service.execute(pid, -1),
+        service.execute(pid, 1),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], OutOfStockException)
+    assert results[1:] == [None, None]
+    assert (await repo.find_by_id(pid)).stock == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_product_and_zero_delta_raise_value_error():
+    service = AdjustStockService(InMemoryProductRepository(), window=0)
+
+    with pytest.raises(ValueError, match="not found"):
+        await service.execute("missing", 3)
+    with pytest.raises(ValueError):
+        await service.execute("missing", 0)
+
+
+@pytest.mark.asyncio
+async def test_write_failure_reaches_every_caller():
+    repo = MagicMock()
+    repo.adjust_stock = AsyncMock(side_effect=ConnectionError("down"))
+    service = AdjustStockService(repo, window=0.001)
+
+    results = await asyncio.gather(
+        service.execute("a", 1), service.execute("b", -1), return_exceptions=True
+    )
+
+    assert all(isinstance(r, ConnectionError) for r in results)
+    repo.adjust_stock.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_later_deltas_go_to_the_next_batch():
+    repo = InMemoryProductRepository()
+    (pid,) = await _seed(repo, 0)
+    repo.adjust_stock = AsyncMock(wraps=repo.adjust_stock)
+    service = AdjustStockService(repo, window=0.005)
+
+    await service.execute(pid, 1)
+    await service.execute(pid, 2)
+
+    assert [c.args[0] for c in repo.adjust_stock.await_args_list] == [{pid: 1}, {pid: 2}]
+
+
+@pytest.mark.asyncio
+async def test_mongo_adjust_stock_fast_path_uses_one_bulk_write():
+    col = MagicMock()
+    col.bulk_write = AsyncMock(return_value=SimpleNamespace(matched_count=2))
+    col.find = MagicMock()
+    a, b = str(ObjectId()), str(ObjectId())
+
+    applied = await MongoProductRepository(col).adjust_stock({a: 3, b: -2, "bad": 1})
+
+    assert applied == {a, b}
+    col.find.assert_not_called()
+    inc, dec = col.bulk_write.call_args.args[0]
+    assert inc._filter == {"_id": ObjectId(a)} and inc._doc["$inc"] == {"stock": 3}
+    assert dec._filter == {"_id": ObjectId(b), "stock": {"$gte": 2}}
+    assert dec._doc["$push"]["stock_batches"]["$slice"] == -16  # marcadores limitados
+
+
+@pytest.mark.asyncio
+async def test_mongo_adjust_stock_reads_markers_when_some_ops_miss():
+    class _Cursor:
+        def __init__(self, docs):
+            self._docs = docs
+
+        def __aiter__(self):
+            async def _gen():
+                for d in self._docs:
+                    yield d
+            return _gen()
+
+    a, b = ObjectId(), ObjectId()
+    col = MagicMock()
+    col.bulk_write = AsyncMock(return_value=SimpleNamespace(matched_count=1))
+    col.find = MagicMock(return_value=_Cursor([{"_id": a}]))
+
+    applied = await MongoProductRepository(col).adjust_stock({str(a): 1, str(b): -5})
+
+    assert applied == {str(a)}
+    batch_id = col.bulk_write.call_args.args[0][0]._doc["$push"]["stock_batches"]["$each"][0]
+    assert col.find.call_args.args[0] == {"_id": {"$in": [a, b]}, "stock_batches": batch_id}
+
+
+@pytest.mark.asyncio
+async def test_cached_repository_invalidates_adjusted_items():
+    inner = InMemoryProductRepository()
+    (pid,) = await _seed(inner, 5)
+    repo = CachedProductRepository(inner, InMemoryCache(), ttl=60)
+    await repo.find_by_id(pid)
+
+    await repo.adjust_stock({pid: -2})
+
+    assert (await repo.find_by_id(pid)).stock == 3
+
+
+def test_adjust_endpoint_http():
+    repo = InMemoryProductRepository()
+    (pid,) = asyncio.run(_seed(repo, 1))
+    main.app.dependency_overrides[router_mod.get_repo] = lambda: repo
+    main.app.dependency_overrides[throttling.write_guard] = lambda: None
+    try:
+        client = TestClient(main.app)
+        url = f"/products/{pid}/stock/adjust"
+        assert client.post(url, json={"delta": 4}).status_code == 204
+        assert client.post(url, json={"delta": -6}).status_code == 409
+        assert client.post(url, json={"delta": 0}).status_code == 422
+        assert client.post("/products/missing/stock/adjust", json={"delta": 1}).status_code == 404
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert asyncio.run(repo.find_by_id(pid)).stock == 5
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from app.adapters.driver.dependencies import throttling
+from app.adapters.driver.dependencies.throttling import (
+    ConcurrencyLimiter,
+    OverloadedError,
+    TokenBucket,
+    make_guard,
+    parse_networks,
+)
+
+
+def test_token_bucket_allows_burst_then_throttles(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(throttling.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=2, burst=3)
+
+    assert [bucket.try_acquire("a") for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire("a") == pytest.approx(0.5)
+    assert bucket.try_acquire("b") == 0  # buckets independentes por cliente
+
+    now[0] += 0.5
+    assert bucket.try_acquire("a") == 0
+
+
+def test_token_bucket_evicts_oldest_client():
+    bucket = TokenBucket(rate=1, burst=1, max_clients=2)
+    for key in ("a", "b", "c"):
+        bucket.try_acquire(key)
+    assert list(bucket._buckets) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_when_queue_full():
+    limiter = ConcurrencyLimiter(limit=1, max_queue=1, max_wait=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.waiting == 1
+
+    with pytest.raises(OverloadedError, match="queue full"):
+        await limiter.acquire()
+
+    limiter.release()
+    await waiter
+    limiter.release()
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_after_max_wait():
+    limiter = ConcurrencyLimiter(limit=1, max_queue=10, max_wait=0.01)
+    await limiter.acquire()
+    with pytest.raises(OverloadedError, match="wait exceeded"):
+        await limiter.acquire()
+    assert limiter.waiting == 0
+
+
+def _app(guard) -> FastAPI:
+    app = FastAPI()
+    gate = asyncio.Event()
+
+    @app.post("/w", dependencies=[Depends(guard)])
+    async def write(block: bool = False):
+        if block:
+            await gate.wait()
+        return {"ok": True}
+
+    app.state.gate = gate
+    return app
+
+
+@pytest.mark.asyncio
+async def test_guard_returns_429_with_retry_after():
+    guard = make_guard(
+        ConcurrencyLimiter(limit=10, max_queue=10, max_wait=1),
+        TokenBucket(rate=0.5, burst=1),
+        trusted_proxies=parse_networks(["127.0.0.0/8"]),
+    )
+    transport = httpx.ASGITransport(app=_app(guard), client=("127.0.0.1", 5000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        ok = await client.post("/w", headers={"X-Client-Id": "pos-1"})
+        limited = await client.post("/w", headers={"X-Client-Id": "pos-1"})
+        other = await client.post("/w", headers={"X-Client-Id": "pos-2"})
+
+    assert ok.status_code == 200 and other.status_code == 200
+    assert limited.status_code == 429 and limited.headers["Retry-After"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_guard_ignores_client_headers_from_untrusted_peers():
+    guard = make_guard(
+        ConcurrencyLimiter(limit=10, max_queue=10, max_wait=1),
+        TokenBucket(rate=0.5, burst=1),
+        trusted_proxies=parse_networks(["10.0.0.0/8"]),
+    )
+    transport = httpx.ASGITransport(app=_app(guard), client=("203.0.113.7", 5000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        ok = await client.post("/w", headers={"X-Client-Id": "a", "X-Forwarded-For": "1.1.1.1"})
+        rotated = await client.post("/w", headers={"X-Client-Id": "b", "X-Forwarded-For": "2.2.2.2"})
+
+    assert ok.status_code == 200 and rotated.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_guard_keys_on_forwarded_client_behind_trusted_proxy():
+    guard = make_guard(
+        ConcurrencyLimiter(limit=10, max_queue=10, max_wait=1),
+        TokenBucket(rate=0.5, burst=1),
+        trusted_proxies=parse_networks(["10.0.0.0/8"]),
+    )
+    transport = httpx.ASGITransport(app=_app(guard), client=("10.0.0.2", 5000))
+    # o cliente pode forjar entradas à esquerda; vale o último salto não confiável
+    forged = {"X-Forwarded-For": "9.9.9.9, 198.51.100.4, 10.0.0.9"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        ok = await client.post("/w", headers=forged)
+        limited = await client.post("/w", headers={"X-Forwarded-For": "8.8.8.8, 198.51.100.4"})
+        other = await client.post("/w", headers={"X-Forwarded-For": "198.51.100.5"})
+
+    assert ok.status_code == 200 and other.status_code == 200
+    assert limited.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_guard_sheds_with_503_and_releases_slots():
+    limiter = ConcurrencyLimiter(limit=1, max_queue=0, max_wait=0.05)
+    app = _app(make_guard(limiter))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        blocked = asyncio.create_task(client.post("/w", params={"block": True}))
+        await asyncio.sleep(0.01)
+
+        shed = await client.post("/w")
+        assert shed.status_code == 503 and shed.headers["Retry-After"] == "1"
+
+        app.state.gate.set()
+        assert (await blocked).status_code == 200
+        assert (await client.post("/w")).status_code == 200
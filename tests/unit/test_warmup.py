@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app import warmup
+from app.adapters.driven.cache.in_memory_cache import InMemoryCache
+from app.adapters.driven.repositories.access_logging_product_repository import (
+    AccessLoggingProductRepository,
+)
+from app.adapters.driven.repositories.cached_product_repository import (
+    CachedProductRepository,
+)
+from app.adapters.driven.repositories.in_memory_product_repository import (
+    InMemoryProductRepository,
+)
+from app.adapters.driven.repositories.mongo_access_log import MongoAccessLog
+from app.adapters.driver.controllers import health_router
+from app.adapters.driver.dependencies import di
+from app.domain.entities.product import Product
+from app.domain.ports.access_log_port import AccessLogPort
+from app.domain.services.update_product import UpdateProductService
+from app.shared.enums.category import Category
+
+
+class _AccessLog(AccessLogPort):
+    def __init__(self, ranking=()):
+        self.ranking = list(ranking)
+        self.recorded: list[dict[str, int]] = []
+
+    async def record(self, counts):
+        self.recorded.append(counts)
+
+    async def top(self, n):
+        return self.ranking[:n]
+
+
+async def _catalog(n: int = 5) -> tuple[InMemoryProductRepository, list[Product]]:
+    repo = InMemoryProductRepository()
+    prods = [
+        await repo.create(
+            Product(name=f"Item {i}", description="", price=1.0, category=Category.LUNCH, stock=i)
+        )
+        for i in range(n)
+    ]
+    await repo.delete(prods[-1].id)
+    return repo, prods
+
+
+async def _cached_ids(cache: InMemoryCache, prods) -> list[bool]:
+    raws = await cache.get_many([f"catalog:product:{p.id}" for p in prods])
+    return [r is not None for r in raws]
+
+
+@pytest.mark.asyncio
+async def test_active_warm_up_primes_every_active_product():
+    inner, prods = await _catalog()
+    cache = InMemoryCache()
+    repo = CachedProductRepository(inner, cache, ttl=60)
+    progress = warmup.WarmUpState()
+
+    await warmup.warm_up(repo, {"active"}, batch_size=2, progress=progress)
+
+    assert await _cached_ids(cache, prods) == [True, True, True, True, False]
+    assert progress.status == "done" and progress.loaded == 4
+    assert progress.duration is not None
+
+
+@pytest.mark.asyncio
+async def test_hot_warm_up_loads_top_ids_in_one_query():
+    inner, prods = await _catalog()
+    inner.find_many = AsyncMock(wraps=inner.find_many)
+    cache = InMemoryCache()
+    repo = CachedProductRepository(inner, cache, ttl=60)
+    ranking = [prods[3].id, prods[1].id, prods[0].id]
+    progress = warmup.WarmUpState()
+
+    await warmup.warm_up(
+        repo, {"hot"}, access_log=_AccessLog(ranking), top_n=2, progress=progress
+    )
+
+    inner.find_many.assert_awaited_once_with(ranking[:2])
+    assert await _cached_ids(cache, prods) == [False, True, False, True, False]
+    assert progress.hot_ids == 2 and progress.loaded == 2
+
+
+@pytest.mark.asyncio
+async def test_warm_up_failure_marks_state_and_raises():
+    repo = MagicMock()
+    repo.find_many = AsyncMock(side_effect=ConnectionError("down"))
+    progress = warmup.WarmUpState()
+
+    with pytest.raises(ConnectionError):
+        await warmup.warm_up(repo, {"hot"}, access_log=_AccessLog(["x"]), progress=progress)
+
+    assert progress.status == "failed" and progress.ready
+
+
+@pytest.mark.asyncio
+async def test_schedule_warm_up_times_out_to_failed(monkeypatch):
+    async def _hang(*args, **kwargs):
+        await asyncio.Event().wait()
+
+    monkeypatch.setenv("WARMUP", "active")
+    monkeypatch.setenv("CACHE_URL", "memory://")
+    monkeypatch.setenv("WARMUP_TIMEOUT", "0.01")
+    monkeypatch.setattr(warmup, "warm_up", _hang)
+    monkeypatch.setattr(warmup, "state", warmup.WarmUpState())
+    monkeypatch.setattr(
+        "app.adapters.driver.dependencies.di.get_repo", lambda: MagicMock()
+    )
+
+    task = warmup.schedule_warm_up()
+    assert warmup.state.status == "pending" and not warmup.state.ready
+    with pytest.raises(asyncio.TimeoutError):
+        await task
+
+    assert warmup.state.status == "failed"
+
+
+def test_schedule_warm_up_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("WARMUP", raising=False)
+    monkeypatch.setattr(warmup, "state", warmup.WarmUpState(status="pending"))
+
+    assert warmup.schedule_warm_up() is None
+    assert warmup.state.ready
+
+
+def test_schedule_warm_up_skipped_without_cache(monkeypatch):
+    monkeypatch.setenv("WARMUP", "active")
+    monkeypatch.delenv("CACHE_URL", raising=False)
+    monkeypatch.setattr(warmup, "state", warmup.WarmUpState(status="pending"))
+
+    assert warmup.schedule_warm_up() is None
+    assert warmup.state.status == "disabled" and warmup.state.ready
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_warm_up_does_not_gate_readiness(monkeypatch):
+    monkeypatch.setenv("WARMUP", "active")
+    monkeypatch.setenv("CACHE_URL", "redis://cache:6379")
+    monkeypatch.setattr(warmup, "warm_up", AsyncMock())
+    monkeypatch.setattr(warmup, "state", warmup.WarmUpState())
+    monkeypatch.setattr(
+        "app.adapters.driver.dependencies.di.get_repo", lambda: MagicMock()
+    )
+
+    task = warmup.schedule_warm_up()
+
+    assert warmup.state.status == "pending" and warmup.state.ready
+    await task
+
+
+def test_readyz_waits_for_warm_up_and_metrics_report_it(monkeypatch):
+    monkeypatch.setattr(health_router, "ping", AsyncMock(return_value=True))
+    monkeypatch.setattr(warmup, "state", warmup.WarmUpState(status="running", loaded=7))
+    client = TestClient(main.app)
+
+    resp = client.get("/readyz")
+    assert resp.status_code == 503 and resp.json()["status"] == "warming"
+
+    metrics = client.get("/metrics").text
+    assert "catalog_warmup_products_loaded 7" in metrics
+    assert 'catalog_warmup_status{status="running"} 1' in metrics
+
+    warmup.state.status = "done"
+    assert client.get("/readyz").status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_access_logging_counts_and_flushes_in_batch():
+    inner, prods = await _catalog(2)
+    access_log = _AccessLog()
+    repo = AccessLoggingProductRepository(inner, access_log, flush_interval=3600)
+
+    for pid in (prods[0].id, prods[0].id, prods[1].id):
+        await repo.find_by_id(pid)
+    await repo.flush()
+    await repo.flush()  # nada novo: não grava
+
+    assert access_log.recorded == [{prods[0].id: 2, prods[1].id: 1}]
+    repo._flusher.cancel()
+
+
+@pytest.mark.asyncio
+async def test_access_logging_skips_missing_products():
+    inner, _ = await _catalog(1)
+    access_log = _AccessLog()
+    repo = AccessLoggingProductRepository(inner, access_log, flush_interval=3600)
+
+    for pid in ("not-an-id", "64b000000000000000000099"):
+        assert await repo.find_by_id(pid) is None
+    await repo.close()
+
+    assert access_log.recorded == [] and repo._flusher is None
+
+
+@pytest.mark.asyncio
+async def test_access_logging_ignores_reads_before_writes():
+    inner, prods = await _catalog(1)
+    access_log = _AccessLog()
+    repo = AccessLoggingProductRepository(inner, access_log, flush_interval=3600)
+
+    await UpdateProductService(repo).execute(prods[0].id, {"stock": 9})
+    await repo.close()
+
+    assert access_log.recorded == []
+
+
+@pytest.mark.asyncio
+async def test_shutdown_flushes_pending_counts(monkeypatch):
+    inner, prods = await _catalog(1)
+    access_log = _AccessLog()
+    repo = AccessLoggingProductRepository(inner, access_log, flush_interval=3600)
+    monkeypatch.setattr(di, "_singleton", lru_cache(lambda: repo))
+    di._singleton()
+
+    await repo.find_by_id(prods[0].id)
+    await di.shutdown()
+
+    assert access_log.recorded == [{prods[0].id: 1}]
+
+
+@pytest.mark.asyncio
+async def test_access_log_flush_failure_is_swallowed():
+    access_log = _AccessLog()
+    access_log.record = AsyncMock(side_effect=ConnectionError("down"))
+    repo = AccessLoggingProductRepository(AsyncMock(), access_log, flush_interval=0)
+
+    await repo.find_by_id("p1")
+    await asyncio.sleep(0.01)
+
+    access_log.record.assert_awaited_once_with({"p1": 1})
+
+
+@pytest.mark.asyncio
+async def test_mongo_access_log_upserts_increments():
+    col = MagicMock()
+    col.bulk_write = AsyncMock()
+
+    await MongoAccessLog(col).record({"p1": 3})
+
+    (op,), = col.bulk_write.call_args.args
+    assert op._filter == {"_id": "p1"} and op._upsert is True
+    assert op._doc["$inc"] == {"hits": 3}